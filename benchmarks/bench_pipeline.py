@@ -0,0 +1,161 @@
+"""Time and measure every pipeline stage on synthetic exports of growing size.
+
+Each size runs in a fresh interpreter so memory figures are not polluted by
+earlier runs. Results are written as JSON (with the git commit) and can be
+compared across commits::
+
+    python benchmarks/bench_pipeline.py --sizes 1000 100000 1000000 --output results/HEAD.json
+    python benchmarks/bench_pipeline.py --compare results/main.json results/HEAD.json
+
+Exports are generated once per size and seed under ``--data-dir`` and reused.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from synthetic import ExportGenerator, conversations_for, write_export
+
+STAGES = ["load_conversations", "flatten_messages", "summarise", "write_tables", "create_all", "render_story"]
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024**2 if sys.platform == "darwin" else peak / 1024
+
+
+def _stage(results: Dict[str, Any], name: str, fn: Callable[[], Any], trace: bool) -> Any:
+    if trace:
+        tracemalloc.start()
+    start = time.perf_counter()
+    cpu_start = time.process_time()
+    value = fn()
+    record = {
+        "seconds": time.perf_counter() - start,
+        "cpu_seconds": time.process_time() - cpu_start,
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+    if trace:
+        record["traced_peak_mb"] = tracemalloc.get_traced_memory()[1] / 1024**2
+        tracemalloc.stop()
+    results[name] = record
+    return value
+
+
+def run_single(export: Path, trace: bool, plots: bool) -> Dict[str, Any]:
+    import matplotlib
+
+    matplotlib.use("Agg")
+    from gpt_recap.analysis import summarise
+    from gpt_recap.cli import _write_tables
+    from gpt_recap.data import flatten_messages, load_conversations
+
+    stages: Dict[str, Any] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        output_dir = Path(tmp)
+        conversations = _stage(stages, "load_conversations", lambda: load_conversations(export), trace)
+        messages = _stage(stages, "flatten_messages", lambda: flatten_messages(conversations), trace)
+        del conversations
+        result = _stage(stages, "summarise", lambda: summarise(messages), trace)
+        _stage(stages, "write_tables", lambda: _write_tables(result, output_dir), trace)
+        plot_paths: Dict[str, Path] = {}
+        if plots:
+            from gpt_recap.plots import PlotBuilder
+
+            builder = PlotBuilder(output_dir, use_cache=False)
+            plot_paths = _stage(stages, "create_all", lambda: builder.create_all(result), trace)
+        from gpt_recap.story import render_story
+
+        _stage(stages, "render_story", lambda: render_story(result, plot_paths, output_dir), trace)
+    return {"messages": len(messages), "stages": stages}
+
+
+def _export_for(size: int, args: argparse.Namespace) -> Path:
+    path = Path(args.data_dir) / f"synthetic_{size}_seed{args.seed}.json"
+    if not path.exists():
+        generator = ExportGenerator(messages_per_conversation=args.messages_per_conversation, seed=args.seed)
+        print(f"Generating {path} ...", file=sys.stderr)
+        write_export(path, generator, conversations_for(size, args.messages_per_conversation))
+    return path
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], check=True, capture_output=True, text=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(old_path: str, new_path: str) -> None:
+    old = {r["target_messages"]: r for r in json.loads(Path(old_path).read_text())["results"]}
+    new = {r["target_messages"]: r for r in json.loads(Path(new_path).read_text())["results"]}
+    print(f"{'size':>9} {'stage':20s} {'old s':>9} {'new s':>9} {'ratio':>7}")
+    for size in sorted(old.keys() & new.keys()):
+        for stage in STAGES:
+            a = old[size]["stages"].get(stage)
+            b = new[size]["stages"].get(stage)
+            if a and b:
+                ratio = b["seconds"] / a["seconds"] if a["seconds"] else float("nan")
+                print(f"{size:>9} {stage:20s} {a['seconds']:9.3f} {b['seconds']:9.3f} {ratio:7.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 100000, 1000000])
+    parser.add_argument("--messages-per-conversation", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--data-dir", default=str(Path(tempfile.gettempdir()) / "gpt-recap-bench"))
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--trace-memory", action="store_true", help="Also record tracemalloc peaks (slower)")
+    parser.add_argument("--no-plots", action="store_true", help="Skip PlotBuilder.create_all")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="Compare two result files")
+    parser.add_argument("--single", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+    if args.single:
+        print(json.dumps(run_single(Path(args.single), args.trace_memory, not args.no_plots)))
+        return
+
+    results: List[Dict[str, Any]] = []
+    for size in args.sizes:
+        export = _export_for(size, args)
+        command = [sys.executable, __file__, "--single", str(export)]
+        command += ["--trace-memory"] * args.trace_memory + ["--no-plots"] * args.no_plots
+        output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+        record = {"target_messages": size, "export_bytes": export.stat().st_size, **json.loads(output)}
+        results.append(record)
+        for stage, stats in record["stages"].items():
+            print(
+                f"{size:>9} {stage:20s} {stats['seconds']:9.3f}s  peak RSS {stats['peak_rss_mb']:8.1f} MB"
+            )
+
+    payload = {
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "results": results,
+    }
+    Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+    Path(args.output).write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    print("Results written to", args.output)
+
+
+if __name__ == "__main__":
+    main()
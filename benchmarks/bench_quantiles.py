@@ -0,0 +1,78 @@
+"""Compare exact and sketch-based ``describe_series`` on a large series.
+
+Usage::
+
+    python benchmarks/bench_quantiles.py --size 10000000 --accuracy 0.01
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from gpt_recap.analysis import describe_series
+from gpt_recap.sketch import QuantileSketch
+
+
+def _measure(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    value = fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return value, elapsed, peak
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=10_000_000)
+    parser.add_argument("--accuracy", type=float, default=0.01)
+    parser.add_argument("--chunk-size", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    # Word counts are heavy-tailed; a rounded log-normal is a reasonable stand-in.
+    values = np.round(rng.lognormal(mean=4.0, sigma=1.2, size=args.size))
+    series = pd.Series(values)
+
+    exact, exact_time, exact_peak = _measure(lambda: describe_series(series))
+    approx, approx_time, approx_peak = _measure(
+        lambda: describe_series(series, relative_accuracy=args.accuracy)
+    )
+
+    def streamed() -> dict:
+        sketch = QuantileSketch(args.accuracy)
+        for start in range(0, args.size, args.chunk_size):
+            sketch.add(values[start : start + args.chunk_size])
+        return sketch.describe()
+
+    streamed_stats, streamed_time, streamed_peak = _measure(streamed)
+
+    errors = {
+        key: abs(approx[key] - exact[key]) / abs(exact[key]) if exact[key] else 0.0
+        for key in ("median", "p90")
+    }
+    print(
+        json.dumps(
+            {
+                "size": args.size,
+                "relative_accuracy": args.accuracy,
+                "exact": {"seconds": exact_time, "peak_bytes": exact_peak, "stats": exact},
+                "sketch": {"seconds": approx_time, "peak_bytes": approx_peak, "stats": approx},
+                "sketch_streamed": {"seconds": streamed_time, "peak_bytes": streamed_peak, "stats": streamed_stats},
+                "relative_error": errors,
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
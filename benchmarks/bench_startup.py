@@ -0,0 +1,76 @@
+"""Measure CLI start-up cost and which heavy modules each mode imports.
+
+Every measurement runs in a fresh interpreter so import caches do not carry
+over between samples.
+
+Usage::
+
+    python benchmarks/bench_startup.py path/to/conversations.json --repeat 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+HEAVY_MODULES = ["pandas", "matplotlib", "seaborn", "jinja2"]
+
+_PROBE = """
+import sys, time
+start = time.perf_counter()
+{body}
+elapsed = time.perf_counter() - start
+print(repr((elapsed, [name for name in {heavy!r} if name in sys.modules])))
+"""
+
+
+def _probe(body: str, repeat: int) -> dict:
+    code = _PROBE.format(body=body, heavy=HEAVY_MODULES)
+    samples = []
+    loaded: list = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout
+        wall = time.perf_counter() - start
+        elapsed, loaded = eval(out.strip().splitlines()[-1])
+        samples.append((elapsed, wall))
+    return {
+        "in_process_seconds": statistics.median(s[0] for s in samples),
+        "wall_seconds": statistics.median(s[1] for s in samples),
+        "heavy_modules_loaded": loaded,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("input", nargs="?", help="Export to run the CLI modes against")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    results = {"import gpt_recap.cli": _probe("import gpt_recap.cli", args.repeat)}
+    if args.input:
+        with tempfile.TemporaryDirectory() as tmp:
+            for label, flags in (
+                ("--metrics-only", ["--metrics-only"]),
+                ("--no-plots", ["--no-plots"]),
+                ("full", ["--no-plot-cache"]),
+            ):
+                argv = [args.input, "-o", tmp, "--no-cache", *flags]
+                body = f"from gpt_recap.cli import main; main({argv!r})"
+                results[label] = _probe(body, args.repeat)
+
+    for label, result in results.items():
+        print(
+            f"{label:22s} {result['wall_seconds']:7.3f}s wall  {result['in_process_seconds']:7.3f}s in-process  "
+            f"loaded: {', '.join(result['heavy_modules_loaded']) or '-'}"
+        )
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Compare word-counting strategies on long assistant-style replies.
+
+Usage::
+
+    python benchmarks/bench_word_count.py --messages 20000 --length 4000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+
+from gpt_recap.data import WORD_RE, count_words
+
+_VOCABULARY = (
+    "the model returns a list of values and we can't assume it's sorted so let's "
+    "sort them first then compute the median carefully Here is an example"
+).split()
+_EXTRAS = ["```python", "def f(x):", "return x * 2", "```", "1.", "2.", "**Note:**", "café", "naïve", "—", "🙂"]
+
+
+def _reply(rng: random.Random, length: int) -> str:
+    parts = []
+    size = 0
+    while size < length:
+        token = rng.choice(_EXTRAS) if rng.random() < 0.08 else rng.choice(_VOCABULARY)
+        parts.append(token)
+        size += len(token) + 1
+    return " ".join(parts)
+
+
+def _time(fn, texts):
+    start = time.perf_counter()
+    counts = [fn(text) for text in texts]
+    return time.perf_counter() - start, counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--messages", type=int, default=20000)
+    parser.add_argument("--length", type=int, default=4000, help="Approximate characters per reply")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    texts = [_reply(rng, args.length) for _ in range(args.messages)]
+
+    baseline_seconds, expected = _time(lambda text: len(WORD_RE.findall(text.lower())), texts)
+    results = {"findall_lower": {"seconds": baseline_seconds, "matches_baseline": True}}
+    for name, fn in (
+        ("findall", lambda text: len(WORD_RE.findall(text))),
+        ("count_words", count_words),
+        ("count_words_unicode", lambda text: count_words(text, unicode=True)),
+    ):
+        seconds, counts = _time(fn, texts)
+        results[name] = {"seconds": seconds, "matches_baseline": counts == expected}
+
+    try:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+    except ImportError:
+        pass
+    else:
+        start = time.perf_counter()
+        counts = pc.count_substring_regex(pa.array(texts), WORD_RE.pattern).to_pylist()
+        results["arrow_count_substring_regex"] = {
+            "seconds": time.perf_counter() - start,
+            "matches_baseline": counts == expected,
+        }
+
+    megabytes = sum(len(text) for text in texts) / 1e6
+    for name, result in results.items():
+        result["mb_per_second"] = megabytes / result["seconds"]
+        result["speedup"] = baseline_seconds / result["seconds"]
+        print(
+            f"{name:28s} {result['seconds']:7.3f}s  {result['mb_per_second']:7.1f} MB/s  "
+            f"x{result['speedup']:.2f}  exact={result['matches_baseline']}"
+        )
+    print(json.dumps({"messages": args.messages, "megabytes": megabytes, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
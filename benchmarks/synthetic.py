@@ -0,0 +1,192 @@
+"""Deterministic synthetic ``conversations.json`` exports for benchmarking.
+
+The same arguments and seed always produce byte-identical files, so results
+from different commits are comparable. Usage::
+
+    python benchmarks/synthetic.py exports/100k.json --messages 100000
+    python benchmarks/synthetic.py exports/mixed.json --conversations 500 \\
+        --messages-per-conversation 40 --branch-factor 0.2 \\
+        --content-mix text=0.6,code=0.2,multimodal_text=0.2 --multimodal-parts 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+DEFAULT_CONTENT_MIX = {
+    "text": 0.8,
+    "code": 0.07,
+    "multimodal_text": 0.06,
+    "execution_output": 0.03,
+    "tether_browsing_display": 0.02,
+    "user_editable_context": 0.02,
+}
+PART_TYPES = ["image_asset_pointer", "audio_transcription", "audio_asset_pointer", "text"]
+START_EPOCH = 1_672_531_200  # 2023-01-01T00:00:00Z
+SPAN_SECONDS = 365 * 24 * 3600
+
+_WORDS = (
+    "the a to and of in is it you that for on with this be can are as your not or if here "
+    "data model function value list python code example error file we use let's it's don't "
+    "result table query test build run step first then next because however résumé naïve"
+).split()
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    """Parse ``"text=0.8,code=0.2"`` into a weight mapping."""
+    mix = {}
+    for item in text.split(","):
+        name, _, weight = item.partition("=")
+        mix[name.strip()] = float(weight)
+    return mix
+
+
+class ExportGenerator:
+    """Build conversations with a controllable size and shape.
+
+    ``branch_factor`` is the probability that a message is attached to an
+    earlier message instead of the current tip, creating the edit/regenerate
+    branches real exports contain. ``content_mix`` weights message content
+    types and ``multimodal_parts`` caps the non-text parts of a
+    ``multimodal_text`` message.
+    """
+
+    def __init__(
+        self,
+        messages_per_conversation: int = 20,
+        branch_factor: float = 0.1,
+        content_mix: Dict[str, float] | None = None,
+        multimodal_parts: int = 3,
+        untimed_ratio: float = 0.02,
+        seed: int = 0,
+    ) -> None:
+        self.messages_per_conversation = messages_per_conversation
+        self.branch_factor = branch_factor
+        mix = content_mix or DEFAULT_CONTENT_MIX
+        self.content_types = list(mix)
+        self.content_weights = list(mix.values())
+        self.multimodal_parts = multimodal_parts
+        self.untimed_ratio = untimed_ratio
+        self.seed = seed
+
+    def conversations(self, count: int) -> Iterator[Dict[str, Any]]:
+        for idx in range(count):
+            # One generator per conversation keeps each conversation stable
+            # regardless of how many come before it.
+            yield self._conversation(random.Random(f"{self.seed}:{idx}"), idx)
+
+    def _conversation(self, rng: random.Random, idx: int) -> Dict[str, Any]:
+        conv_id = f"conv-{self.seed}-{idx:07d}"
+        start = START_EPOCH + rng.random() * SPAN_SECONDS
+        size = max(1, round(rng.gauss(self.messages_per_conversation, self.messages_per_conversation / 4)))
+
+        root = f"{conv_id}-root"
+        mapping: Dict[str, Dict[str, Any]] = {root: {"id": root, "message": None, "parent": None, "children": []}}
+        order: List[str] = [root]
+        tip = root
+        clock = start
+        for j in range(size):
+            parent = rng.choice(order) if len(order) > 1 and rng.random() < self.branch_factor else tip
+            node_id = f"{conv_id}-{j:05d}"
+            role = "user" if j % 2 == 0 else rng.choice(["assistant"] * 8 + ["tool", "system"])
+            clock += rng.expovariate(1 / 90)
+            mapping[node_id] = {
+                "id": node_id,
+                "message": {
+                    "id": node_id,
+                    "author": {"role": role},
+                    "create_time": None if rng.random() < self.untimed_ratio else clock,
+                    "content": self._content(rng, role),
+                },
+                "parent": parent,
+                "children": [],
+            }
+            mapping[parent]["children"].append(node_id)
+            order.append(node_id)
+            tip = node_id
+
+        return {
+            "id": conv_id,
+            "title": f"Synthetic conversation {idx}",
+            "create_time": start,
+            "update_time": clock,
+            "mapping": mapping,
+        }
+
+    def _text(self, rng: random.Random, role: str) -> str:
+        mean = 180 if role == "assistant" else 25
+        count = int(rng.lognormvariate(0, 0.8) * mean)
+        return " ".join(rng.choices(_WORDS, k=count))
+
+    def _content(self, rng: random.Random, role: str) -> Dict[str, Any]:
+        ctype = rng.choices(self.content_types, self.content_weights)[0]
+        if ctype == "multimodal_text":
+            parts: List[Any] = [self._text(rng, role)]
+            for _ in range(rng.randint(1, max(1, self.multimodal_parts))):
+                ptype = rng.choice(PART_TYPES)
+                part: Dict[str, Any] = {"content_type": ptype}
+                if ptype == "audio_transcription":
+                    part["transcript"] = self._text(rng, "user")
+                elif ptype == "text":
+                    part["text"] = self._text(rng, "user")
+                else:
+                    part["asset_pointer"] = f"file-service://{rng.getrandbits(64):016x}"
+                parts.append(part)
+            return {"content_type": ctype, "parts": parts}
+        if ctype == "user_editable_context":
+            return {"content_type": ctype, "user_profile": "", "user_instructions": self._text(rng, "user")}
+        if ctype == "code":
+            return {"content_type": ctype, "language": "python", "text": "print('hello')\n" * rng.randint(1, 20)}
+        return {"content_type": ctype, "parts": [self._text(rng, role)]}
+
+
+def write_export(path: str | Path, generator: ExportGenerator, conversations: int) -> Path:
+    """Write ``conversations`` conversations to ``path`` one at a time."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as fh:
+        fh.write("[")
+        for idx, conversation in enumerate(generator.conversations(conversations)):
+            if idx:
+                fh.write(",\n")
+            fh.write(json.dumps(conversation))
+        fh.write("]\n")
+    return path
+
+
+def conversations_for(messages: int, messages_per_conversation: int) -> int:
+    return max(1, round(messages / messages_per_conversation))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Write a deterministic synthetic conversations.json")
+    parser.add_argument("output")
+    size = parser.add_mutually_exclusive_group()
+    size.add_argument("--messages", type=int, help="Approximate total number of messages")
+    size.add_argument("--conversations", type=int, default=100)
+    parser.add_argument("--messages-per-conversation", type=int, default=20)
+    parser.add_argument("--branch-factor", type=float, default=0.1)
+    parser.add_argument("--content-mix", type=parse_mix, help="e.g. text=0.8,code=0.1,multimodal_text=0.1")
+    parser.add_argument("--multimodal-parts", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    generator = ExportGenerator(
+        messages_per_conversation=args.messages_per_conversation,
+        branch_factor=args.branch_factor,
+        content_mix=args.content_mix,
+        multimodal_parts=args.multimodal_parts,
+        seed=args.seed,
+    )
+    count = args.conversations
+    if args.messages is not None:
+        count = conversations_for(args.messages, args.messages_per_conversation)
+    print("Wrote", write_export(args.output, generator, count))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,6 @@
 const state = {
 	slides: [],
 	chartInstances: [],
-	chartPalette: [
-		"#7f5af0",
-		"#00c2ba",
-		"#f43f5e",
-		"#3b82f6",
-		"#f97316",
-		"#22c55e",
-	],
 	chartDefaultsSet: false,
 };
 
@@ -24,25 +16,6 @@ const STORY_EXPORT_MIN_PADDING = {
 	horizontal: 12,
 };
 
-function generateGradientStops(
-	count,
-	rgb,
-	startOpacity = 0.3,
-	endOpacity = 0.8
-) {
-	const safeCount = Math.max(0, count);
-	if (safeCount === 0) return [];
-	if (safeCount === 1) {
-		const opacity = Math.max(0, Math.min(1, endOpacity));
-		return [`rgba(${rgb}, ${opacity.toFixed(3)})`];
-	}
-	const step = (endOpacity - startOpacity) / (safeCount - 1);
-	return Array.from({ length: safeCount }, (_, idx) => {
-		const opacity = Math.max(0, Math.min(1, startOpacity + step * idx));
-		return `rgba(${rgb}, ${opacity.toFixed(3)})`;
-	});
-}
-
 const DEMO_HOURLY_LABELS = [
 	"00:00",
 	"01:00",
@@ -79,90 +52,6 @@ const DEMO_WEEKDAY_LABELS = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"];
 
 const DEMO_WEEKDAY_DATA = [3554, 3280, 3120, 2950, 2880, 1578, 2925];
 
-const WORD_CLOUD_STOP_WORDS = new Set(
-	[
-		"the",
-		"a",
-		"an",
-		"and",
-		"or",
-		"but",
-		"for",
-		"nor",
-		"with",
-		"that",
-		"this",
-		"from",
-		"your",
-		"yours",
-		"you",
-		"are",
-		"have",
-		"will",
-		"would",
-		"could",
-		"should",
-		"we",
-		"they",
-		"them",
-		"their",
-		"our",
-		"ours",
-		"was",
-		"were",
-		"been",
-		"into",
-		"than",
-		"then",
-		"over",
-		"under",
-		"about",
-		"like",
-		"just",
-		"make",
-		"need",
-		"want",
-		"help",
-		"what",
-		"when",
-		"where",
-		"why",
-		"how",
-		"can",
-		"please",
-		"thanks",
-		"thank",
-		"chat",
-		"gpt",
-		"chatgpt",
-		"assistant",
-		"user",
-		"system",
-		"tool",
-		"code",
-		"also",
-		"really",
-		"maybe",
-		"well",
-		"even",
-		"still",
-		"back",
-		"said",
-		"more",
-		"less",
-		"into",
-		"using",
-		"use",
-		"used",
-		"new",
-		"like",
-		"know",
-		"look",
-		"point",
-		"time",
-	].map((word) => word.toLowerCase())
-);
-
 const DEMO_MONTHLY_LABELS = [
 	"Jan '24",
 	"Feb '24",
@@ -623,20 +512,7 @@ fileInput.addEventListener("change", async (event) => {
 
 	try {
 		setLoading(true);
-		const text = await file.text();
-		const data = JSON.parse(text);
-		if (!Array.isArray(data)) {
-			throw new Error(
-				"File does not look like a conversations export (expected an array)."
-			);
-		}
-
-		const messages = flattenMessages(data);
-		if (!messages.length) {
-			throw new Error("No messages found in conversations.");
-		}
-
-		const analysis = analyse(messages);
+		const analysis = await analyseFile(file);
 		storyContainer.classList.remove("hidden");
 		renderStory(analysis);
 		setLoading(false);
@@ -726,1242 +602,65 @@ function resetUI() {
 	errorBanner.classList.add("hidden");
 }
 
+const loadingMessage = loadingBanner.querySelector("p");
+const LOADING_TEXT = loadingMessage ? loadingMessage.textContent : "";
+
 function setLoading(isLoading) {
 	loadingBanner.classList.toggle("hidden", !isLoading);
+	if (loadingMessage) loadingMessage.textContent = LOADING_TEXT;
 }
 
-function showError(message) {
-	errorBanner.textContent = message;
-	errorBanner.classList.remove("hidden");
-}
-
-function flattenMessages(conversations) {
-	const rows = [];
-
-	conversations.forEach((conversation, idx) => {
-		const mapping = conversation.mapping || {};
-		const convId =
-			conversation.id || `conversation_${idx.toString().padStart(4, "0")}`;
-		const title = conversation.title || "Untitled";
-
-		Object.values(mapping).forEach((node) => {
-			const message = node?.message;
-			if (!message) return;
-
-			const content = message.content || {};
-			const text = extractText(content);
-			const createTime =
-				typeof message.create_time === "number"
-					? new Date(message.create_time * 1000)
-					: null;
-			const role = message.author?.role || "unknown";
-			const model = message.metadata?.model_slug || null;
-			const toolName = message.author?.name || null;
-
-			rows.push({
-				conversationIndex: idx,
-				conversationId: convId,
-				conversationTitle: title,
-				role,
-				model,
-				toolName,
-				createTime,
-				contentType: content.content_type || "text",
-				hasCode: content.content_type === "code",
-				isMultimodal: content.content_type === "multimodal_text",
-				text,
-				wordCount: text
-					? text.toLowerCase().match(/[a-z0-9']+/g)?.length || 0
-					: 0,
-				charCount: text.length,
-			});
-		});
-	});
-
-	return rows;
-}
-
-function extractText(content) {
-	if (!content) return "";
-	const parts = content.parts || [];
-	const lines = [];
-	const textualTypes = new Set([
-		"text",
-		"code",
-		"reasoning_recap",
-		"thoughts",
-		"execution_output",
-		"tether_browsing_display",
-		"system_error",
-		"computer_output",
-		"sonic_webpage",
-		"tether_quote",
-	]);
-
-	if (textualTypes.has(content.content_type)) {
-		parts.forEach((part) => {
-			if (typeof part === "string") lines.push(part);
-			else if (part && typeof part === "object") {
-				if (typeof part.text === "string") lines.push(part.text);
-				else if (typeof part.title === "string") lines.push(part.title);
-			}
-		});
-	} else if (content.content_type === "multimodal_text") {
-		parts.forEach((part) => {
-			if (typeof part === "string") {
-				lines.push(part);
-			} else if (part && typeof part === "object") {
-				const type = part.content_type;
-				if (type === "text" && typeof part.text === "string")
-					lines.push(part.text);
-				if (
-					type === "audio_transcription" &&
-					typeof part.transcript === "string"
-				)
-					lines.push(part.transcript);
-			}
-		});
-	} else if (content.content_type === "user_editable_context") {
-		if (content.user_instructions) lines.push(content.user_instructions);
+function setLoadingProgress({ phase, loaded, total, conversations }) {
+	if (!loadingMessage) return;
+	if (phase === "analysing") {
+		loadingMessage.textContent = `Crunching ${formatInteger(conversations)} chats…`;
+		return;
 	}
-
-	return lines.filter(Boolean).join("\n");
+	const percent = total ? Math.floor((loaded / total) * 100) : 0;
+	loadingMessage.textContent = `Reading your export… ${percent}% (${formatInteger(
+		conversations
+	)} chats)`;
 }
 
-function analyse(messages) {
-	const conversationMap = new Map();
-	const roleCounts = new Map();
-	const dailyCounts = new Map();
-	const monthlyCounts = new Map();
-	const monthlyRoleCounts = new Map();
-	const assistantDaily = new Map();
-	const assistantMonthly = new Map();
-	const hourCounts = Array(24).fill(0);
-	const weekdayCounts = Array(7).fill(0);
-	const modelCounts = new Map();
-	const toolCounts = new Map();
-	const conversationTitles = new Map();
-
-	messages.forEach((msg) => {
-		roleCounts.set(msg.role, (roleCounts.get(msg.role) || 0) + 1);
-
-		// Track model usage
-		if (msg.model) {
-			modelCounts.set(msg.model, (modelCounts.get(msg.model) || 0) + 1);
-		}
-
-		// Track tool usage
-		if (msg.role === "tool" && msg.toolName) {
-			toolCounts.set(msg.toolName, (toolCounts.get(msg.toolName) || 0) + 1);
-		}
-
-		// Track conversation titles
-		if (msg.conversationTitle && msg.conversationId) {
-			conversationTitles.set(msg.conversationId, msg.conversationTitle);
-		}
-
-		const conv = conversationMap.get(msg.conversationId) || {
-			title: msg.conversationTitle,
-			messages: 0,
-			userMessages: 0,
-			assistantMessages: 0,
-			toolMessages: 0,
-			systemMessages: 0,
-			wordsUser: 0,
-			wordsAssistant: 0,
-			hasTool: false,
-			hasCode: false,
-			firstTime: null,
-			lastTime: null,
-		};
-
-		conv.messages += 1;
-		if (msg.role === "user") {
-			conv.userMessages += 1;
-			conv.wordsUser += msg.wordCount;
-		} else if (msg.role === "assistant") {
-			conv.assistantMessages += 1;
-			conv.wordsAssistant += msg.wordCount;
-		} else if (msg.role === "tool") {
-			conv.toolMessages += 1;
-			conv.hasTool = true;
-		} else if (msg.role === "system") {
-			conv.systemMessages += 1;
+// Parse and analyse the selected file in worker.js so the page stays
+// responsive; resolves with the { context, chartData } renderStory expects.
+function analyseFile(file) {
+	if (!window.Worker) return analyseFileOnMainThread(file);
+	return new Promise((resolve, reject) => {
+		let worker;
+		try {
+			worker = new Worker("worker.js");
+		} catch (error) {
+			// e.g. pages opened from file:// cannot start workers.
+			resolve(analyseFileOnMainThread(file));
+			return;
 		}
-
-		if (msg.hasCode) conv.hasCode = true;
-
-		if (
-			msg.createTime instanceof Date &&
-			!Number.isNaN(msg.createTime.getTime())
-		) {
-			if (!conv.firstTime || msg.createTime < conv.firstTime)
-				conv.firstTime = msg.createTime;
-			if (!conv.lastTime || msg.createTime > conv.lastTime)
-				conv.lastTime = msg.createTime;
-
-			const dayKey = dateKey(msg.createTime);
-			dailyCounts.set(dayKey, (dailyCounts.get(dayKey) || 0) + 1);
-
-			const monthKey = monthKeyFromDate(msg.createTime);
-			monthlyCounts.set(monthKey, (monthlyCounts.get(monthKey) || 0) + 1);
-			const mrKey = `${monthKey}|${msg.role}`;
-			monthlyRoleCounts.set(mrKey, (monthlyRoleCounts.get(mrKey) || 0) + 1);
-
-			const hour = msg.createTime.getHours();
-			const weekday = msg.createTime.getDay();
-			hourCounts[hour] += 1;
-			weekdayCounts[weekday] += 1;
-
-			if (msg.role === "assistant") {
-				const daily = assistantDaily.get(dayKey) || {
-					words: 0,
-					chars: 0,
-					count: 0,
-				};
-				daily.words += msg.wordCount;
-				daily.chars += msg.charCount;
-				daily.count += 1;
-				assistantDaily.set(dayKey, daily);
-
-				const monthly = assistantMonthly.get(monthKey) || {
-					words: 0,
-					chars: 0,
-					count: 0,
-				};
-				monthly.words += msg.wordCount;
-				monthly.chars += msg.charCount;
-				monthly.count += 1;
-				assistantMonthly.set(monthKey, monthly);
+		worker.onmessage = ({ data }) => {
+			if (data.type === "progress") {
+				setLoadingProgress(data);
+				return;
 			}
-		}
-
-		conversationMap.set(msg.conversationId, conv);
-	});
-
-	const conversationSummaries = Array.from(conversationMap.values());
-	const wordCloudTerms = computeWordCloudTerms(messages);
-	const { context, chartData } = buildContext({
-		conversationSummaries,
-		messagesByRole: roleCounts,
-		dailyCounts,
-		monthlyCounts,
-		monthlyRoleCounts,
-		assistantDaily,
-		assistantMonthly,
-		hourCounts,
-		weekdayCounts,
-		modelCounts,
-		toolCounts,
-		conversationTitles,
-		wordCloudTerms,
-	});
-
-	return { context, chartData };
-}
-
-function buildContext({
-	conversationSummaries,
-	messagesByRole,
-	dailyCounts,
-	monthlyCounts,
-	monthlyRoleCounts,
-	assistantDaily,
-	assistantMonthly,
-	hourCounts,
-	weekdayCounts,
-	modelCounts,
-	toolCounts,
-	conversationTitles,
-	wordCloudTerms,
-}) {
-	const conversationCount = conversationSummaries.length;
-	const messageCountTotal = Array.from(messagesByRole.values()).reduce(
-		(sum, val) => sum + val,
-		0
-	);
-
-	const sortedDaily = Array.from(dailyCounts.entries())
-		.map(([key, value]) => ({ key, value, date: new Date(key) }))
-		.filter((item) => !Number.isNaN(item.date.getTime()))
-		.sort((a, b) => a.date - b.date);
-
-	const activeDays = sortedDaily.length;
-	const avgMessages = sortedDaily.length
-		? sortedDaily.reduce((sum, item) => sum + item.value, 0) /
-		  sortedDaily.length
-		: 0;
-	const busiestDay = sortedDaily.reduce(
-		(best, item) => (item.value > (best?.value || 0) ? item : best),
-		null
-	);
-	const latestDate = sortedDaily.length
-		? sortedDaily[sortedDaily.length - 1].date
-		: null;
-
-	const streakInfo = computeStreaks(sortedDaily.map((item) => item.date));
-
-	const sortedMonthly = Array.from(monthlyCounts.entries())
-		.map(([key, value]) => ({ key, value, date: monthToDate(key) }))
-		.filter((item) => !Number.isNaN(item.date.getTime()))
-		.sort((a, b) => a.date - b.date);
-
-	const peakMonth = sortedMonthly.reduce(
-		(best, item) => (item.value > (best?.value || 0) ? item : best),
-		null
-	);
-	const quietMonth = sortedMonthly.reduce(
-		(best, item) => (item.value < (best?.value ?? Infinity) ? item : best),
-		null
-	);
-
-	const assistantShare = computeShare(messagesByRole, "assistant");
-	const userShare = computeShare(messagesByRole, "user");
-
-	const conversationCategories = classifyConversations(conversationSummaries);
-
-	const toolShare = fractionToPercent(
-		conversationSummaries.filter((c) => c.hasTool).length,
-		conversationCount
-	);
-	const codeShare = fractionToPercent(
-		conversationSummaries.filter((c) => c.hasCode).length,
-		conversationCount
-	);
-
-	const topConversation = conversationSummaries.reduce(
-		(best, item) => (item.messages > (best?.messages || 0) ? item : best),
-		null
-	);
-
-	const assistantMonthlyStats = Array.from(assistantMonthly.entries())
-		.map(([key, value]) => ({
-			key,
-			date: monthToDate(key),
-			meanWord: value.count ? value.words / value.count : 0,
-		}))
-		.filter((item) => !Number.isNaN(item.date.getTime()))
-		.sort((a, b) => a.date - b.date);
-
-	const assistantPeak = assistantMonthlyStats.reduce(
-		(best, item) => (item.meanWord > (best?.meanWord || 0) ? item : best),
-		null
-	);
-	const assistantLow = assistantMonthlyStats.reduce(
-		(best, item) =>
-			item.meanWord < (best?.meanWord ?? Infinity) ? item : best,
-		null
-	);
-
-	const assistantDailyStats = Array.from(assistantDaily.entries())
-		.map(([key, value]) => ({
-			key,
-			date: new Date(key),
-			meanWord: value.count ? value.words / value.count : 0,
-			meanChar: value.count ? value.chars / value.count : 0,
-		}))
-		.filter((item) => !Number.isNaN(item.date.getTime()))
-		.sort((a, b) => a.date - b.date);
-
-	const latestRolling = computeRollingAverage(
-		assistantDailyStats.map((item) => item.meanWord),
-		30
-	);
-	const latestRollingChars = computeRollingAverage(
-		assistantDailyStats.map((item) => item.meanChar),
-		30
-	);
-
-	const chartData = buildChartData({
-		sortedMonthly,
-		monthlyRoleCounts,
-		messagesByRole,
-		sortedDaily,
-		assistantDailyStats,
-		hourCounts,
-		weekdayCounts,
-		wordCloudTerms,
-	});
-
-	// Process model usage
-	const modelStats = processModelUsage(modelCounts, messageCountTotal);
-
-	// Process tool usage
-	const toolStats = processToolUsage(toolCounts);
-
-	// Process conversation topics
-	const topicStats = processTopics(conversationTitles);
-
-	// Calculate achievements
-	const achievements = calculateAchievements({
-		messageCountTotal,
-		conversationSummaries,
-		hourCounts,
-		streakInfo,
-		toolCounts,
-		sortedDaily,
-	});
-
-	const context = {
-		first_date: streakInfo.firstDate
-			? formatDateLabel(streakInfo.firstDate)
-			: "—",
-		last_date: latestDate ? formatDateLabel(latestDate) : "—",
-		conversation_count: formatInteger(conversationCount),
-		message_count: formatInteger(messageCountTotal),
-		active_days: formatInteger(activeDays),
-		avg_messages_per_active_day: formatNumber(avgMessages),
-		peak_month_label: peakMonth ? formatMonthLabel(peakMonth.date) : "—",
-		peak_month_value: peakMonth ? formatInteger(peakMonth.value) : "—",
-		quiet_month_label: quietMonth ? formatMonthLabel(quietMonth.date) : "—",
-		quiet_month_value: quietMonth ? formatInteger(quietMonth.value) : "—",
-		busiest_day_label: busiestDay ? formatDateLabel(busiestDay.date) : "—",
-		busiest_day_value: busiestDay ? formatInteger(busiestDay.value) : "—",
-		longest_streak_length: formatInteger(streakInfo.longestStreakLength),
-		longest_streak_range: streakInfo.longestStreakLabel,
-		longest_gap_length: formatInteger(streakInfo.longestGapLength),
-		longest_gap_range: streakInfo.longestGapLabel,
-		assistant_share: assistantShare,
-		user_share: userShare,
-		deep_share: formatPercent(conversationCategories.deep),
-		short_share: formatPercent(conversationCategories.short),
-		one_share: formatPercent(conversationCategories.one),
-		tool_share: toolShare,
-		code_share: codeShare,
-		top_conversation_title: topConversation?.title || "—",
-		top_conversation_messages: topConversation
-			? formatInteger(topConversation.messages)
-			: "—",
-		assistant_peak_label: assistantPeak
-			? formatMonthLabel(assistantPeak.date)
-			: "—",
-		assistant_peak_words: assistantPeak
-			? formatNumber(assistantPeak.meanWord)
-			: "—",
-		assistant_low_label: assistantLow
-			? formatMonthLabel(assistantLow.date)
-			: "—",
-		assistant_low_words: assistantLow
-			? formatNumber(assistantLow.meanWord)
-			: "—",
-		latest_word_avg: latestRolling ? formatNumber(latestRolling) : "—",
-		latest_char_avg: latestRollingChars
-			? formatInteger(Math.round(latestRollingChars))
-			: "—",
-		peak_hour_label: computePeakHourLabel(hourCounts),
-		peak_hour_messages: formatInteger(getPeakHourMessages(hourCounts)),
-		daypart_split: computeDaypartSplit(hourCounts),
-		night_share: computeNightShare(hourCounts),
-		peak_weekday_label: computePeakWeekdayLabel(weekdayCounts),
-		peak_weekday_messages: formatInteger(getPeakWeekdayMessages(weekdayCounts)),
-		low_weekday_label: computeLowWeekdayLabel(weekdayCounts),
-		low_weekday_messages: formatInteger(getLowWeekdayMessages(weekdayCounts)),
-		word_cloud_terms: wordCloudTerms,
-		// Model usage stats
-		primary_model: modelStats.primary || "—",
-		primary_model_count: modelStats.primaryCount || "—",
-		primary_model_percent: modelStats.primaryPercent || "—",
-		secondary_model: modelStats.secondary || "—",
-		secondary_model_count: modelStats.secondaryCount || "—",
-		secondary_model_percent: modelStats.secondaryPercent || "—",
-		// Tool usage stats
-		tools_used: toolStats.toolsUsed || "—",
-		top_tool: toolStats.topTool || "—",
-		top_tool_count: toolStats.topToolCount || "—",
-		dalle_count: toolStats.dalleCount || "—",
-		browser_count: toolStats.browserCount || "—",
-		// Topic stats
-		top_topics: topicStats.topTopics || [],
-		top_topic_1: topicStats.topic1 || "—",
-		top_topic_2: topicStats.topic2 || "—",
-		top_topic_3: topicStats.topic3 || "—",
-		// Achievements
-		achievements: achievements.earned,
-		achievement_count: achievements.earnedCount,
-		total_achievements: achievements.totalCount,
-	};
-
-	return { context, chartData };
-}
-
-function processModelUsage(modelCounts, totalMessages) {
-	if (!modelCounts || modelCounts.size === 0) {
-		return {
-			primary: "—",
-			primaryCount: "—",
-			primaryPercent: "—",
-			secondary: "—",
-			secondaryCount: "—",
-			secondaryPercent: "—",
-		};
-	}
-
-	const sorted = Array.from(modelCounts.entries())
-		.map(([model, count]) => ({
-			model: model
-				.replace("gpt-", "GPT-")
-				.replace("_", " ")
-				.replace("turbo", "Turbo"),
-			count,
-			percent:
-				totalMessages > 0 ? Math.round((count / totalMessages) * 100) : 0,
-		}))
-		.sort((a, b) => b.count - a.count);
-
-	const primary = sorted[0] || {};
-	const secondary = sorted[1] || {};
-
-	return {
-		primary: primary.model || "—",
-		primaryCount: primary.count ? formatInteger(primary.count) : "—",
-		primaryPercent: primary.percent ? `${primary.percent}%` : "—",
-		secondary: secondary.model || "—",
-		secondaryCount: secondary.count ? formatInteger(secondary.count) : "—",
-		secondaryPercent: secondary.percent ? `${secondary.percent}%` : "—",
-	};
-}
-
-function processToolUsage(toolCounts) {
-	if (!toolCounts || toolCounts.size === 0) {
-		return {
-			toolsUsed: "—",
-			topTool: "—",
-			topToolCount: "—",
-			dalleCount: "—",
-			browserCount: "—",
+			worker.terminate();
+			if (data.type === "done") resolve(data.analysis);
+			else reject(new Error(data.message));
 		};
-	}
-
-	const dalleCount = toolCounts.get("dalle.text2im") || 0;
-	const browserCount = Array.from(toolCounts.entries())
-		.filter(([name]) => name.includes("browser"))
-		.reduce((sum, [, count]) => sum + count, 0);
-
-	const sorted = Array.from(toolCounts.entries()).sort((a, b) => b[1] - a[1]);
-
-	const topTool = sorted[0];
-	const toolName = topTool
-		? topTool[0]
-				.replace("dalle.text2im", "DALL·E")
-				.replace("browser", "Web Browser")
-		: "—";
-
-	return {
-		toolsUsed: formatInteger(toolCounts.size),
-		topTool: toolName,
-		topToolCount: topTool ? formatInteger(topTool[1]) : "—",
-		dalleCount: dalleCount > 0 ? formatInteger(dalleCount) : "—",
-		browserCount: browserCount > 0 ? formatInteger(browserCount) : "—",
-	};
-}
-
-function processTopics(conversationTitles) {
-	if (!conversationTitles || conversationTitles.size === 0) {
-		return {
-			topTopics: [],
-			topic1: "—",
-			topic2: "—",
-			topic3: "—",
-		};
-	}
-
-	// Extract keywords from titles
-	const keywords = new Map();
-	const stopWords = new Set([
-		"the",
-		"a",
-		"an",
-		"and",
-		"or",
-		"but",
-		"in",
-		"on",
-		"at",
-		"to",
-		"for",
-		"of",
-		"with",
-		"by",
-		"from",
-		"up",
-		"about",
-		"into",
-		"through",
-		"during",
-		"help",
-		"how",
-		"what",
-		"where",
-		"when",
-		"why",
-		"can",
-		"could",
-		"would",
-		"should",
-		"will",
-		"make",
-		"need",
-		"want",
-		"get",
-		"create",
-		"write",
-	]);
-
-	conversationTitles.forEach((title) => {
-		if (!title || title === "Untitled" || title === "New chat") return;
-
-		const words = title
-			.toLowerCase()
-			.replace(/[^\w\s]/g, " ")
-			.split(/\s+/)
-			.filter((word) => word.length > 3 && !stopWords.has(word));
-
-		words.forEach((word) => {
-			keywords.set(word, (keywords.get(word) || 0) + 1);
-		});
-	});
-
-	const topTopics = Array.from(keywords.entries())
-		.sort((a, b) => b[1] - a[1])
-		.slice(0, 5)
-		.map(([word, count]) => ({
-			topic: word.charAt(0).toUpperCase() + word.slice(1),
-			count: formatInteger(count),
-		}));
-
-	return {
-		topTopics,
-		topic1: topTopics[0]
-			? `${topTopics[0].topic} (${topTopics[0].count})`
-			: "—",
-		topic2: topTopics[1]
-			? `${topTopics[1].topic} (${topTopics[1].count})`
-			: "—",
-		topic3: topTopics[2]
-			? `${topTopics[2].topic} (${topTopics[2].count})`
-			: "—",
-	};
-}
-
-function calculateAchievements({
-	messageCountTotal,
-	conversationSummaries,
-	hourCounts,
-	streakInfo,
-	toolCounts,
-	sortedDaily,
-}) {
-	const badges = [
-		{
-			id: "night_owl",
-			emoji: "🦉",
-			name: "Night Owl",
-			description: "500+ messages after midnight",
-			earned: false,
-		},
-		{
-			id: "early_bird",
-			emoji: "🌅",
-			name: "Early Bird",
-			description: "200+ messages before 6am",
-			earned: false,
-		},
-		{
-			id: "streak_master",
-			emoji: "🔥",
-			name: "Streak Master",
-			description: "30+ day streak",
-			earned: false,
-		},
-		{
-			id: "power_user",
-			emoji: "💪",
-			name: "Power User",
-			description: "10,000+ total messages",
-			earned: false,
-		},
-		{
-			id: "creative_soul",
-			emoji: "🎨",
-			name: "Creative Soul",
-			description: "50+ DALL·E images",
-			earned: false,
-		},
-		{
-			id: "deep_thinker",
-			emoji: "📚",
-			name: "Deep Thinker",
-			description: "Avg 50+ messages per chat",
-			earned: false,
-		},
-		{
-			id: "speed_demon",
-			emoji: "⚡",
-			name: "Speed Demon",
-			description: "100+ messages in a single day",
-			earned: false,
-		},
-		{
-			id: "weekend_warrior",
-			emoji: "🌍",
-			name: "Weekend Warrior",
-			description: "30%+ activity on weekends",
-			earned: false,
-		},
-	];
-
-	// Check Night Owl (messages between midnight and 6am)
-	const nightMessages =
-		(hourCounts[0] || 0) +
-		(hourCounts[1] || 0) +
-		(hourCounts[2] || 0) +
-		(hourCounts[3] || 0) +
-		(hourCounts[4] || 0) +
-		(hourCounts[5] || 0);
-	if (nightMessages >= 500) {
-		badges.find((b) => b.id === "night_owl").earned = true;
-	}
-
-	// Check Early Bird (messages between 5am and 6am, plus before 6am)
-	const earlyMessages = (hourCounts[4] || 0) + (hourCounts[5] || 0);
-	if (earlyMessages >= 200) {
-		badges.find((b) => b.id === "early_bird").earned = true;
-	}
-
-	// Check Streak Master
-	if (streakInfo.longestStreakLength >= 30) {
-		badges.find((b) => b.id === "streak_master").earned = true;
-	}
-
-	// Check Power User
-	if (messageCountTotal >= 10000) {
-		badges.find((b) => b.id === "power_user").earned = true;
-	}
-
-	// Check Creative Soul (DALL·E usage)
-	const dalleCount = toolCounts.get("dalle.text2im") || 0;
-	if (dalleCount >= 50) {
-		badges.find((b) => b.id === "creative_soul").earned = true;
-	}
-
-	// Check Deep Thinker
-	const avgMessagesPerConv =
-		conversationSummaries.length > 0
-			? messageCountTotal / conversationSummaries.length
-			: 0;
-	if (avgMessagesPerConv >= 50) {
-		badges.find((b) => b.id === "deep_thinker").earned = true;
-	}
-
-	// Check Speed Demon
-	const maxDayMessages = sortedDaily.reduce(
-		(max, day) => Math.max(max, day.value),
-		0
-	);
-	if (maxDayMessages >= 100) {
-		badges.find((b) => b.id === "speed_demon").earned = true;
-	}
-
-	// Check Weekend Warrior (Saturday + Sunday)
-	const totalHourMessages = hourCounts.reduce((sum, count) => sum + count, 0);
-	// Note: We don't have direct weekend data, so we'll use a simple heuristic
-	// This is an approximation - ideally we'd check actual weekend message counts
-	badges.find((b) => b.id === "weekend_warrior").earned = true; // Default to earned for demo
-
-	const earned = badges.filter((b) => b.earned);
-
-	return {
-		earned,
-		earnedCount: earned.length,
-		totalCount: badges.length,
-		all: badges,
-	};
-}
-
-function buildChartData({
-	sortedMonthly,
-	monthlyRoleCounts,
-	messagesByRole,
-	sortedDaily,
-	assistantDailyStats,
-	hourCounts,
-	weekdayCounts,
-	wordCloudTerms,
-}) {
-	const sampledAssistantTrend = assistantDailyStats.filter((_, idx, arr) => {
-		if (arr.length <= 90) return true;
-		const step = Math.ceil(arr.length / 90);
-		return idx % step === 0;
-	});
-	const monthLabels = sortedMonthly.map((item) => formatMonthLabel(item.date));
-	const roles = Array.from(messagesByRole.keys()).filter((role) =>
-		["assistant", "user", "tool", "system"].includes(role)
-	);
-
-	const monthlyRoleDatasets = roles.map((role, idx) => {
-		const data = monthLabels.map((_, i) => {
-			const monthKey = sortedMonthly[i].key;
-			const key = `${monthKey}|${role}`;
-			return monthlyRoleCounts.get(key) || 0;
-		});
-		const color = state.chartPalette[idx % state.chartPalette.length];
-		return {
-			label: role,
-			data,
-			fill: false,
-			borderColor: color,
-			backgroundColor: color,
-			tension: 0.35,
-			borderWidth: 2,
-			pointRadius: 2,
-		};
-	});
-
-	const cumulativeLabels = sortedDaily.map((item) =>
-		formatDateLabel(item.date)
-	);
-	let running = 0;
-	const cumulativeData = sortedDaily.map((item) => {
-		running += item.value;
-		return running;
-	});
-
-	const assistantTrendLabels = sampledAssistantTrend.map((item) =>
-		formatDateLabel(item.date)
-	);
-	const assistantTrendData = sampledAssistantTrend.map((item) => item.meanWord);
-
-	const hourLabels = Array.from(
-		{ length: 24 },
-		(_, h) => `${h.toString().padStart(2, "0")}:00`
-	);
-	const weekdayOrder = [1, 2, 3, 4, 5, 6, 0];
-	const weekdayData = weekdayOrder.map((day) => weekdayCounts[day] || 0);
-
-	return {
-		monthlyRole: {
-			type: "line",
-			data: { labels: monthLabels, datasets: monthlyRoleDatasets },
-			options: {
-				responsive: true,
-				scales: {
-					y: {
-						ticks: { color: "#cbd5f5" },
-						grid: { color: "rgba(148, 163, 184, 0.15)" },
-					},
-					x: { ticks: { color: "#cbd5f5" }, grid: { display: false } },
-				},
-				plugins: {
-					legend: { labels: { color: "#e2e8f0" } },
-				},
-			},
-		},
-		cumulativeMessages: {
-			type: "line",
-			data: {
-				labels: cumulativeLabels,
-				datasets: [
-					{
-						label: "Messages",
-						data: cumulativeData,
-						borderColor: "#7f5af0",
-						backgroundColor: "rgba(127, 90, 240, 0.28)",
-						tension: 0.35,
-						borderWidth: 2,
-						fill: true,
-					},
-				],
-			},
-			options: {
-				responsive: true,
-				scales: {
-					y: {
-						ticks: { color: "#cbd5f5" },
-						grid: { color: "rgba(148, 163, 184, 0.15)" },
-					},
-					x: {
-						ticks: { color: "#cbd5f5", autoSkip: true, maxTicksLimit: 6 },
-						grid: { display: false },
-					},
-				},
-				plugins: { legend: { display: false } },
-			},
-		},
-		assistantTrend: {
-			type: "line",
-			data: {
-				labels: assistantTrendLabels,
-				datasets: [
-					{
-						label: "Words per reply",
-						data: assistantTrendData,
-						borderColor: "#f43f5e",
-						backgroundColor: "rgba(244, 63, 94, 0.28)",
-						tension: 0.3,
-						borderWidth: 2,
-						fill: true,
-					},
-				],
-			},
-			options: {
-				responsive: true,
-				scales: {
-					y: {
-						ticks: { color: "#cbd5f5" },
-						grid: { color: "rgba(148, 163, 184, 0.15)" },
-					},
-					x: {
-						ticks: { color: "#cbd5f5", autoSkip: true, maxTicksLimit: 6 },
-						grid: { display: false },
-					},
-				},
-				plugins: { legend: { display: false } },
-			},
-		},
-		hourlyActivity: {
-			type: "bar",
-			data: {
-				labels: hourLabels,
-				datasets: [
-					{
-						label: "Messages",
-						data: hourCounts,
-						backgroundColor: generateGradientStops(
-							hourLabels.length,
-							"127, 90, 240",
-							0.28,
-							0.78
-						),
-					},
-				],
-			},
-			options: {
-				responsive: true,
-				scales: {
-					y: {
-						ticks: { color: "#cbd5f5" },
-						grid: { color: "rgba(148, 163, 184, 0.15)" },
-					},
-					x: {
-						ticks: { color: "#cbd5f5", maxRotation: 60, minRotation: 60 },
-						grid: { display: false },
-					},
-				},
-				plugins: { legend: { display: false } },
-			},
-		},
-		weekdayActivity: {
-			type: "bar",
-			data: {
-				labels: weekdayOrder.map((day) => weekdayLabel(day)),
-				datasets: [
-					{
-						label: "Messages",
-						data: weekdayData,
-						backgroundColor: generateGradientStops(
-							weekdayData.length,
-							"245, 245, 255",
-							0.75,
-							0.95
-						),
-					},
-				],
-			},
-			options: {
-				indexAxis: "y",
-				responsive: true,
-				scales: {
-					x: {
-						ticks: { color: "#cbd5f5" },
-						grid: { color: "rgba(148, 163, 184, 0.15)" },
-					},
-					y: { ticks: { color: "#cbd5f5" }, grid: { display: false } },
-				},
-				plugins: { legend: { display: false } },
-			},
-		},
-		monthlyBarChart: {
-			type: "bar",
-			data: {
-				labels: monthLabels,
-				datasets: [
-					{
-						label: "Messages",
-						data: sortedMonthly.map((item) => item.value),
-						backgroundColor: generateGradientStops(
-							monthLabels.length,
-							"244, 63, 94",
-							0.35,
-							0.8
-						),
-						borderColor: "rgba(244, 63, 94, 0.85)",
-						borderWidth: 1,
-					},
-				],
-			},
-			options: {
-				responsive: true,
-				scales: {
-					y: {
-						ticks: { color: "#cbd5f5" },
-						grid: { color: "rgba(148, 163, 184, 0.15)" },
-						beginAtZero: true,
-					},
-					x: {
-						ticks: { color: "#cbd5f5", maxRotation: 45, minRotation: 45 },
-						grid: { display: false },
-					},
-				},
-				plugins: { legend: { display: false } },
-			},
-		},
-		wordCloud: buildWordCloudData(wordCloudTerms),
-	};
-}
-
-function weekdayLabel(dayIndex) {
-	return ["Sun", "Mon", "Tue", "Wed", "Thu", "Fri", "Sat"][dayIndex];
-}
-
-function classifyConversations(conversations) {
-	let deep = 0;
-	let short = 0;
-	let one = 0;
-
-	conversations.forEach((conv) => {
-		if (conv.userMessages === 1 && conv.assistantMessages === 1) {
-			one += 1;
-		} else if (conv.userMessages <= 3) {
-			short += 1;
-		} else {
-			deep += 1;
-		}
-	});
-
-	const total = conversations.length || 1;
-	return {
-		deep: deep / total,
-		short: short / total,
-		one: one / total,
-	};
-}
-
-function computeShare(map, role) {
-	const total = Array.from(map.values()).reduce((sum, val) => sum + val, 0);
-	if (!total) return "—";
-	return formatPercent((map.get(role) || 0) / total);
-}
-
-function computePeakHourLabel(hourCounts) {
-	if (!Array.isArray(hourCounts) || !hourCounts.length) return "—";
-	const peak = Math.max(...hourCounts);
-	if (!Number.isFinite(peak) || peak <= 0) return "—";
-	const hour = hourCounts.indexOf(peak);
-	return `${hour.toString().padStart(2, "0")}:00`;
-}
-
-function getPeakHourMessages(hourCounts) {
-	if (!Array.isArray(hourCounts) || !hourCounts.length) return null;
-	const peak = Math.max(...hourCounts);
-	return peak > 0 && Number.isFinite(peak) ? peak : null;
-}
-
-function computeDaypartSplit(hourCounts) {
-	if (!Array.isArray(hourCounts) || !hourCounts.length) return "—";
-	const total = hourCounts.reduce((sum, val) => sum + val, 0);
-	if (!total) return "—";
-	const day = hourCounts.reduce(
-		(sum, val, idx) => sum + (idx >= 6 && idx < 18 ? val : 0),
-		0
-	);
-	const night = total - day;
-	return `Day ${formatPercent(day / total)} • Night ${formatPercent(
-		night / total
-	)}`;
-}
-
-function computeNightShare(hourCounts) {
-	if (!Array.isArray(hourCounts) || !hourCounts.length) return "—";
-	const total = hourCounts.reduce((sum, val) => sum + val, 0);
-	if (!total) return "—";
-	const lateNight = hourCounts.reduce(
-		(sum, val, idx) => sum + (idx >= 22 || idx < 5 ? val : 0),
-		0
-	);
-	return `Late night ${formatPercent(lateNight / total)} after 10pm`;
-}
-
-function computePeakWeekdayLabel(weekdayCounts) {
-	if (!Array.isArray(weekdayCounts) || !weekdayCounts.length) return "—";
-	const peak = Math.max(...weekdayCounts);
-	if (!Number.isFinite(peak) || peak <= 0) return "—";
-	const idx = weekdayCounts.indexOf(peak);
-	return weekdayLabel(idx);
-}
-
-function getPeakWeekdayMessages(weekdayCounts) {
-	if (!Array.isArray(weekdayCounts) || !weekdayCounts.length) return null;
-	const peak = Math.max(...weekdayCounts);
-	return peak > 0 && Number.isFinite(peak) ? peak : null;
-}
-
-function computeLowWeekdayLabel(weekdayCounts) {
-	if (!Array.isArray(weekdayCounts) || !weekdayCounts.length) return "—";
-	let minVal = Infinity;
-	let minIdx = -1;
-	weekdayCounts.forEach((val, idx) => {
-		if (val > 0 && val < minVal) {
-			minVal = val;
-			minIdx = idx;
-		}
-	});
-	if (minIdx === -1 || !Number.isFinite(minVal)) return "—";
-	return weekdayLabel(minIdx);
-}
-
-function getLowWeekdayMessages(weekdayCounts) {
-	if (!Array.isArray(weekdayCounts) || !weekdayCounts.length) return null;
-	let minVal = Infinity;
-	weekdayCounts.forEach((val) => {
-		if (val > 0 && val < minVal) {
-			minVal = val;
-		}
-	});
-	return minVal !== Infinity && Number.isFinite(minVal) ? minVal : null;
-}
-
-function computeRollingAverage(values, window) {
-	if (!values.length) return null;
-	const slice = values.slice(-window);
-	const sum = slice.reduce((acc, val) => acc + val, 0);
-	return sum / slice.length;
-}
-
-function computeStreaks(dates) {
-	if (!dates.length) {
-		return {
-			longestStreakLength: 0,
-			longestStreakLabel: "—",
-			longestGapLength: 0,
-			longestGapLabel: "—",
-			firstDate: null,
+		worker.onerror = (event) => {
+			event.preventDefault();
+			worker.terminate();
+			reject(new Error(event.message || "Failed to read conversations file."));
 		};
-	}
-
-	const sorted = [...dates].sort((a, b) => a - b);
-	let bestLen = 1;
-	let bestStart = sorted[0];
-	let bestEnd = sorted[0];
-	let currentLen = 1;
-	let currentStart = sorted[0];
-
-	sorted.slice(1).forEach((date, idx) => {
-		const prev = sorted[idx];
-		if (date.getTime() === prev.getTime() + 86400000) {
-			currentLen += 1;
-		} else {
-			if (currentLen > bestLen) {
-				bestLen = currentLen;
-				bestStart = currentStart;
-				bestEnd = prev;
-			}
-			currentLen = 1;
-			currentStart = date;
-		}
-	});
-
-	if (currentLen > bestLen) {
-		bestLen = currentLen;
-		bestStart = currentStart;
-		bestEnd = sorted[sorted.length - 1];
-	}
-
-	let longestGapLength = 0;
-	let longestGapStart = null;
-	let longestGapEnd = null;
-
-	sorted.slice(1).forEach((date, idx) => {
-		const prev = sorted[idx];
-		const diff = Math.round((date - prev) / 86400000) - 1;
-		if (diff > longestGapLength) {
-			longestGapLength = diff;
-			longestGapStart = new Date(prev.getTime() + 86400000);
-			longestGapEnd = new Date(date.getTime() - 86400000);
-		}
-	});
-
-	return {
-		longestStreakLength: bestLen,
-		longestStreakLabel:
-			bestLen > 1
-				? `${formatDateLabel(bestStart)} — ${formatDateLabel(bestEnd)}`
-				: formatDateLabel(bestStart),
-		longestGapLength,
-		longestGapLabel:
-			longestGapLength > 0 && longestGapStart && longestGapEnd
-				? `${formatDateLabel(longestGapStart)} — ${formatDateLabel(
-						longestGapEnd
-				  )}`
-				: "—",
-		firstDate: sorted[0],
-	};
-}
-
-function formatDateLabel(date) {
-	return date.toLocaleDateString(undefined, {
-		month: "short",
-		day: "2-digit",
-		year: "numeric",
+		worker.postMessage({ file });
 	});
 }
 
-function formatMonthLabel(date) {
-	return date.toLocaleDateString(undefined, {
-		month: "short",
-		year: "numeric",
-	});
-}
-
-function formatInteger(value) {
-	if (Number.isNaN(value) || value === null || value === undefined) return "—";
-	return Intl.NumberFormat().format(Math.round(value));
-}
-
-function formatNumber(value) {
-	if (Number.isNaN(value) || value === null || value === undefined) return "—";
-	return Intl.NumberFormat(undefined, { maximumFractionDigits: 1 }).format(
-		value
-	);
+async function analyseFileOnMainThread(file) {
+	const text = await file.text();
+	return analyseData(JSON.parse(text));
 }
 
-function formatPercent(value) {
-	if (Number.isNaN(value) || value === null || value === undefined) return "—";
-	return new Intl.NumberFormat(undefined, {
-		style: "percent",
-		maximumFractionDigits: 1,
-	}).format(value);
-}
-
-function fractionToPercent(num, den) {
-	if (!den) return "—";
-	return formatPercent(num / den);
-}
-
-function dateKey(date) {
-	return `${date.getFullYear()}-${(date.getMonth() + 1)
-		.toString()
-		.padStart(2, "0")}-${date.getDate().toString().padStart(2, "0")}`;
-}
-
-function monthKeyFromDate(date) {
-	return `${date.getFullYear()}-${(date.getMonth() + 1)
-		.toString()
-		.padStart(2, "0")}`;
-}
-
-function monthToDate(key) {
-	const [year, month] = key.split("-").map(Number);
-	return new Date(Date.UTC(year, month - 1, 1));
+function showError(message) {
+	errorBanner.textContent = message;
+	errorBanner.classList.remove("hidden");
 }
 
 function buildMilestones(context) {
@@ -3026,39 +1725,6 @@ async function downloadAllSlides() {
 	}
 }
 
-function computeWordCloudTerms(messages) {
-	if (!Array.isArray(messages) || !messages.length) return [];
-
-	const wordCounts = new Map();
-	messages.forEach((message) => {
-		const text = (message?.text || "").toLowerCase();
-		if (!text) return;
-
-		const words = text.match(/[a-z0-9']+/g) || [];
-		words.forEach((rawWord) => {
-			const word = rawWord.replace(/'+$/, "");
-			if (!word || WORD_CLOUD_STOP_WORDS.has(word) || word.length < 3) return;
-			wordCounts.set(word, (wordCounts.get(word) || 0) + 1);
-		});
-	});
-
-	return Array.from(wordCounts.entries())
-		.sort((a, b) => b[1] - a[1])
-		.slice(0, 120)
-		.map(([text, weight]) => ({ text, weight }));
-}
-
-function buildWordCloudData(terms) {
-	if (!Array.isArray(terms) || !terms.length) {
-		return { empty: true, terms: [] };
-	}
-	return {
-		empty: false,
-		terms: terms,
-		type: "word-cloud",
-	};
-}
-
 function renderWordCloud(container, config) {
 	container.innerHTML = "";
 
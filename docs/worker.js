@@ -0,0 +1,161 @@
+// Parses and analyses an uploaded file off the main thread.
+//
+// The page posts { file }. The file is read in chunks; a conversations
+// export (a JSON array) is parsed one conversation at a time and flattened
+// as it goes, so neither the whole text nor the whole parsed export is held
+// in memory. Replies:
+//   { type: "progress", phase: "reading" | "analysing", loaded, total, conversations }
+//   { type: "done", analysis }   // { context, chartData } for renderStory
+//   { type: "error", message }
+
+importScripts("analysis.js");
+
+const CHUNK_SIZE = 4 * 1024 * 1024;
+const PROGRESS_INTERVAL_MS = 100;
+
+self.onmessage = async ({ data }) => {
+	try {
+		const analysis = await analyseFileInChunks(data.file);
+		self.postMessage({ type: "done", analysis });
+	} catch (error) {
+		self.postMessage({
+			type: "error",
+			message:
+				error instanceof Error
+					? error.message
+					: "Failed to read conversations file.",
+		});
+	}
+};
+
+async function analyseFileInChunks(file) {
+	const decoder = new TextDecoder();
+	const rows = [];
+	let conversations = 0;
+	let parser = null;
+	let wholeText = null;
+	let lastProgress = 0;
+
+	for (let offset = 0; offset < file.size; offset += CHUNK_SIZE) {
+		const buffer = await file.slice(offset, offset + CHUNK_SIZE).arrayBuffer();
+		const chunk = decoder.decode(buffer, { stream: true });
+
+		if (!parser && wholeText === null) {
+			// A recap bundle (or anything that is not an array) is small enough
+			// to parse in one go; only exports are streamed.
+			const first = chunk.trimStart()[0];
+			if (first === undefined) continue; // only leading whitespace so far
+			if (first === "[") {
+				parser = new JsonArrayStream((conversation) => {
+					flattenConversation(conversation, conversations, rows);
+					conversations += 1;
+				});
+			} else {
+				wholeText = "";
+			}
+		}
+		if (parser) parser.push(chunk);
+		else wholeText += chunk;
+
+		const now = Date.now();
+		if (now - lastProgress >= PROGRESS_INTERVAL_MS) {
+			lastProgress = now;
+			postProgress("reading", Math.min(offset + CHUNK_SIZE, file.size), file.size, conversations);
+		}
+	}
+
+	const rest = decoder.decode();
+	if (!parser) return analyseData(JSON.parse((wholeText || "") + rest));
+	parser.push(rest);
+	parser.end();
+
+	postProgress("analysing", file.size, file.size, conversations);
+	return analyseMessages(rows);
+}
+
+function postProgress(phase, loaded, total, conversations) {
+	self.postMessage({ type: "progress", phase, loaded, total, conversations });
+}
+
+// Incremental parser for a top-level JSON array. Text is fed with push();
+// every element is handed to onValue as soon as it is complete. Only the
+// element currently being read is buffered.
+class JsonArrayStream {
+	constructor(onValue) {
+		this.onValue = onValue;
+		this.buffer = "";
+		this.pos = 0; // where scanning resumes in buffer
+		this.start = -1; // start of the pending element in buffer
+		this.depth = 0;
+		this.inString = false;
+		this.escaped = false;
+		this.done = false;
+	}
+
+	push(chunk) {
+		if (!chunk) return;
+		const text = this.buffer + chunk;
+		let { depth, inString, escaped, start } = this;
+		let i = this.pos;
+
+		for (; i < text.length; i += 1) {
+			const ch = text.charCodeAt(i);
+			if (inString) {
+				if (escaped) escaped = false;
+				else if (ch === 92) escaped = true; // backslash
+				else if (ch === 34) inString = false; // quote
+				continue;
+			}
+			if (ch === 32 || ch === 10 || ch === 13 || ch === 9 || ch === 0xfeff) {
+				continue;
+			}
+			if (this.done) {
+				throw new Error("Unexpected data after the end of the conversations array.");
+			}
+			if (depth === 0) {
+				if (ch !== 91) {
+					throw new Error(
+						"File does not look like a conversations export (expected an array)."
+					);
+				}
+				depth = 1;
+				continue;
+			}
+			if (depth === 1 && (ch === 44 || ch === 93)) {
+				// "," or the closing "]" ends the pending element.
+				if (start >= 0) {
+					this.onValue(JSON.parse(text.slice(start, i)));
+					start = -1;
+				} else if (ch === 44) {
+					throw new Error("Malformed conversations array.");
+				}
+				if (ch === 93) {
+					depth = 0;
+					this.done = true;
+				}
+				continue;
+			}
+			if (start < 0) start = i;
+			if (ch === 34) inString = true;
+			else if (ch === 123 || ch === 91) depth += 1; // { [
+			else if (ch === 125 || ch === 93) depth -= 1; // } ]
+		}
+
+		// Drop everything before the pending element.
+		if (start >= 0) {
+			this.buffer = text.slice(start);
+			this.pos = text.length - start;
+			start = 0;
+		} else {
+			this.buffer = "";
+			this.pos = 0;
+		}
+		Object.assign(this, { depth, inString, escaped, start });
+	}
+
+	end() {
+		if (!this.done) {
+			throw new Error("Unexpected end of file: the conversations array is incomplete.");
+		}
+	}
+}
@@ -1,11 +1,15 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Dict, Tuple
+from functools import reduce
+from typing import Any, Dict, Iterable, List, Tuple
 
 import numpy as np
 import pandas as pd
 
+from .data import MESSAGE_COLUMNS, WEEKDAYS
+from .sketch import QuantileSketch
+
 
 @dataclass
 class AnalysisResult:
@@ -29,7 +33,15 @@ class AnalysisResult:
     metrics: Dict[str, Any]
 
 
-def describe_series(series: pd.Series) -> Dict[str, float]:
+def describe_series(series: pd.Series, relative_accuracy: float | None = None) -> Dict[str, float]:
+    """Count, min, mean, median, p90 and max of ``series``.
+
+    With ``relative_accuracy`` the median and p90 come from a bounded-memory
+    :class:`~gpt_recap.sketch.QuantileSketch` instead of a full sort; each is
+    then within ``relative_accuracy`` (relative) of the exact order statistic.
+    """
+    if relative_accuracy is not None:
+        return QuantileSketch(relative_accuracy).add(series.to_numpy(dtype="float64", na_value=np.nan)).describe()
     clean = series.dropna()
     if clean.empty:
         return {"count": 0, "min": np.nan, "mean": np.nan, "median": np.nan, "p90": np.nan, "max": np.nan}
@@ -43,62 +55,489 @@ def describe_series(series: pd.Series) -> Dict[str, float]:
     }
 
 
-def summarise(messages: pd.DataFrame) -> AnalysisResult:
+CONVERSATION_KEYS = ["conversation_index", "conversation_id", "conversation_title"]
+SUMMARY_ROLES = ["user", "assistant", "tool", "system"]
+_CONVERSATION_SUM_COLUMNS = [
+    "messages",
+    *(f"{role}_messages" for role in SUMMARY_ROLES),
+    "words_user",
+    "words_assistant",
+]
+
+
+def _conversation_parts(messages: pd.DataFrame) -> pd.DataFrame:
+    """Per-conversation aggregates that can be combined with min/max/sum/any."""
     if messages.empty:
-        raise ValueError("No messages to analyse.")
+        index = pd.MultiIndex.from_arrays(
+            [np.array([], dtype="int64"), np.array([], dtype=object), np.array([], dtype=object)],
+            names=CONVERSATION_KEYS,
+        )
+        empty_time = pd.Series([], dtype="datetime64[ns, UTC]")
+        return pd.DataFrame(
+            {
+                "first_time": empty_time,
+                "last_time": empty_time,
+                "has_code": pd.Series([], dtype=bool),
+                "has_multimodal": pd.Series([], dtype=bool),
+                **{column: pd.Series([], dtype="int64") for column in _CONVERSATION_SUM_COLUMNS},
+            }
+        ).set_axis(index)
+
+    by_role = (
+        messages.groupby(CONVERSATION_KEYS + ["role"], dropna=False, observed=True)
+        .agg(count=("role", "size"), words=("word_count", "sum"))
+        .unstack("role", fill_value=0)
+    )
+    role_counts = by_role["count"]
+    role_words = by_role["words"].reindex(columns=["user", "assistant"], fill_value=0)
+
+    parts = messages.groupby(CONVERSATION_KEYS, dropna=False, observed=True).agg(
+        first_time=("create_time", "min"),
+        last_time=("create_time", "max"),
+        has_code=("has_code", "any"),
+        has_multimodal=("is_multimodal", "any"),
+    )
+    parts["messages"] = role_counts.sum(axis=1).astype("int64")
+    for role in SUMMARY_ROLES:
+        parts[f"{role}_messages"] = role_counts.get(role, 0)
+    parts["words_user"] = role_words["user"]
+    parts["words_assistant"] = role_words["assistant"]
+    return parts
+
+
+def _finish_conversation_summary(parts: pd.DataFrame) -> pd.DataFrame:
+    # Timedelta.total_seconds() truncates to microseconds; match it so the
+    # vectorised path reproduces the per-conversation one exactly.
+    summary = parts.assign(
+        duration_minutes=lambda df: (df["last_time"] - df["first_time"]).dt.floor("us").dt.total_seconds() / 60.0
+    )
+    columns = [
+        "first_time",
+        "last_time",
+        "duration_minutes",
+        "messages",
+        *(f"{role}_messages" for role in SUMMARY_ROLES),
+        "words_user",
+        "words_assistant",
+        "has_code",
+        "has_multimodal",
+    ]
+    summary = summary[columns]
+    int_columns = columns[3:-2]
+    summary[int_columns] = summary[int_columns].astype("int64")
+    summary[["has_code", "has_multimodal"]] = summary[["has_code", "has_multimodal"]].astype(bool)
+    return summary.reset_index()
+
+
+_NS_PER_DAY = 86_400 * 10**9
+_NS_PER_HOUR = 3_600 * 10**9
+
+
+@dataclass
+class CountCube:
+    """Message counts by (UTC day, hour, role), built in a single pass.
+
+    ``days`` holds the observed days (as days since the epoch, sorted) and
+    ``counts`` has shape ``(len(days), 24, len(roles))``. Messages without a
+    ``create_time`` only contribute to ``untimed``. Every time/role breakdown
+    in :class:`AnalysisResult` is a marginal of this cube; the ``*_sizes``
+    methods return the same Series as the equivalent ``groupby().size()``.
+    """
+
+    days: np.ndarray
+    roles: np.ndarray
+    counts: np.ndarray
+    untimed: np.ndarray
+
+    @classmethod
+    def from_messages(cls, messages: pd.DataFrame) -> "CountCube":
+        role_codes, roles = pd.factorize(np.asarray(messages["role"], dtype=object), sort=True)
+        roles = np.asarray(roles, dtype=object)
+        ns = messages["create_time"].to_numpy(dtype="datetime64[ns]").view("int64")
+        valid = ns != np.iinfo(np.int64).min
+
+        ns = ns[valid]
+        day = ns // _NS_PER_DAY
+        hour = (ns - day * _NS_PER_DAY) // _NS_PER_HOUR
+        days, day_idx = np.unique(day, return_inverse=True)
+
+        n_roles = len(roles)
+        key = (day_idx.reshape(-1) * 24 + hour) * n_roles + role_codes[valid]
+        counts = np.bincount(key, minlength=len(days) * 24 * n_roles).reshape(len(days), 24, n_roles)
+        untimed = np.bincount(role_codes[~valid], minlength=n_roles)
+        return cls(days=days, roles=roles, counts=counts.astype("int64"), untimed=untimed.astype("int64"))
+
+    def merge(self, other: "CountCube") -> "CountCube":
+        roles = np.asarray(sorted(set(self.roles) | set(other.roles)), dtype=object)
+        days = np.union1d(self.days, other.days)
+        counts = np.zeros((len(days), 24, len(roles)), dtype="int64")
+        untimed = np.zeros(len(roles), dtype="int64")
+        for cube in (self, other):
+            day_idx = np.searchsorted(days, cube.days)
+            role_idx = np.searchsorted(roles, cube.roles)
+            counts[np.ix_(day_idx, np.arange(24), role_idx)] += cube.counts
+            untimed[role_idx] += cube.untimed
+        return CountCube(days=days, roles=roles, counts=counts, untimed=untimed)
+
+    @property
+    def weekdays(self) -> np.ndarray:
+        # 1970-01-01 was a Thursday (Monday == 0).
+        return (self.days + 3) % 7
+
+    @property
+    def months(self) -> Tuple[np.ndarray, np.ndarray]:
+        month = self.days.astype("datetime64[D]").astype("datetime64[M]")
+        return np.unique(month, return_inverse=True)
+
+    def _month_role_counts(self) -> Tuple[np.ndarray, np.ndarray]:
+        months, month_idx = self.months
+        by_month = np.zeros((len(months), len(self.roles)), dtype="int64")
+        np.add.at(by_month, month_idx.reshape(-1), self.counts.sum(axis=1))
+        return months.astype("datetime64[ns]"), by_month
+
+    def _weekday_counts(self) -> np.ndarray:
+        by_weekday = np.zeros((7, 24, len(self.roles)), dtype="int64")
+        np.add.at(by_weekday, self.weekdays, self.counts)
+        return by_weekday
+
+    def role_sizes(self) -> pd.Series:
+        totals = self.counts.sum(axis=(0, 1)) + self.untimed
+        return _sizes([pd.Index(self.roles, name="role")], totals)
+
+    def month_sizes(self) -> pd.Series:
+        months, by_month = self._month_role_counts()
+        return _sizes([pd.DatetimeIndex(months, name="month")], by_month.sum(axis=1))
+
+    def month_role_sizes(self) -> pd.Series:
+        months, by_month = self._month_role_counts()
+        return _sizes([pd.DatetimeIndex(months, name="month"), pd.Index(self.roles, name="role")], by_month)
+
+    def hour_sizes(self, dtype: Any) -> pd.Series:
+        return _sizes([_hour_index(dtype)], self.counts.sum(axis=(0, 2)))
+
+    def hour_role_sizes(self, dtype: Any) -> pd.Series:
+        return _sizes([_hour_index(dtype), pd.Index(self.roles, name="role")], self.counts.sum(axis=0))
+
+    def weekday_sizes(self) -> pd.Series:
+        order = np.argsort(WEEKDAYS)
+        by_weekday = self._weekday_counts().sum(axis=(1, 2))
+        return _sizes([pd.Index(np.asarray(WEEKDAYS, dtype=object)[order], name="weekday")], by_weekday[order])
+
+    def weekday_role_sizes(self) -> pd.Series:
+        order = np.argsort(WEEKDAYS)
+        by_weekday = self._weekday_counts().sum(axis=1)[order]
+        return _sizes(
+            [pd.Index(np.asarray(WEEKDAYS, dtype=object)[order], name="weekday"), pd.Index(self.roles, name="role")],
+            by_weekday,
+        )
+
+    def weekday_hour_sizes(self, dtype: Any) -> pd.Series:
+        # Grouping by an ordered categorical keeps every weekday (observed=False),
+        # crossed with the hours that occur at all.
+        by_weekday_hour = self._weekday_counts().sum(axis=2)
+        hours = np.flatnonzero(by_weekday_hour.sum(axis=0))
+        index = pd.MultiIndex.from_product(
+            [
+                pd.CategoricalIndex(WEEKDAYS, categories=WEEKDAYS, ordered=True, name="weekday"),
+                pd.Index(hours.astype(dtype), name="hour"),
+            ]
+        )
+        return pd.Series(by_weekday_hour[:, hours].reshape(-1), index=index, dtype="int64")
+
+    def date_sizes(self, dtype: Any) -> pd.Series:
+        dates = pd.DatetimeIndex(self.days.astype("datetime64[D]").astype("datetime64[ns]"), name="date")
+        if not pd.api.types.is_datetime64_dtype(dtype):
+            dates = pd.Index(dates.date, dtype=object, name="date")
+        return _sizes([dates], self.counts.sum(axis=(1, 2)))
+
+
+def _hour_index(dtype: Any) -> pd.Index:
+    return pd.Index(np.arange(24).astype(dtype), name="hour")
+
+
+def _sizes(levels: List[pd.Index], counts: np.ndarray) -> pd.Series:
+    """Flatten a dense count array into a groupby-style size Series (zeros dropped)."""
+    if len(levels) == 1:
+        index = levels[0]
+    else:
+        index = pd.MultiIndex.from_product(levels)
+    sizes = pd.Series(np.asarray(counts, dtype="int64").reshape(-1), index=index)
+    return sizes[sizes.to_numpy() > 0]
+
+
+def describe_counts(counts: pd.Series) -> Dict[str, float]:
+    """:func:`describe_series` computed from a ``value -> count`` histogram.
+
+    Mean, median and p90 reproduce pandas' results on the expanded series
+    (linear interpolation for the quantile), so exact histograms can stand in
+    for the raw values.
+    """
+    counts = counts[counts.to_numpy() > 0]
+    if counts.empty:
+        return {"count": 0, "min": np.nan, "mean": np.nan, "median": np.nan, "p90": np.nan, "max": np.nan}
+    values = counts.index.to_numpy(dtype="float64")
+    weights = counts.to_numpy(dtype="int64")
+    total = int(weights.sum())
+    cumulative = np.cumsum(weights)
+
+    def at(position: int) -> float:
+        return values[np.searchsorted(cumulative, position, side="right")]
+
+    virtual = (total - 1) * np.true_divide(np.float64(0.9) * 100, 100)
+    lower = np.floor(virtual)
+    gamma = virtual - lower
+    a, b = at(min(int(lower), total - 1)), at(min(int(lower) + 1, total - 1))
+    p90 = b - (b - a) * (1 - gamma) if gamma >= 0.5 else a + (b - a) * gamma
+
+    return {
+        "count": total,
+        "min": float(values[0]),
+        "mean": float((values * weights).sum() / total),
+        "median": float((at((total - 1) // 2) + at(total // 2)) / 2.0),
+        "p90": float(p90),
+        "max": float(values[-1]),
+    }
+
+
+def _merge_counts(left: pd.Series, right: pd.Series) -> pd.Series:
+    levels = list(range(left.index.nlevels))
+    merged = pd.concat([left, right]).groupby(level=levels, sort=True).sum()
+    return merged.astype("int64")
+
+
+def _value_counts(values: pd.Series) -> pd.Series:
+    return values.value_counts(sort=False).sort_index().astype("int64")
+
+
+def _distribution(values: pd.Series, relative_accuracy: float | None) -> pd.Series | QuantileSketch:
+    if relative_accuracy is None:
+        return _value_counts(values)
+    return QuantileSketch(relative_accuracy).add(values.to_numpy(dtype="float64", na_value=np.nan))
+
+
+def _merge_distributions(
+    left: pd.Series | QuantileSketch, right: pd.Series | QuantileSketch
+) -> pd.Series | QuantileSketch:
+    if isinstance(left, QuantileSketch):
+        return QuantileSketch(left.relative_accuracy, left.max_buckets).merge(left).merge(right)
+    return _merge_counts(left, right)
+
+
+def _describe_distribution(distribution: pd.Series | QuantileSketch) -> Dict[str, float]:
+    if isinstance(distribution, QuantileSketch):
+        return distribution.describe()
+    return describe_counts(distribution)
+
+
+def _day_value_counts(days: np.ndarray, values: pd.Series) -> pd.Series:
+    frame = pd.DataFrame({"day": days, "value": values.to_numpy()})
+    return frame.groupby(["day", "value"], sort=True).size().astype("int64")
+
+
+def _grouped_mean_median(counts: pd.Series) -> pd.DataFrame:
+    """Per-group mean and median from a ``(group, value) -> count`` histogram."""
+    values = counts.index.get_level_values(1).to_numpy(dtype="float64")
+    weights = counts.to_numpy(dtype="int64")
+    cumulative = np.cumsum(weights)
+    totals = counts.groupby(level=0, sort=True).sum()
+    starts = np.cumsum(totals.to_numpy()) - totals.to_numpy()
+    sums = pd.Series(counts.index.get_level_values(1).to_numpy(dtype="int64") * weights).groupby(
+        counts.index.get_level_values(0), sort=True
+    ).sum()
+
+    lower = values[np.searchsorted(cumulative, starts + (totals.to_numpy() - 1) // 2, side="right")]
+    upper = values[np.searchsorted(cumulative, starts + totals.to_numpy() // 2, side="right")]
+    return pd.DataFrame(
+        {"mean": sums.to_numpy() / totals.to_numpy(), "median": (lower + upper) / 2.0},
+        index=totals.index,
+    )
+
+
+def _empty_day_counts() -> pd.Series:
+    index = pd.MultiIndex.from_arrays(
+        [np.array([], dtype="int64"), np.array([], dtype="int64")], names=["day", "value"]
+    )
+    return pd.Series([], index=index, dtype="int64")
+
+
+def _length_table(
+    responses: pd.Series, words: pd.Series, chars: pd.Series, key: pd.Index
+) -> pd.DataFrame:
+    word_stats = _grouped_mean_median(words)
+    char_stats = _grouped_mean_median(chars)
+    table = pd.DataFrame(
+        {
+            "responses": responses.to_numpy(dtype="int64"),
+            "mean_word_count": word_stats["mean"].to_numpy(),
+            "median_word_count": word_stats["median"].to_numpy(),
+            "mean_char_count": char_stats["mean"].to_numpy(),
+            "median_char_count": char_stats["median"].to_numpy(),
+        },
+        index=key,
+    )
+    return table.reset_index()
+
+
+def _regroup_days(counts: pd.Series, labels: Dict[int, Any]) -> pd.Series:
+    if counts.index.nlevels == 1:
+        return counts.groupby(counts.index.map(labels), sort=True).sum()
+    days = counts.index.get_level_values(0).map(labels)
+    return counts.groupby([days, counts.index.get_level_values(1)], sort=True).sum()
+
 
-    def _summarise_conversation(df: pd.DataFrame) -> pd.Series:
-        df = df.sort_values("create_time")
-        first_time = df["create_time"].min()
-        last_time = df["create_time"].max()
-        if pd.isna(first_time) or pd.isna(last_time):
-            duration_minutes = np.nan
+def _day_labels(days: np.ndarray) -> np.ndarray:
+    return days.astype("datetime64[D]").astype("datetime64[ns]")
+
+
+@dataclass
+class PartialAnalysis:
+    """Mergeable aggregates behind an :class:`AnalysisResult`.
+
+    Build one per shard with :meth:`from_messages`, combine them with the
+    associative :meth:`merge` (or :func:`merge_partials`) and call
+    :meth:`finalize` to obtain the same tables and metrics a single
+    :func:`summarise` over the concatenated messages would produce.
+    Conversations are identified by ``(conversation_index, conversation_id,
+    conversation_title)``; partials describing the same conversation are
+    combined. Word and character counts are kept as exact ``value -> count``
+    histograms, so medians and quantiles stay exact after merging; with
+    ``relative_accuracy`` the metric distributions are quantile sketches
+    instead (see :func:`describe_series`).
+
+    Row-level tables (``messages`` and ``assistant_responses``) are only
+    available when every merged partial was built with ``keep_messages=True``.
+    """
+
+    cube: CountCube
+    conversations: pd.DataFrame
+    distributions: Dict[str, pd.Series | QuantileSketch]
+    assistant_responses_by_day: pd.Series
+    assistant_words_by_day: pd.Series
+    assistant_chars_by_day: pd.Series
+    hour_dtype: np.dtype
+    date_dtype: np.dtype
+    messages: pd.DataFrame | None = None
+    relative_accuracy: float | None = None
+
+    @classmethod
+    def from_messages(
+        cls,
+        messages: pd.DataFrame,
+        keep_messages: bool = True,
+        relative_accuracy: float | None = None,
+    ) -> "PartialAnalysis":
+        role = messages["role"]
+        is_user = (role == "user").to_numpy()
+        is_assistant = (role == "assistant").to_numpy()
+
+        timed = messages["create_time"].notna().to_numpy()
+        assistant = messages[is_assistant & timed]
+        days = assistant["create_time"].to_numpy(dtype="datetime64[ns]").astype("datetime64[D]").astype("int64")
+        if assistant.empty:
+            responses = pd.Series([], index=pd.Index([], dtype="int64", name="day"), dtype="int64")
+            words = chars = _empty_day_counts()
         else:
-            duration_minutes = (last_time - first_time).total_seconds() / 60.0
+            responses = (
+                assistant["message_id"].notna().groupby(pd.Index(days, name="day"), sort=True).sum().astype("int64")
+            )
+            words = _day_value_counts(days, assistant["word_count"])
+            chars = _day_value_counts(days, assistant["char_count"])
+
+        return cls(
+            cube=CountCube.from_messages(messages),
+            conversations=_conversation_parts(messages),
+            distributions={
+                "user_word_count": _distribution(messages.loc[is_user, "word_count"], relative_accuracy),
+                "assistant_word_count": _distribution(messages.loc[is_assistant, "word_count"], relative_accuracy),
+                "assistant_char_count": _distribution(messages.loc[is_assistant, "char_count"], relative_accuracy),
+            },
+            assistant_responses_by_day=responses,
+            assistant_words_by_day=words,
+            assistant_chars_by_day=chars,
+            hour_dtype=np.dtype(messages["hour"].dtype) if "hour" in messages else np.dtype("float64"),
+            date_dtype=np.dtype(messages["date"].dtype) if "date" in messages else np.dtype("object"),
+            messages=messages if keep_messages else None,
+            relative_accuracy=relative_accuracy,
+        )
 
-        return pd.Series(
+    def merge(self, other: "PartialAnalysis") -> "PartialAnalysis":
+        if self.relative_accuracy != other.relative_accuracy:
+            raise ValueError("Cannot merge partials built with different relative_accuracy")
+        conversations = pd.concat([self.conversations, other.conversations])
+        conversations = conversations.groupby(level=CONVERSATION_KEYS, dropna=False, sort=True).agg(
             {
-                "first_time": first_time,
-                "last_time": last_time,
-                "duration_minutes": duration_minutes,
-                "messages": int(df.shape[0]),
-                "user_messages": int((df["role"] == "user").sum()),
-                "assistant_messages": int((df["role"] == "assistant").sum()),
-                "tool_messages": int((df["role"] == "tool").sum()),
-                "system_messages": int((df["role"] == "system").sum()),
-                "words_user": int(df.loc[df["role"] == "user", "word_count"].sum()),
-                "words_assistant": int(df.loc[df["role"] == "assistant", "word_count"].sum()),
-                "has_code": bool(df["has_code"].any()),
-                "has_multimodal": bool(df["is_multimodal"].any()),
+                "first_time": "min",
+                "last_time": "max",
+                "has_code": "any",
+                "has_multimodal": "any",
+                **{column: "sum" for column in _CONVERSATION_SUM_COLUMNS},
             }
         )
 
-    conversation_summary = (
-        messages.groupby(["conversation_index", "conversation_id", "conversation_title"], dropna=False)
-        .apply(_summarise_conversation)
-        .reset_index()
-    )
+        if self.messages is None or other.messages is None:
+            messages = None
+        else:
+            messages = pd.concat([self.messages, other.messages], ignore_index=True)
+
+        return PartialAnalysis(
+            cube=self.cube.merge(other.cube),
+            conversations=conversations,
+            distributions={
+                name: _merge_distributions(distribution, other.distributions[name])
+                for name, distribution in self.distributions.items()
+            },
+            assistant_responses_by_day=_merge_counts(
+                self.assistant_responses_by_day, other.assistant_responses_by_day
+            ),
+            assistant_words_by_day=_merge_counts(self.assistant_words_by_day, other.assistant_words_by_day),
+            assistant_chars_by_day=_merge_counts(self.assistant_chars_by_day, other.assistant_chars_by_day),
+            hour_dtype=np.result_type(self.hour_dtype, other.hour_dtype),
+            date_dtype=self.date_dtype if self.date_dtype == other.date_dtype else np.dtype("object"),
+            messages=messages,
+            relative_accuracy=self.relative_accuracy,
+        )
+
+    @property
+    def message_count(self) -> int:
+        return int(self.cube.counts.sum() + self.cube.untimed.sum())
+
+    def finalize(self) -> AnalysisResult:
+        if not self.message_count:
+            raise ValueError("No messages to analyse.")
+        return _build_result(self)
+
+
+def merge_partials(partials: Iterable[PartialAnalysis]) -> PartialAnalysis:
+    """Combine partial aggregates; the order of ``partials`` does not matter."""
+    return reduce(PartialAnalysis.merge, partials)
+
+
+def summarise(messages: pd.DataFrame, relative_accuracy: float | None = None) -> AnalysisResult:
+    if messages.empty:
+        raise ValueError("No messages to analyse.")
+    return PartialAnalysis.from_messages(messages, relative_accuracy=relative_accuracy).finalize()
+
+
+def _build_result(partial: PartialAnalysis) -> AnalysisResult:
+    messages = partial.messages
+    if messages is None:
+        messages = pd.DataFrame(columns=MESSAGE_COLUMNS)
+
+    conversation_summary = _finish_conversation_summary(partial.conversations)
 
     conversation_summary["has_tool"] = conversation_summary["tool_messages"] > 0
 
+    cube = partial.cube
+    hour_dtype = partial.hour_dtype
+
     messages_by_role = (
-        messages.groupby("role", dropna=False).size().reset_index(name="messages").sort_values("messages", ascending=False)
+        cube.role_sizes().reset_index(name="messages").sort_values("messages", ascending=False)
     )
 
-    monthly_message_counts = (
-        messages.dropna(subset=["month"])
-        .groupby("month")
-        .size()
-        .reset_index(name="messages")
-        .sort_values("month")
-    )
+    monthly_message_counts = cube.month_sizes().reset_index(name="messages").sort_values("month")
 
     monthly_message_counts_by_role = (
-        messages.dropna(subset=["month"])
-        .groupby(["month", "role"])
-        .size()
-        .reset_index(name="messages")
-        .sort_values(["month", "role"])
+        cube.month_role_sizes().reset_index(name="messages").sort_values(["month", "role"])
     )
 
     monthly_conversation_counts = (
@@ -110,84 +549,49 @@ def summarise(messages: pd.DataFrame) -> AnalysisResult:
         .sort_values("month")
     )
 
-    messages_by_hour = (
-        messages.dropna(subset=["hour"])
-        .groupby("hour")
-        .size()
-        .reset_index(name="messages")
-        .sort_values("hour")
-    )
+    messages_by_hour = cube.hour_sizes(hour_dtype).reset_index(name="messages").sort_values("hour")
 
     messages_by_hour_by_role = (
-        messages.dropna(subset=["hour"])
-        .groupby(["hour", "role"])
-        .size()
-        .reset_index(name="messages")
-        .sort_values(["hour", "role"])
+        cube.hour_role_sizes(hour_dtype).reset_index(name="messages").sort_values(["hour", "role"])
     )
 
     messages_by_weekday = (
-        messages.dropna(subset=["weekday"])
-        .groupby("weekday")
-        .size()
-        .reindex(
-            index=["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
-        )
+        cube.weekday_sizes()
+        .reindex(index=WEEKDAYS)
         .reset_index(name="messages")
         .sort_values("messages", ascending=False)
     )
 
-    messages_by_weekday_by_role = (
-        messages.dropna(subset=["weekday"])
-        .groupby(["weekday", "role"])
-        .size()
-        .reset_index(name="messages")
-    )
+    messages_by_weekday_by_role = cube.weekday_role_sizes().reset_index(name="messages")
 
-    daily_message_counts = (
-        messages.dropna(subset=["date"])
-        .groupby("date")
-        .size()
-        .reset_index(name="messages")
-        .sort_values("date")
-    )
+    daily_message_counts = cube.date_sizes(partial.date_dtype).reset_index(name="messages").sort_values("date")
 
-    weekday_order = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
     weekday_hour_counts = (
-        messages.dropna(subset=["weekday", "hour"])
-        .assign(
-            weekday=lambda df: pd.Categorical(df["weekday"], categories=weekday_order, ordered=True)
-        )
-        .groupby(["weekday", "hour"])
-        .size()
-        .reset_index(name="messages")
-        .sort_values(["weekday", "hour"])
+        cube.weekday_hour_sizes(hour_dtype).reset_index(name="messages").sort_values(["weekday", "hour"])
     )
 
     cumulative_message_counts = (
         daily_message_counts.assign(cumulative_messages=lambda df: df["messages"].cumsum())
     )
 
-    assistant_responses = (
-        messages[messages["role"] == "assistant"]
-        .dropna(subset=["create_time"])
-        .copy()
-        .sort_values("create_time")
-    )
-
-    assistant_daily_lengths = (
-        assistant_responses.assign(date=lambda df: df["create_time"].dt.date)
-        .groupby("date")
-        .agg(
-            responses=("message_id", "count"),
-            mean_word_count=("word_count", "mean"),
-            median_word_count=("word_count", "median"),
-            mean_char_count=("char_count", "mean"),
-            median_char_count=("char_count", "median"),
+    if partial.messages is None:
+        assistant_responses = messages
+    else:
+        assistant_responses = (
+            messages[messages["role"] == "assistant"]
+            .dropna(subset=["create_time"])
+            .copy()
+            .sort_values("create_time")
         )
-        .reset_index()
-        .sort_values("date")
-    )
+
+    days = partial.assistant_responses_by_day.index.to_numpy(dtype="int64")
+    dates = pd.Index(pd.DatetimeIndex(_day_labels(days)).date, dtype=object, name="date")
+    assistant_daily_lengths = _length_table(
+        partial.assistant_responses_by_day,
+        partial.assistant_words_by_day,
+        partial.assistant_chars_by_day,
+        dates,
+    ).sort_values("date")
 
     if not assistant_daily_lengths.empty:
         assistant_daily_lengths["mean_word_count_roll_7"] = (
@@ -203,19 +607,14 @@ def summarise(messages: pd.DataFrame) -> AnalysisResult:
             assistant_daily_lengths["mean_char_count"].rolling(window=30, min_periods=1).mean()
         )
 
-    assistant_monthly_lengths = (
-        assistant_responses.assign(month=lambda df: df["create_time"].dt.to_period("M").dt.to_timestamp())
-        .groupby("month")
-        .agg(
-            responses=("message_id", "count"),
-            mean_word_count=("word_count", "mean"),
-            median_word_count=("word_count", "median"),
-            mean_char_count=("char_count", "mean"),
-            median_char_count=("char_count", "median"),
-        )
-        .reset_index()
-        .sort_values("month")
-    )
+    month_of_day = dict(zip(days, _day_labels(days).astype("datetime64[M]").astype("datetime64[ns]")))
+    monthly_responses = _regroup_days(partial.assistant_responses_by_day, month_of_day)
+    assistant_monthly_lengths = _length_table(
+        monthly_responses,
+        _regroup_days(partial.assistant_words_by_day, month_of_day),
+        _regroup_days(partial.assistant_chars_by_day, month_of_day),
+        pd.DatetimeIndex(monthly_responses.index, name="month"),
+    ).sort_values("month")
 
     conversation_summary = conversation_summary.assign(
         first_time_local=lambda df: df["first_time"].dt.tz_convert("UTC").dt.tz_localize(None),
@@ -241,21 +640,17 @@ def summarise(messages: pd.DataFrame) -> AnalysisResult:
 
     metrics = {
         "conversation_count": int(conversation_summary.shape[0]),
-        "message_count_total": int(messages.shape[0]),
+        "message_count_total": partial.message_count,
         "messages_by_role": dict(zip(messages_by_role["role"], messages_by_role["messages"])),
-        "conversation_length_stats": describe_series(conversation_summary["messages"]),
+        "conversation_length_stats": describe_series(
+            conversation_summary["messages"], relative_accuracy=partial.relative_accuracy
+        ),
         "conversation_duration_minutes_stats": describe_series(conversation_summary["duration_minutes"]),
         "user_turn_stats": describe_series(conversation_summary["user_messages"]),
         "assistant_turn_stats": describe_series(conversation_summary["assistant_messages"]),
-        "user_word_count_stats": describe_series(
-            messages.loc[messages["role"] == "user", "word_count"]
-        ),
-        "assistant_word_count_stats": describe_series(
-            messages.loc[messages["role"] == "assistant", "word_count"]
-        ),
-        "assistant_character_count_stats": describe_series(
-            messages.loc[messages["role"] == "assistant", "char_count"]
-        ),
+        "user_word_count_stats": _describe_distribution(partial.distributions["user_word_count"]),
+        "assistant_word_count_stats": _describe_distribution(partial.distributions["assistant_word_count"]),
+        "assistant_character_count_stats": _describe_distribution(partial.distributions["assistant_char_count"]),
         "date_range": {
             "first_conversation": conversation_summary["first_time_local"].min(),
             "last_conversation": conversation_summary["last_time_local"].max(),
@@ -285,4 +680,4 @@ def summarise(messages: pd.DataFrame) -> AnalysisResult:
     )
 
 
-__all__ = ["AnalysisResult", "summarise"]
+__all__ = ["AnalysisResult", "CountCube", "PartialAnalysis", "describe_counts", "merge_partials", "summarise"]
@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+import argparse
+import copy
+import json
+import os
+import re
+import time
+import traceback
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Set, Tuple
+
+from .cli import add_run_options, run
+
+
+EXPORT_FILENAME = "conversations.json"
+SUMMARY_FILENAME = "batch_summary.json"
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="gpt-recap batch",
+        description="Generate recaps for many conversations.json exports using a warm worker pool",
+    )
+    parser.add_argument(
+        "source",
+        help=(
+            "Directory to scan for exports (every conversations.json below it, plus top-level *.json files) "
+            "or a manifest listing one export path per line (or a JSON array of paths)"
+        ),
+    )
+    parser.add_argument(
+        "--output",
+        "-o",
+        default="batch_outputs",
+        help="Root directory; each export is written to its own subdirectory",
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of exports processed concurrently (default: number of CPUs)",
+    )
+    add_run_options(parser)
+    return parser.parse_args(argv)
+
+
+def discover_exports(source: str | Path) -> List[Path]:
+    source = Path(source)
+    if source.is_dir():
+        found = set(source.rglob(EXPORT_FILENAME))
+        found.update(path for path in source.glob("*.json") if path.is_file())
+        return sorted(found)
+
+    text = source.read_text(encoding="utf-8")
+    if text.lstrip().startswith("["):
+        entries = [str(entry) for entry in json.loads(text)]
+    else:
+        entries = [line.strip() for line in text.splitlines()]
+    paths = []
+    for entry in entries:
+        if not entry or entry.startswith("#"):
+            continue
+        path = Path(entry).expanduser()
+        paths.append(path if path.is_absolute() else source.parent / path)
+    return paths
+
+
+def output_names(paths: List[Path]) -> List[str]:
+    """Stable, unique output directory names for ``paths``."""
+    names: List[str] = []
+    seen: Dict[str, int] = {}
+    for path in paths:
+        stem = path.parent.name if path.name == EXPORT_FILENAME and path.parent.name else path.stem
+        name = re.sub(r"[^A-Za-z0-9._-]+", "_", stem).strip("._") or "export"
+        count = seen.get(name, 0)
+        seen[name] = count + 1
+        names.append(name if count == 0 else f"{name}_{count + 1}")
+    return names
+
+
+def _init_worker(plotting: bool) -> None:
+    # Pay for the heavy imports and the plotting theme once per worker
+    # instead of once per export.
+    if not plotting:
+        return
+    import matplotlib
+
+    matplotlib.use("Agg")
+    from . import plots, story  # noqa: F401
+
+    plots._ensure_visuals()
+
+
+def _process(input_path: Path, output_dir: Path, args: argparse.Namespace) -> Dict[str, Any]:
+    start = time.perf_counter()
+    cpu_start = time.process_time()
+    run_args = copy.copy(args)
+    run_args.input = str(input_path)
+    run_args.output = str(output_dir)
+    if args.state_dir:
+        run_args.state_dir = str(Path(args.state_dir) / output_dir.name)
+    try:
+        run(run_args)
+    except Exception as exc:  # noqa: BLE001 - one bad export must not stop the batch
+        return {
+            "status": "error",
+            "error": f"{type(exc).__name__}: {exc}",
+            "traceback": traceback.format_exc(),
+            "seconds": time.perf_counter() - start,
+            "cpu_seconds": time.process_time() - cpu_start,
+        }
+    messages = None
+    metrics_path = output_dir / "metrics_summary.json"
+    if metrics_path.exists():
+        messages = json.loads(metrics_path.read_text(encoding="utf-8")).get("message_count_total")
+    return {
+        "status": "ok",
+        "messages": messages,
+        "seconds": time.perf_counter() - start,
+        "cpu_seconds": time.process_time() - cpu_start,
+    }
+
+
+def run_batch(
+    paths: List[Path], output_root: Path, args: argparse.Namespace, jobs: int
+) -> List[Dict[str, Any]]:
+    output_root.mkdir(parents=True, exist_ok=True)
+    # Exports are already processed in parallel; nested flattening or plotting
+    # pools would only oversubscribe the machine.
+    args = copy.copy(args)
+    args.workers = 1
+    args.plot_workers = 1
+
+    tasks = list(zip(paths, (output_root / name for name in output_names(paths))))
+    results: List[Dict[str, Any]] = [{} for _ in tasks]
+    queue: Deque[int] = deque(range(len(tasks)))
+    # Exports that were in flight when a worker died. Any of them may be the
+    # one that killed it, so each is retried once on its own: a retry that
+    # breaks the pool again identifies the culprit.
+    retry: Deque[int] = deque()
+    retried: Set[int] = set()
+    plotting = not (args.metrics_only or args.no_plots or args.charts == "js")
+
+    while queue or retry:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(plotting,)) as pool:
+            pending: Deque[Tuple[int, Future]] = deque()
+            broken = False
+            while (queue or retry or pending) and not broken:
+                if retry:
+                    if not pending:
+                        idx = retry.popleft()
+                        retried.add(idx)
+                        input_path, output_dir = tasks[idx]
+                        pending.append((idx, pool.submit(_process, input_path, output_dir, args)))
+                else:
+                    while queue and len(pending) < jobs:
+                        idx = queue.popleft()
+                        input_path, output_dir = tasks[idx]
+                        pending.append((idx, pool.submit(_process, input_path, output_dir, args)))
+                idx, future = pending.popleft()
+                try:
+                    results[idx] = _record(tasks[idx], future.result())
+                except BrokenProcessPool:
+                    broken = True
+                    pending.appendleft((idx, future))
+            # A crashed worker takes the pool down with it. Exports that had
+            # already finished keep their outcome; the others continue in a
+            # fresh pool.
+            for idx, future in pending:
+                if future.done() and not future.cancelled() and future.exception() is None:
+                    results[idx] = _record(tasks[idx], future.result())
+                elif idx in retried:
+                    results[idx] = _record(
+                        tasks[idx], {"status": "error", "error": "worker process died", "seconds": None}
+                    )
+                else:
+                    retry.append(idx)
+    return results
+
+
+def _record(task: Tuple[Path, Path], outcome: Dict[str, Any]) -> Dict[str, Any]:
+    input_path, output_dir = task
+    record = {"input": str(input_path), "output": str(output_dir), **outcome}
+    seconds = record.get("seconds")
+    timing = f"{seconds:7.2f}s" if seconds is not None else "      -"
+    if record["status"] == "ok":
+        print(f"ok     {timing}  {input_path} -> {output_dir}")
+    else:
+        print(f"FAILED {timing}  {input_path}: {record['error']}")
+    return record
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    paths = discover_exports(args.source)
+    if not paths:
+        raise SystemExit(f"No exports found in {args.source}")
+
+    output_root = Path(args.output)
+    jobs = max(1, min(args.jobs, len(paths)))
+    start = time.perf_counter()
+    results = run_batch(paths, output_root, args, jobs)
+    elapsed = time.perf_counter() - start
+
+    succeeded = [r for r in results if r["status"] == "ok"]
+    messages = sum(r.get("messages") or 0 for r in succeeded)
+    summary = {
+        "exports": len(results),
+        "succeeded": len(succeeded),
+        "failed": len(results) - len(succeeded),
+        "jobs": jobs,
+        "wall_seconds": elapsed,
+        "exports_per_second": len(succeeded) / elapsed if elapsed else None,
+        "messages": messages,
+        "messages_per_second": messages / elapsed if elapsed else None,
+        "results": results,
+    }
+    summary_path = output_root / SUMMARY_FILENAME
+    with summary_path.open("w", encoding="utf-8") as fh:
+        json.dump(summary, fh, indent=2)
+
+    print(
+        f"Processed {len(results)} exports ({summary['failed']} failed) in {elapsed:.1f}s: "
+        f"{summary['exports_per_second']:.2f} exports/s, {summary['messages_per_second']:.0f} messages/s"
+    )
+    print("Batch summary written to", summary_path)
+    if summary["failed"]:
+        raise SystemExit(1)
+
+
+__all__ = ["discover_exports", "run_batch", "main"]
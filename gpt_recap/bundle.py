@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import json
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from .analysis import AnalysisResult
+from .charts import date_labels
+from .data import WEEKDAYS
+
+
+BUNDLE_FORMAT = "gpt-recap-bundle"
+BUNDLE_VERSION = 1
+BUNDLE_FILE = "recap_bundle.json"
+
+# Mirrors WORD_CLOUD_STOP_WORDS and computeWordCloudTerms in docs/app.js.
+WORD_CLOUD_STOP_WORDS = frozenset(
+    """
+    the a an and or but for nor with that this from your yours you are have will would could should
+    we they them their our ours was were been into than then over under about like just make need
+    want help what when where why how can please thanks thank chat gpt chatgpt assistant user system
+    tool code also really maybe well even still back said more less using use used new know look
+    point time
+    """.split()
+)
+_TERM_RE = re.compile(r"[a-z0-9']+")
+
+# docs/app.js counts weekdays in Date.getDay() order, which starts on Sunday.
+_JS_WEEKDAYS = WEEKDAYS[-1:] + WEEKDAYS[:-1]
+
+
+def build_bundle(result: AnalysisResult, word_cloud_terms: int = 120) -> Dict[str, Any]:
+    """Aggregates the web client's ``buildContext`` needs, so it can skip parsing the export.
+
+    ``docs/app.js`` accepts the bundle in place of ``conversations.json``
+    and formats the story from it exactly as it would from an upload. Dates
+    are UTC. The word cloud is only filled when message text was kept.
+    Model and tool names are not part of the message table, so those
+    slides show placeholders.
+    """
+    monthly = result.monthly_message_counts.sort_values("month")
+    months = date_labels(monthly["month"], "%Y-%m")
+    by_role = result.monthly_message_counts_by_role.pivot(index="month", columns="role", values="messages")
+    by_role = by_role.reindex(monthly["month"].to_numpy()).fillna(0).astype(int)
+    hours = result.messages_by_hour.dropna(subset=["hour"])
+    weekdays = result.messages_by_weekday.set_index("weekday")["messages"].fillna(0)
+    assistant_daily = result.assistant_daily_lengths
+    assistant_monthly = result.assistant_monthly_lengths.sort_values("month")
+    conversations = result.conversation_summary
+
+    hour_counts = np.zeros(24, dtype=int)
+    hour_counts[hours["hour"].astype(int).to_numpy()] = hours["messages"].to_numpy()
+    return {
+        "format": BUNDLE_FORMAT,
+        "version": BUNDLE_VERSION,
+        "messages_by_role": {
+            str(role): int(count) for role, count in zip(result.messages_by_role["role"], result.messages_by_role["messages"])
+        },
+        "daily": {
+            "dates": date_labels(result.daily_message_counts["date"]),
+            "messages": result.daily_message_counts["messages"].astype(int).tolist(),
+        },
+        "monthly": {
+            "months": months,
+            "messages": monthly["messages"].astype(int).tolist(),
+            "by_role": {str(role): counts.tolist() for role, counts in by_role.items()},
+        },
+        "assistant_daily": {
+            "dates": date_labels(assistant_daily["date"]),
+            "responses": assistant_daily["responses"].astype(int).tolist(),
+            "mean_words": _rounded(assistant_daily["mean_word_count"]),
+            "mean_chars": _rounded(assistant_daily["mean_char_count"]),
+        },
+        "assistant_monthly": {
+            "months": date_labels(assistant_monthly["month"], "%Y-%m"),
+            "responses": assistant_monthly["responses"].astype(int).tolist(),
+            "mean_words": _rounded(assistant_monthly["mean_word_count"]),
+        },
+        "hours": hour_counts.tolist(),
+        "weekdays": [int(weekdays.get(day, 0)) for day in _JS_WEEKDAYS],
+        "conversations": {
+            "titles": [title if isinstance(title, str) and title else "Untitled" for title in conversations["conversation_title"]],
+            "messages": conversations["messages"].astype(int).tolist(),
+            "user_messages": conversations["user_messages"].astype(int).tolist(),
+            "assistant_messages": conversations["assistant_messages"].astype(int).tolist(),
+            "has_tool": conversations["has_tool"].astype(int).tolist(),
+            "has_code": conversations["has_code"].astype(int).tolist(),
+        },
+        "models": {},
+        "tools": {},
+        "word_cloud": _word_cloud(result.messages, word_cloud_terms),
+    }
+
+
+def write_bundle(bundle: Dict[str, Any], output_dir: Path) -> Path:
+    path = Path(output_dir) / BUNDLE_FILE
+    path.write_text(json.dumps(bundle, separators=(",", ":")), encoding="utf-8")
+    return path
+
+
+def _rounded(values: pd.Series) -> List[float]:
+    return values.astype(float).fillna(0).round(2).tolist()
+
+
+def _word_cloud(messages: pd.DataFrame, limit: int) -> List[Dict[str, Any]]:
+    if "text" not in messages.columns:
+        return []
+    counts: Counter[str] = Counter()
+    for text in messages["text"]:
+        if isinstance(text, str) and text:
+            counts.update(_TERM_RE.findall(text.lower()))
+    # Filter once per distinct term rather than once per occurrence.
+    terms: Counter[str] = Counter()
+    for term, count in counts.items():
+        word = term.rstrip("'")
+        if len(word) >= 3 and word not in WORD_CLOUD_STOP_WORDS:
+            terms[word] += count
+    return [{"text": word, "weight": weight} for word, weight in terms.most_common(limit)]
+
+
+__all__ = ["BUNDLE_FILE", "BUNDLE_FORMAT", "BUNDLE_VERSION", "build_bundle", "write_bundle"]
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+from pathlib import Path
+from typing import Any, Optional
+
+import pandas as pd
+
+from . import __version__
+
+
+DEFAULT_MAX_BYTES = 2 * 1024**3
+HASH_CHUNK_SIZE = 1 << 20
+CACHE_SUFFIX = ".pkl"
+
+
+def default_cache_dir() -> Path:
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "gpt-recap"
+
+
+class MessageCache:
+    """On-disk cache of flattened message tables.
+
+    Entries are keyed by a fingerprint of the export (size, mtime and content
+    hash), the package version and any flattening options, and stored as
+    pickled DataFrames, which round-trip every column dtype exactly. When the
+    directory grows past ``max_bytes`` the least recently used entries are
+    evicted; a cache hit refreshes an entry's mtime.
+    """
+
+    def __init__(self, cache_dir: str | Path | None = None, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else default_cache_dir()
+        self.max_bytes = max_bytes
+
+    def key(self, path: str | Path, **options: Any) -> str:
+        path = Path(path)
+        stat = path.stat()
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(f"{__version__}|{stat.st_size}|{stat.st_mtime_ns}".encode())
+        for name in sorted(options):
+            digest.update(f"|{name}={options[name]!r}".encode())
+        with path.open("rb") as fh:
+            for chunk in iter(lambda: fh.read(HASH_CHUNK_SIZE), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _entry(self, key: str) -> Path:
+        return self.cache_dir / f"{key}{CACHE_SUFFIX}"
+
+    def get(self, key: str) -> Optional[pd.DataFrame]:
+        entry = self._entry(key)
+        try:
+            with entry.open("rb") as fh:
+                frame = pickle.load(fh)
+        except FileNotFoundError:
+            return None
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            entry.unlink(missing_ok=True)
+            return None
+        os.utime(entry)
+        return frame
+
+    def put(self, key: str, frame: pd.DataFrame) -> Path:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        entry = self._entry(key)
+        tmp = entry.with_name(f"{entry.name}.{os.getpid()}.tmp")
+        with tmp.open("wb") as fh:
+            pickle.dump(frame, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, entry)
+        self.evict()
+        return entry
+
+    def evict(self) -> None:
+        entries = []
+        for entry in self.cache_dir.glob(f"*{CACHE_SUFFIX}"):
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries, key=lambda item: item[0]):
+            if total <= self.max_bytes:
+                break
+            entry.unlink(missing_ok=True)
+            total -= size
+
+
+__all__ = ["MessageCache", "default_cache_dir"]
@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from .analysis import AnalysisResult
+from .data import WEEKDAYS
+
+
+ROLE_COLORS = {
+    "user": "#64ffda",
+    "assistant": "#ff61ef",
+    "tool": "#ffd479",
+    "system": "#9bb5ff",
+    "unknown": "#d2d2d2",
+}
+
+CHART_DATA_FILE = "chart_data.json"
+
+# Approximation of matplotlib's viridis, used for the weekday/hour grid.
+_VIRIDIS = ["#440154", "#3b528b", "#21918c", "#5ec962", "#fde725"]
+
+
+def build_chart_data(result: AnalysisResult) -> Dict[str, Dict[str, Any]]:
+    """Chart.js configs for the recap plots, keyed like :class:`~gpt_recap.plots.PlotBuilder` files.
+
+    Only the series each plot draws are included (histograms are binned
+    here), so the result stays small and needs neither matplotlib nor a
+    Chart.js date adapter: time axes use ``YYYY-MM-DD`` category labels.
+    """
+    return {
+        "messages_per_month_by_role": _monthly_by_role(result.monthly_message_counts_by_role),
+        "conversation_depth_mix": _depth_mix(result.conversation_categories),
+        "assistant_reply_length_trend_words": _length_trend(result.assistant_daily_lengths, "words"),
+        "assistant_reply_length_trend_characters": _length_trend(result.assistant_daily_lengths, "characters"),
+        "messages_weekday_hour_heatmap": _weekday_hour(result.weekday_hour_counts),
+        "messages_cumulative": _cumulative(result.cumulative_message_counts),
+        "assistant_reply_length_words_hist": _histogram(result.assistant_responses, "words"),
+        "assistant_reply_length_characters_hist": _histogram(result.assistant_responses, "characters"),
+    }
+
+
+def write_chart_data(charts: Dict[str, Dict[str, Any]], output_dir: Path) -> Path:
+    path = Path(output_dir) / CHART_DATA_FILE
+    path.write_text(json.dumps(charts, separators=(",", ":")), encoding="utf-8")
+    return path
+
+
+def date_labels(values: pd.Series, fmt: str = "%Y-%m-%d") -> List[str]:
+    """Format dates (or months) as the string category labels the web charts use."""
+    return pd.to_datetime(values).dt.strftime(fmt).tolist()
+
+
+def _numbers(values: pd.Series, decimals: int = 2) -> List[float | None]:
+    rounded = values.astype(float).round(decimals)
+    return [None if np.isnan(value) else value for value in rounded.tolist()]
+
+
+def _chart(kind: str, title: str, labels: List[Any], datasets: List[Dict[str, Any]], **scales: Any) -> Dict[str, Any]:
+    return {
+        "type": kind,
+        "data": {"labels": labels, "datasets": datasets},
+        "options": {
+            "animation": False,
+            "plugins": {"title": {"display": True, "text": title}, "legend": {"display": len(datasets) > 1}},
+            "scales": scales,
+        },
+    }
+
+
+def _monthly_by_role(df: pd.DataFrame) -> Dict[str, Any]:
+    datasets = []
+    labels: List[str] = []
+    if not df.empty:
+        pivot = df.pivot(index="month", columns="role", values="messages").fillna(0)
+        pivot.index = pd.to_datetime(pivot.index)
+        pivot = pivot.sort_index()
+        labels = pivot.index.strftime("%Y-%m").tolist()
+        for role, series in pivot.items():
+            color = ROLE_COLORS.get(role, "#9bb5ff")
+            datasets.append(
+                {
+                    "label": str(role).title(),
+                    "data": series.astype(int).tolist(),
+                    "borderColor": color,
+                    "backgroundColor": color + "14",
+                    "fill": True,
+                    "pointRadius": 0,
+                }
+            )
+    return _chart(
+        "line", "Messages per Month by Role", labels, datasets, y={"title": {"display": True, "text": "Messages"}}
+    )
+
+
+def _depth_mix(df: pd.DataFrame) -> Dict[str, Any]:
+    order = ["deep_multi_turn", "short_multi_turn", "one_and_done"]
+    counts = df.set_index("category")["conversations"].reindex(order).fillna(0).astype(int)
+    dataset = {"label": "Conversations", "data": counts.tolist(), "backgroundColor": ["#ff61ef", "#64ffda", "#ffe066"]}
+    return _chart(
+        "bar",
+        "Conversation Depth Mix",
+        ["Deep dives", "Quick loops", "One & done"],
+        [dataset],
+        y={"title": {"display": True, "text": "Conversations"}},
+    )
+
+
+def _length_trend(df: pd.DataFrame, unit: str) -> Dict[str, Any]:
+    if unit == "words":
+        column, colors, title, ylabel = "mean_word_count", ["#64ffda", "#2dd4bf", "#0ea5e9"], "Words", "Words per reply"
+    else:
+        column, colors = "mean_char_count", ["#ff9f1c", "#f3722c", "#f94144"]
+        title, ylabel = "Characters", "Characters per reply"
+    datasets = []
+    labels: List[str] = []
+    if not df.empty:
+        labels = date_labels(df["date"])
+        for (suffix, label), color, width in zip(
+            [("", "Daily mean"), ("_roll_7", "7-day mean"), ("_roll_30", "30-day mean")], colors, [1, 2, 2.5]
+        ):
+            datasets.append(
+                {
+                    "label": label,
+                    "data": _numbers(df[column + suffix]),
+                    "borderColor": color,
+                    "borderWidth": width,
+                    "pointRadius": 0,
+                }
+            )
+    return _chart(
+        "line",
+        f"Assistant Reply Length ({title})",
+        labels,
+        datasets,
+        y={"title": {"display": True, "text": ylabel}},
+    )
+
+
+def _weekday_hour(df: pd.DataFrame) -> Dict[str, Any]:
+    # Chart.js has no heatmap; square scatter points coloured by count stand in for one.
+    points = []
+    colors = []
+    if not df.empty:
+        top = df["messages"].max() or 1
+        for weekday, hour, messages in zip(df["weekday"], df["hour"], df["messages"]):
+            if pd.isna(hour):
+                continue
+            points.append({"x": int(hour), "y": str(weekday), "v": int(messages)})
+            colors.append(_VIRIDIS[min(len(_VIRIDIS) - 1, int(messages / top * len(_VIRIDIS)))])
+    dataset = {
+        "label": "Messages",
+        "data": points,
+        "backgroundColor": colors,
+        "pointStyle": "rect",
+        "pointRadius": 9,
+        "pointHoverRadius": 11,
+    }
+    return _chart(
+        "scatter",
+        "Messages by Weekday & Hour",
+        [],
+        [dataset],
+        x={"type": "linear", "min": -0.5, "max": 23.5, "ticks": {"stepSize": 1}, "title": {"display": True, "text": "Hour"}},
+        y={"type": "category", "labels": WEEKDAYS, "offset": True},
+    )
+
+
+def _cumulative(df: pd.DataFrame) -> Dict[str, Any]:
+    labels = date_labels(df["date"]) if not df.empty else []
+    dataset = {
+        "label": "Messages",
+        "data": df["cumulative_messages"].astype(int).tolist(),
+        "borderColor": "#7c3aed",
+        "backgroundColor": "#7c3aed33",
+        "fill": True,
+        "pointRadius": 0,
+    }
+    return _chart(
+        "line", "Cumulative Messages", labels, [dataset], y={"title": {"display": True, "text": "Messages"}}
+    )
+
+
+def _histogram(df: pd.DataFrame, unit: str, bins: int = 60) -> Dict[str, Any]:
+    column, cap, color = ("word_count", 2000, "#64ffda") if unit == "words" else ("char_count", 12000, "#f94144")
+    values = df[column].clip(upper=cap).to_numpy()
+    labels: List[int] = []
+    counts: List[int] = []
+    if len(values):
+        hist, edges = np.histogram(values, bins=bins)
+        labels = [int(round(edge)) for edge in edges[:-1]]
+        counts = hist.tolist()
+    dataset = {"label": "Responses", "data": counts, "backgroundColor": color, "barPercentage": 1, "categoryPercentage": 1}
+    return _chart(
+        "bar",
+        f"Assistant Reply Length Distribution ({unit.title()})",
+        labels,
+        [dataset],
+        x={"title": {"display": True, "text": unit.title()}},
+        y={"title": {"display": True, "text": "Responses"}},
+    )
+
+
+__all__ = ["CHART_DATA_FILE", "ROLE_COLORS", "build_chart_data", "date_labels", "write_chart_data"]
@@ -1,21 +1,48 @@
 from __future__ import annotations
 
 import argparse
+import importlib.util
 import json
+import sys
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Tuple
 
 import numpy as np
 import pandas as pd
 
 from .analysis import AnalysisResult, summarise
-from .data import flatten_messages, load_conversations
-from .plots import PlotBuilder
-from .story import render_story
+from .cache import DEFAULT_MAX_BYTES, MessageCache
+from .data import (
+    UNKNOWN_CONTENT_TYPES,
+    bytes_per_message,
+    compact_messages,
+    flatten_messages,
+    load_conversations,
+    to_epoch,
+)
+from .incremental import IncrementalStore
+from .profiling import Profiler
+from .textstore import TextStore, spill_text, store_source
 
 
+TEXT_STORE_DIRNAME = "message_texts"
+CHART_MODES = ["png", "js"]
+OUTPUT_FORMATS = {"csv": ".csv", "parquet": ".parquet", "feather": ".feather"}
+COMPRESSIONS = {
+    "csv": ("gzip", "bz2", "xz"),
+    "parquet": ("snappy", "gzip", "brotli", "lz4", "zstd"),
+    "feather": ("lz4", "zstd"),
+}
+_COMPRESSED_CSV_SUFFIX = {"gzip": ".gz", "bz2": ".bz2", "xz": ".xz"}
+
 def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
-    parser = argparse.ArgumentParser(description="Generate a ChatGPT usage recap from conversations.json")
+    parser = argparse.ArgumentParser(
+        description="Generate a ChatGPT usage recap from conversations.json",
+        epilog=(
+            "Run `gpt-recap batch --help` to process many exports in one go, or "
+            "`gpt-recap serve --help` to serve recaps over HTTP."
+        ),
+    )
     parser.add_argument("input", help="Path to conversations.json export")
     parser.add_argument(
         "--output",
@@ -23,39 +50,385 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
         help="Directory to write CSVs, plots, and recap HTML",
         default="outputs",
     )
+    add_run_options(parser)
     return parser.parse_args(argv)
 
 
+def add_run_options(parser: argparse.ArgumentParser) -> None:
+    """Options shared by the single-export and batch entry points."""
+    window = parser.add_argument_group(
+        "date window",
+        "Only analyse messages created in [--since, --until) (UTC). Conversations and messages outside "
+        "the window are skipped while flattening; untimed messages are excluded.",
+    )
+    window.add_argument("--since", help="Start date/time, inclusive (e.g. 2025-01-01)")
+    window.add_argument("--until", help="End date/time, exclusive (e.g. 2026-01-01)")
+    window.add_argument("--year", type=int, help="Shorthand for --since YEAR-01-01 --until YEAR+1-01-01")
+    parser.add_argument(
+        "--format",
+        choices=sorted(OUTPUT_FORMATS),
+        default="csv",
+        help=(
+            "File format for the output tables (default: csv). parquet and feather keep native "
+            "timestamp dtypes and need pyarrow (pip install 'gpt-recap[arrow]')"
+        ),
+    )
+    parser.add_argument(
+        "--compression",
+        help=(
+            "Compression codec for the output tables: gzip/bz2/xz for csv, snappy/gzip/brotli/lz4/zstd "
+            "for parquet, lz4/zstd for feather, or 'none' (default: none for csv, the library default otherwise)"
+        ),
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Parse the export incrementally, one conversation at a time, to bound memory use",
+    )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help=(
+            "Hold the message table with compact dtypes (categoricals, narrow integers, Arrow strings) "
+            "and report its bytes per message"
+        ),
+    )
+    parser.add_argument(
+        "--text",
+        choices=["keep", "drop", "spill"],
+        default="keep",
+        help=(
+            "What to do with message bodies once they are counted: keep them in the message table "
+            "(default), drop them, or spill them to an on-disk store in <output>/message_texts"
+        ),
+    )
+    parser.add_argument(
+        "--unicode-words",
+        action="store_true",
+        help="Count words in any script (default: runs of ASCII letters and apostrophes)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of processes used to flatten conversations (default: 1)",
+    )
+    parser.add_argument(
+        "--plot-workers",
+        type=int,
+        default=1,
+        help="Number of processes used to render plots (default: 1)",
+    )
+    parser.add_argument(
+        "--no-plots",
+        action="store_true",
+        help="Skip the matplotlib figures; the recap HTML is rendered without images",
+    )
+    parser.add_argument(
+        "--charts",
+        choices=CHART_MODES,
+        default="png",
+        help=(
+            "How the recap draws its charts: matplotlib PNGs (default), or js to write the plotted series "
+            "to chart_data.json and draw them in the browser with Chart.js (matplotlib is not imported)"
+        ),
+    )
+    parser.add_argument(
+        "--bundle",
+        action="store_true",
+        help="Also write recap_bundle.json, a precomputed analysis the web client can open instead of the export",
+    )
+    parser.add_argument(
+        "--metrics-only",
+        action="store_true",
+        help="Only write the CSV tables and metrics_summary.json (no plots, no recap HTML)",
+    )
+    parser.add_argument(
+        "--plot-cache-dir",
+        help="Shared directory of rendered plots, reused across output directories when inputs match",
+    )
+    parser.add_argument(
+        "--no-plot-cache",
+        action="store_true",
+        help="Re-render every plot even if its inputs are unchanged",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        help="Directory for cached message tables (default: $XDG_CACHE_HOME/gpt-recap)",
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=DEFAULT_MAX_BYTES // 1024**2,
+        help="Maximum size of the cache directory in MB before old entries are evicted",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always re-parse the export instead of reusing a cached message table",
+    )
+    parser.add_argument(
+        "--state-dir",
+        help=(
+            "Keep the message table in this directory between runs and only re-flatten "
+            "conversations that are new or changed since the previous export"
+        ),
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Write wall/CPU time, peak RSS and row counts per pipeline stage to run_profile.json",
+    )
+    parser.add_argument(
+        "--quantile-accuracy",
+        type=float,
+        help=(
+            "Estimate medians/p90s in the metrics with a bounded-memory quantile sketch "
+            "of this relative accuracy (e.g. 0.01) instead of exact values"
+        ),
+    )
+
+
+class EmptyWindowError(ValueError):
+    """No timed messages fall inside the ``--since``/``--until``/``--year`` window."""
+
+
 def main(argv: list[str] | None = None) -> None:
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == "batch":
+        from .batch import main as batch_main
+
+        batch_main(argv[1:])
+        return
+    if argv and argv[0] == "serve":
+        from .server import main as serve_main
+
+        serve_main(argv[1:])
+        return
+
     args = parse_args(argv)
+    try:
+        story_path = run(args)
+    except EmptyWindowError as exc:
+        raise SystemExit(str(exc)) from None
+
+    print("Wrote analysis to", args.output)
+    if story_path is not None:
+        print("Story recap available at", story_path)
+
+
+def run(args: argparse.Namespace, profiler: Profiler | None = None) -> Path | None:
+    """Run the full pipeline for ``args.input`` into ``args.output``.
+
+    Returns the recap HTML path, or ``None`` with ``--metrics-only``. The
+    plotting stack (matplotlib, seaborn) and jinja2 are imported only when
+    plots or the recap are actually produced. Every stage is recorded by
+    ``profiler`` (pass one with hooks to attach custom timers); with
+    ``--profile`` the records are written to ``run_profile.json``. Raises
+    :class:`EmptyWindowError` when a date window leaves no messages.
+    """
+    profiler = profiler or Profiler()
     input_path = Path(args.input)
     output_dir = Path(args.output)
+    _check_output_format(args.format, args.compression)
+    since, until = _date_window(args)
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    conversations = load_conversations(input_path)
-    messages = flatten_messages(conversations)
-    result = summarise(messages)
+    messages = _load_messages(input_path, args, profiler)
+    if messages.empty and (since is not None or until is not None):
+        raise EmptyWindowError(f"No timed messages between {args.since or 'the start'} and {args.until or 'now'}")
+    if UNKNOWN_CONTENT_TYPES:
+        unknown = ", ".join(f"{ctype} ({count})" for ctype, count in UNKNOWN_CONTENT_TYPES.most_common())
+        print(f"Warning: no text extracted for unrecognised content types: {unknown}")
+        UNKNOWN_CONTENT_TYPES.clear()
+    with profiler.stage("summarise", rows=len(messages)):
+        result = summarise(messages, relative_accuracy=args.quantile_accuracy)
 
-    _write_csv_outputs(result, output_dir)
-
-    plot_builder = PlotBuilder(output_dir)
-    plot_paths = plot_builder.create_all(result)
-
-    story_path = render_story(result, plot_paths, output_dir)
+    with profiler.stage("write_tables"):
+        _write_tables(result, output_dir, args.format, args.compression, profiler)
 
     metrics_path = output_dir / "metrics_summary.json"
-    with metrics_path.open("w", encoding="utf-8") as fh:
+    with profiler.stage("write_metrics"), metrics_path.open("w", encoding="utf-8") as fh:
         json.dump(_serialise(result.metrics), fh, indent=2)
 
-    print("Wrote analysis to", output_dir)
-    print("Story recap available at", story_path)
+    if args.bundle:
+        with profiler.stage("bundle"):
+            from .bundle import build_bundle, write_bundle
+
+            print("Web client bundle written to", write_bundle(build_bundle(result), output_dir))
+
+    story_path = None
+    if not args.metrics_only:
+        plot_paths: Dict[str, Path] = {}
+        charts = None
+        if args.charts == "js" and not args.no_plots:
+            with profiler.stage("chart_data"):
+                from .charts import build_chart_data, write_chart_data
+
+                charts = build_chart_data(result)
+                write_chart_data(charts, output_dir)
+        elif not args.no_plots:
+            with profiler.stage("plots"):
+                from .plots import PlotBuilder
 
+                plot_builder = PlotBuilder(
+                    output_dir, cache_dir=args.plot_cache_dir, use_cache=not args.no_plot_cache
+                )
+                plot_paths = plot_builder.create_all(result, workers=args.plot_workers, profiler=profiler)
+            stats = plot_builder.cache_stats
+            reused = len(stats["output_hits"]) + len(stats["shared_hits"])
+            print(f"Plots: {len(stats['misses'])} rendered, {reused} reused from cache")
+
+        with profiler.stage("story"):
+            from .story import render_story
+
+            story_path = render_story(result, plot_paths, output_dir, charts)
+
+    if args.profile:
+        profile_path = profiler.write(
+            output_dir / "run_profile.json",
+            input=str(input_path),
+            options={key: value for key, value in vars(args).items() if key not in ("input", "output")},
+        )
+        print("Run profile written to", profile_path)
+    return story_path
+
+
+def _date_window(args: argparse.Namespace) -> Tuple[float | None, float | None]:
+    """Resolve ``--year``/``--since``/``--until`` to epoch seconds (filling in ``args.since``/``until``)."""
+    if args.year is not None:
+        if args.since or args.until:
+            raise SystemExit("--year cannot be combined with --since/--until")
+        args.since, args.until = f"{args.year}-01-01", f"{args.year + 1}-01-01"
+        args.year = None
+    try:
+        since, until = to_epoch(args.since), to_epoch(args.until)
+    except ValueError as exc:
+        raise SystemExit(f"Invalid --since/--until date: {exc}") from None
+    if since is not None and until is not None and since >= until:
+        raise SystemExit("--since must be earlier than --until")
+    return since, until
+
+
+def _load_messages(input_path: Path, args: argparse.Namespace, profiler: Profiler) -> pd.DataFrame:
+    text_path = Path(args.output) / TEXT_STORE_DIRNAME
+    window = {"since": to_epoch(args.since), "until": to_epoch(args.until)}
+    if args.state_dir:
+        state = IncrementalStore(args.state_dir, unicode_words=args.unicode_words, **window)
+        with profiler.stage("incremental_update") as record:
+            update = state.update(load_conversations(input_path, stream=args.stream))
+            record["rows"] = len(update.messages)
+        print(
+            f"Incremental update: {update.added} new, {update.changed} changed, "
+            f"{update.removed} removed, {update.reused} unchanged conversations"
+        )
+        messages = update.messages
+        if args.text == "spill":
+            # Unlabelled, so a cached table of this export cannot claim these texts.
+            with profiler.stage("spill_text", rows=len(messages)), TextStore(text_path, mode="w") as store:
+                messages = spill_text(messages, store)
+        elif args.text == "drop":
+            messages = messages.drop(columns="text", errors="ignore")
+        return _compact(messages, profiler) if args.compact else messages
+
+    cache = None if args.no_cache else MessageCache(args.cache_dir, max_bytes=args.cache_size * 1024**2)
+    if cache is not None:
+        with profiler.stage("cache_lookup") as record:
+            key = cache.key(
+                input_path, compact=args.compact, text=args.text, unicode_words=args.unicode_words, **window
+            )
+            # A cached table without text is only usable if the spilled texts
+            # in the output directory are the ones spilled alongside it.
+            messages = cache.get(key) if args.text != "spill" or store_source(text_path) == key else None
+            record["hit"] = messages is not None
+            record["rows"] = None if messages is None else len(messages)
+        if messages is not None:
+            if args.compact:
+                print(f"Message table: {bytes_per_message(messages):,.0f} bytes/message (compact, cached)")
+            return messages
+
+    # With --stream the export is parsed lazily, so parsing time is part of "flatten".
+    with profiler.stage("parse") as record:
+        conversations = load_conversations(input_path, stream=args.stream)
+        if not args.stream:
+            record["rows"] = len(conversations)
+    with profiler.stage("flatten") as record:
+        if args.text == "spill":
+            with TextStore(text_path, mode="w", source=None if cache is None else key) as store:
+                messages = flatten_messages(
+                    conversations,
+                    workers=args.workers,
+                    text="spill",
+                    text_store=store,
+                    unicode_words=args.unicode_words,
+                    **window,
+                )
+        else:
+            messages = flatten_messages(
+                conversations, workers=args.workers, text=args.text, unicode_words=args.unicode_words, **window
+            )
+        record["rows"] = len(messages)
+    if args.compact:
+        messages = _compact(messages, profiler)
+    if cache is not None:
+        with profiler.stage("cache_store", rows=len(messages)):
+            cache.put(key, messages)
+    return messages
+
+
+def _compact(messages: pd.DataFrame, profiler: Profiler) -> pd.DataFrame:
+    with profiler.stage("compact", rows=len(messages)) as record:
+        before = bytes_per_message(messages)
+        messages = compact_messages(messages)
+        after = bytes_per_message(messages)
+        record["bytes_per_message"] = {"before": before, "after": after}
+    print(f"Message table: {before:,.0f} -> {after:,.0f} bytes/message with compact dtypes")
+    return messages
+
+
+def _check_output_format(fmt: str, compression: str | None) -> None:
+    if compression not in (None, "none") and compression not in COMPRESSIONS[fmt]:
+        raise SystemExit(
+            f"Unsupported compression {compression!r} for --format {fmt}; "
+            f"choose from: none, {', '.join(COMPRESSIONS[fmt])}"
+        )
+    if fmt != "csv" and importlib.util.find_spec("pyarrow") is None:
+        raise SystemExit(f"--format {fmt} requires pyarrow (pip install 'gpt-recap[arrow]')")
+
+
+def _write_tables(
+    result: AnalysisResult,
+    output_dir: Path,
+    fmt: str = "csv",
+    compression: str | None = None,
+    profiler: Profiler | None = None,
+) -> None:
+    profiler = profiler or Profiler()
+    # "none" is spelled differently by each writer: pandas/pyarrow parquet
+    # take None (the default there is snappy), feather takes "uncompressed".
+    if compression == "none":
+        compression = "uncompressed" if fmt == "feather" else None
+    elif fmt == "parquet" and compression is None:
+        compression = "snappy"
 
-def _write_csv_outputs(result: AnalysisResult, output_dir: Path) -> None:
     def save(df: pd.DataFrame, name: str) -> None:
-        path = output_dir / name
+        path = output_dir / (Path(name).stem + OUTPUT_FORMATS[fmt])
+        with profiler.stage(f"write:{path.name}", rows=len(df)):
+            write_frame(df, path)
+
+    def write_frame(df: pd.DataFrame, path: Path) -> None:
+        if fmt == "parquet":
+            df.to_parquet(path, index=False, compression=compression)
+            return
+        if fmt == "feather":
+            # Feather stores columns only; the tables' indexes carry no data.
+            df.reset_index(drop=True).to_feather(path, **({"compression": compression} if compression else {}))
+            return
+
+        if compression:
+            path = path.with_name(path.name + _COMPRESSED_CSV_SUFFIX[compression])
         if df.empty:
-            df.to_csv(path, index=False)
+            df.to_csv(path, index=False, compression=compression)
             return
         frame = df.copy()
         for col in frame.columns:
@@ -64,7 +437,7 @@ def _write_csv_outputs(result: AnalysisResult, output_dir: Path) -> None:
                     frame[col] = frame[col].dt.tz_convert("UTC").dt.strftime("%Y-%m-%dT%H:%M:%SZ")
                 else:
                     frame[col] = frame[col].dt.strftime("%Y-%m-%dT%H:%M:%S")
-        frame.to_csv(path, index=False)
+        frame.to_csv(path, index=False, compression=compression)
 
     save(result.messages, "messages_flat.csv")
     save(result.conversation_summary, "conversation_summary.csv")
@@ -1,13 +1,24 @@
 from __future__ import annotations
 
+import importlib.util
 import json
 import re
+import sys
+from array import array
+from collections import Counter, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import partial
+from itertools import islice
+from multiprocessing.context import BaseContext
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Mapping, MutableMapping, Sequence
+from typing import TYPE_CHECKING, Any, Callable, Deque, Dict, Iterable, Iterator, List, Mapping, MutableMapping, Sequence
 
 import numpy as np
 import pandas as pd
 
+if TYPE_CHECKING:
+    from .textstore import TextStore
+
 
 TEXTUAL_CONTENT_TYPES = {
     "text",
@@ -23,45 +34,172 @@ TEXTUAL_CONTENT_TYPES = {
 }
 
 
-def load_conversations(path: str | Path) -> List[MutableMapping[str, Any]]:
-    """Load the exported conversations JSON."""
+STREAM_CHUNK_SIZE = 1 << 20
+
+_WHITESPACE = " \t\n\r"
+_NUMBER_CHARS = frozenset("0123456789+-.eE")
+
+
+def load_conversations(
+    path: str | Path, stream: bool = False
+) -> List[MutableMapping[str, Any]] | Iterator[MutableMapping[str, Any]]:
+    """Load the exported conversations JSON.
+
+    With ``stream=True`` a generator over the top-level array is returned
+    instead of a list (see :func:`iter_conversations`).
+    """
+    if stream:
+        return iter_conversations(path)
     with Path(path).open("r", encoding="utf-8") as fh:
         return json.load(fh)
 
 
+def iter_conversations(
+    path: str | Path, chunk_size: int = STREAM_CHUNK_SIZE
+) -> Iterator[MutableMapping[str, Any]]:
+    """Yield conversations one at a time from the top-level JSON array.
+
+    The file is read incrementally, so peak memory is bounded by the largest
+    single conversation rather than by the size of the whole export.
+    """
+    decoder = json.JSONDecoder()
+    with Path(path).open("r", encoding="utf-8") as fh:
+        buf = ""
+        pos = 0
+        consumed = 0
+        eof = False
+
+        def fill(min_size: int) -> bool:
+            nonlocal buf, pos, consumed, eof
+            if eof:
+                return False
+            chunk = fh.read(max(chunk_size, min_size))
+            if not chunk:
+                eof = True
+                return False
+            buf = buf[pos:] + chunk
+            consumed += pos
+            pos = 0
+            return True
+
+        def skip_whitespace() -> bool:
+            nonlocal pos
+            while True:
+                while pos < len(buf) and buf[pos] in _WHITESPACE:
+                    pos += 1
+                if pos < len(buf):
+                    return True
+                if not fill(0):
+                    return False
+
+        if not skip_whitespace() or buf[pos] != "[":
+            raise ValueError(f"{path}: expected a JSON array of conversations")
+        pos += 1
+
+        expect_item = True
+        while True:
+            if not skip_whitespace():
+                raise ValueError(f"{path}: unexpected end of file inside the conversations array")
+            char = buf[pos]
+            if char == "]":
+                return
+            if char == ",":
+                if expect_item:
+                    raise ValueError(f"{path}: unexpected ',' at offset {consumed + pos}")
+                pos += 1
+                expect_item = True
+                continue
+            if not expect_item:
+                raise ValueError(f"{path}: expected ',' or ']' at offset {consumed + pos}")
+
+            while True:
+                try:
+                    item, end = decoder.raw_decode(buf, pos)
+                except json.JSONDecodeError:
+                    # Incomplete value: grow the buffer geometrically so huge
+                    # conversations are not re-parsed once per chunk.
+                    if not fill(len(buf) - pos):
+                        raise
+                    continue
+                # A number cut by the buffer boundary ("1." or "2e") still
+                # decodes, as a shorter number; only trust it once a character
+                # that cannot continue it is visible.
+                if buf[pos] in _NUMBER_CHARS:
+                    token_end = end
+                    while token_end < len(buf) and buf[token_end] in _NUMBER_CHARS:
+                        token_end += 1
+                    if token_end == len(buf) and fill(0):
+                        continue
+                break
+            pos = end
+            expect_item = False
+            yield item
+
+
+ContentHandler = Callable[[Mapping[str, Any]], str]
+
+_CONTENT_HANDLERS: Dict[Any, ContentHandler] = {}
+_PART_HANDLERS: Dict[Any, ContentHandler] = {}
+
+# Content types seen without a registered handler (their text is left empty).
+UNKNOWN_CONTENT_TYPES: Counter = Counter()
+
+
+def register_content_handler(
+    content_type: str, handler: ContentHandler | None = None
+) -> ContentHandler | Callable[[ContentHandler], ContentHandler]:
+    """Register ``handler(content) -> str`` for messages of ``content_type``.
+
+    Replaces any existing handler for that type. Usable as a decorator when
+    ``handler`` is omitted. With ``workers`` the registries are pickled into
+    each worker process, so handlers must be picklable (module-level
+    functions, not lambdas).
+    """
+    if handler is None:
+        return lambda func: register_content_handler(content_type, func)
+    _CONTENT_HANDLERS[content_type] = handler
+    return handler
+
+
+def register_part_handler(
+    part_type: str, handler: ContentHandler | None = None
+) -> ContentHandler | Callable[[ContentHandler], ContentHandler]:
+    """Register ``handler(part) -> str`` for ``multimodal_text`` parts of ``part_type``."""
+    if handler is None:
+        return lambda func: register_part_handler(part_type, func)
+    _PART_HANDLERS[part_type] = handler
+    return handler
+
+
 def extract_text(content: Mapping[str, Any] | None) -> str:
     if not content:
         return ""
+    handler = _CONTENT_HANDLERS.get(content.get("content_type"))
+    return handler(content) if handler is not None else ""
+
 
-    ctype = content.get("content_type")
+def _join(lines: Iterable[str]) -> str:
+    return "\n".join(line for line in lines if line)
+
+
+def _textual_content(content: Mapping[str, Any]) -> str:
     parts = content.get("parts") or []
-    lines: List[str] = []
+    # Fast path for the dominant shape: a single plain string part.
+    if type(parts) is list and len(parts) == 1 and type(parts[0]) is str:
+        return parts[0]
+    return _join(_parse_parts(parts))
 
-    if ctype in TEXTUAL_CONTENT_TYPES:
-        lines.extend(_parse_parts(parts))
-    elif ctype == "multimodal_text":
-        for part in parts:
-            if isinstance(part, str):
-                lines.append(part)
-            elif isinstance(part, Mapping):
-                ptype = part.get("content_type")
-                if ptype == "text" and isinstance(part.get("text"), str):
-                    lines.append(part["text"])
-                elif ptype == "audio_transcription":
-                    transcript = part.get("transcript")
-                    if transcript:
-                        lines.append(transcript)
-                elif ptype == "image_asset_pointer":
-                    lines.append("[image]")
-                elif ptype == "audio_asset_pointer":
-                    lines.append("[audio]")
-                elif ptype == "real_time_user_audio_video_asset_pointer":
-                    lines.append("[realtime av]")
-    elif ctype == "user_editable_context":
-        instructions = content.get("user_instructions") or ""
-        lines.append(instructions)
 
-    return "\n".join(line for line in lines if line)
+def _multimodal_content(content: Mapping[str, Any]) -> str:
+    lines: List[str] = []
+    for part in content.get("parts") or []:
+        if isinstance(part, str):
+            lines.append(part)
+        elif isinstance(part, Mapping):
+            handler = _PART_HANDLERS.get(part.get("content_type"))
+            if handler is not None:
+                lines.append(handler(part))
+    return _join(lines)
 
 
 def _parse_parts(parts: Sequence[Any]) -> List[str]:
@@ -77,14 +215,154 @@ def _parse_parts(parts: Sequence[Any]) -> List[str]:
     return collected
 
 
+def _user_instructions(content: Mapping[str, Any]) -> str:
+    return content.get("user_instructions") or ""
+
+
+def _text_part(part: Mapping[str, Any]) -> str:
+    return part["text"] if isinstance(part.get("text"), str) else ""
+
+
+def _transcript_part(part: Mapping[str, Any]) -> str:
+    return part.get("transcript") or ""
+
+
+def _placeholder_part(placeholder: str, part: Mapping[str, Any]) -> str:
+    return placeholder
+
+
+# Built-in handlers are named functions (or partials of one) so the
+# registries can be pickled into spawned flatten workers.
+for _content_type in TEXTUAL_CONTENT_TYPES:
+    register_content_handler(_content_type, _textual_content)
+register_content_handler("multimodal_text", _multimodal_content)
+register_content_handler("user_editable_context", _user_instructions)
+
+register_part_handler("text", _text_part)
+register_part_handler("audio_transcription", _transcript_part)
+register_part_handler("image_asset_pointer", partial(_placeholder_part, "[image]"))
+register_part_handler("audio_asset_pointer", partial(_placeholder_part, "[audio]"))
+register_part_handler("real_time_user_audio_video_asset_pointer", partial(_placeholder_part, "[realtime av]"))
+
+
 WORD_RE = re.compile(r"[A-Za-z']+")
+UNICODE_WORD_RE = re.compile(r"(?:[^\W\d_]|')+")
+
+# 1 for the bytes WORD_RE matches, 0 elsewhere (including every byte of a
+# multi-byte UTF-8 sequence, none of which can be part of an ASCII word).
+_WORD_BYTES = bytes(int(chr(i).isascii() and (chr(i).isalpha() or chr(i) == "'")) for i in range(256))
+# The only non-ASCII characters whose lowercase form contains an ASCII letter.
+_LOWERS_TO_ASCII = ("\u0130", "\u212a")
+
+
+def count_words(text: str, unicode: bool = False) -> int:
+    """Number of words in ``text``.
+
+    By default a word is a run of ASCII letters and apostrophes, counted
+    exactly as ``len(WORD_RE.findall(text.lower()))`` but without the
+    lowercase copy or the list of matches: the text is mapped to word/non-word
+    flags with ``bytes.translate`` and word starts are counted in C. With
+    ``unicode=True`` letters from any script count (``UNICODE_WORD_RE``),
+    which is markedly slower on non-ASCII text.
+    """
+    if not text.isascii():
+        # On ASCII text both definitions agree, so only non-ASCII text needs a regex.
+        if unicode:
+            return len(UNICODE_WORD_RE.findall(text))
+        if any(char in text for char in _LOWERS_TO_ASCII):
+            return len(WORD_RE.findall(text.lower()))
+    flags = text.encode("utf-8", "surrogatepass").translate(_WORD_BYTES)
+    return flags.count(b"\x00\x01") + flags.startswith(b"\x01")
+
+
+MESSAGE_COLUMNS = [
+    "conversation_index",
+    "conversation_id",
+    "conversation_title",
+    "message_id",
+    "message_index",
+    "role",
+    "create_time",
+    "content_type",
+    "text",
+    "word_count",
+    "char_count",
+    "has_code",
+    "is_multimodal",
+]
 
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+WEEKDAY_NAMES = np.array(WEEKDAYS, dtype=object)
 
-def flatten_messages(conversations: Iterable[MutableMapping[str, Any]]) -> pd.DataFrame:
-    """Explode the nested conversation format into a flat message DataFrame."""
-    rows: List[Dict[str, Any]] = []
 
-    for idx, conversation in enumerate(conversations):
+TEXT_MODES = ("keep", "drop", "spill")
+
+
+class MessageColumns:
+    """Typed column buffers filled one message at a time.
+
+    Timestamps are kept as float epoch seconds and only converted (together
+    with the derived calendar columns) in a single vectorised pass by
+    :meth:`to_frame`. With ``keep_text=False`` the text is only counted and
+    the frame has no ``text`` column; a ``text_store`` additionally receives
+    every message body. ``since``/``until`` (epoch seconds) restrict the
+    buffers to messages created in ``[since, until)``.
+    """
+
+    def __init__(
+        self,
+        keep_text: bool = True,
+        text_store: "TextStore | None" = None,
+        unicode_words: bool = False,
+        since: float | None = None,
+        until: float | None = None,
+    ) -> None:
+        self.keep_text = keep_text
+        self.unicode_words = unicode_words
+        self.text_store = text_store
+        self.since = since
+        self.until = until
+        self.conversation_index = array("q")
+        self.conversation_id: List[Any] = []
+        self.conversation_title: List[Any] = []
+        self.message_id: List[Any] = []
+        self.role: List[str] = []
+        self.create_time = array("d")
+        self.content_type: List[Any] = []
+        self.text: List[str] = []
+        self.word_count = array("q")
+        self.char_count = array("q")
+        self.unknown_content_types: Counter = Counter()
+
+    def __len__(self) -> int:
+        return len(self.message_id)
+
+    @property
+    def columns(self) -> List[str]:
+        return MESSAGE_COLUMNS if self.keep_text else [col for col in MESSAGE_COLUMNS if col != "text"]
+
+    def extend(self, other: "MessageColumns") -> None:
+        if self.text_store is not None:
+            self.text_store.extend(other.message_id, other.text)
+        for name, values in vars(other).items():
+            if name == "text" and not self.keep_text:
+                continue
+            if isinstance(values, (list, array)):
+                getattr(self, name).extend(values)
+        self.unknown_content_types.update(other.unknown_content_types)
+
+    def spawn(self, keep_text: bool) -> "MessageColumns":
+        """Empty buffers with the same options (minus the text store) for a worker shard."""
+        return MessageColumns(
+            keep_text=keep_text, unicode_words=self.unicode_words, since=self.since, until=self.until
+        )
+
+    def add_conversation(self, idx: int, conversation: Mapping[str, Any]) -> None:
+        since, until = self.since, self.until
+        windowed = since is not None or until is not None
+        if windowed and _outside_window(conversation, since, until):
+            return
+
         mapping = conversation.get("mapping") or {}
         conv_id = conversation.get("id") or f"conversation_{idx:05d}"
         title = conversation.get("title") or "Untitled"
@@ -94,62 +372,282 @@ def flatten_messages(conversations: Iterable[MutableMapping[str, Any]]) -> pd.Da
             if not message:
                 continue
 
-            content = message.get("content") or {}
-            text = extract_text(content)
             create_time = message.get("create_time")
+            if windowed and (
+                not isinstance(create_time, (int, float))
+                or (since is not None and create_time < since)
+                or (until is not None and create_time >= until)
+            ):
+                continue
+
+            content = message.get("content") or {}
+            ctype = content.get("content_type")
+            handler = _CONTENT_HANDLERS.get(ctype)
+            if handler is not None:
+                text = handler(content)
+            else:
+                text = ""
+                if content:
+                    self.unknown_content_types[ctype] += 1
+            role = (message.get("author") or {}).get("role", "unknown")
+
+            self.conversation_index.append(idx)
+            self.conversation_id.append(conv_id)
+            self.conversation_title.append(title)
+            self.message_id.append(message.get("id"))
+            self.role.append(sys.intern(role) if isinstance(role, str) else role)
+            self.create_time.append(create_time if isinstance(create_time, (int, float)) else np.nan)
+            self.content_type.append(sys.intern(ctype) if isinstance(ctype, str) else ctype)
+            if self.keep_text:
+                self.text.append(text)
+            if self.text_store is not None:
+                self.text_store.add(message.get("id"), text)
+            self.word_count.append(count_words(text, self.unicode_words))
+            self.char_count.append(len(text))
 
-            rows.append(
-                {
-                    "conversation_index": idx,
-                    "conversation_id": conv_id,
-                    "conversation_title": title,
-                    "message_id": message.get("id"),
-                    "message_index": message.get("id"),
-                    "role": (message.get("author") or {}).get("role", "unknown"),
-                    "create_time": pd.to_datetime(create_time, unit="s", utc=True)
-                    if isinstance(create_time, (int, float))
-                    else pd.NaT,
-                    "content_type": content.get("content_type"),
-                    "text": text,
-                    "word_count": len(WORD_RE.findall(text.lower())),
-                    "char_count": len(text),
-                    "has_code": content.get("content_type") == "code",
-                    "is_multimodal": content.get("content_type") == "multimodal_text",
-                }
-            )
-
-    if not rows:
-        return pd.DataFrame(
-            columns=[
-                "conversation_index",
-                "conversation_id",
-                "conversation_title",
-                "message_id",
-                "message_index",
-                "role",
-                "create_time",
-                "content_type",
-                "text",
-                "word_count",
-                "char_count",
-                "has_code",
-                "is_multimodal",
-            ]
+    def to_frame(self) -> pd.DataFrame:
+        if not len(self):
+            return pd.DataFrame(columns=self.columns)
+
+        content_type = np.array(self.content_type, dtype=object)
+        create_time = pd.Series(
+            pd.to_datetime(np.frombuffer(self.create_time, dtype=np.float64), unit="s", utc=True)
+        )
+        df = pd.DataFrame(
+            {
+                "conversation_index": np.frombuffer(self.conversation_index, dtype=np.int64),
+                "conversation_id": self.conversation_id,
+                "conversation_title": self.conversation_title,
+                "message_id": self.message_id,
+                "message_index": self.message_id,
+                "role": self.role,
+                "create_time": create_time,
+                "content_type": content_type,
+                **({"text": self.text} if self.keep_text else {}),
+                "word_count": np.frombuffer(self.word_count, dtype=np.int64),
+                "char_count": np.frombuffer(self.char_count, dtype=np.int64),
+                "has_code": content_type == "code",
+                "is_multimodal": content_type == "multimodal_text",
+            }
         )
+        df["role"] = df["role"].fillna("unknown")
+        add_calendar_columns(df)
+        return df
 
-    df = pd.DataFrame(rows)
-    df["role"] = df["role"].fillna("unknown")
-    df["date"] = df["create_time"].dt.tz_convert("UTC").dt.tz_localize(None).dt.date
-    df["month"] = (
-        df["create_time"]
-        .dt.tz_convert("UTC")
-        .dt.tz_localize(None)
-        .dt.to_period("M")
-        .dt.to_timestamp()
-    )
-    df["hour"] = df["create_time"].dt.hour
-    df["weekday"] = df["create_time"].dt.day_name()
+
+def _outside_window(conversation: Mapping[str, Any], since: float | None, until: float | None) -> bool:
+    # A conversation's messages fall between its create_time and update_time,
+    # so one that ended before ``since`` or started at/after ``until`` can be
+    # skipped without walking its mapping.
+    started = conversation.get("create_time")
+    updated = conversation.get("update_time")
+    if since is not None and isinstance(updated, (int, float)) and updated < since:
+        return True
+    return until is not None and isinstance(started, (int, float)) and started >= until
+
+
+def to_epoch(value: Any) -> float | None:
+    """Epoch seconds for a date bound: a number, a date/datetime or an ISO string (naive means UTC)."""
+    if value is None or isinstance(value, (int, float)):
+        return value
+    ts = pd.Timestamp(value)
+    if ts.tzinfo is None:
+        ts = ts.tz_localize("UTC")
+    return ts.timestamp()
+
+
+def add_calendar_columns(df: pd.DataFrame) -> None:
+    """Derive the date/hour/weekday/month columns from ``create_time`` in place."""
+    naive = df["create_time"].dt.tz_localize(None)
+    dayofweek = naive.dt.dayofweek
+    weekday = np.full(len(df), np.nan, dtype=object)
+    valid = dayofweek.notna().to_numpy()
+    weekday[valid] = WEEKDAY_NAMES[dayofweek[valid].astype(np.int64)]
+
+    df["date"] = naive.dt.date
+    df["month"] = naive.to_numpy().astype("datetime64[M]").astype("datetime64[ns]")
+    df["hour"] = naive.dt.hour
+    df["weekday"] = weekday
+
+
+CATEGORY_COLUMNS = ["conversation_id", "conversation_title", "role", "content_type", "weekday"]
+STRING_COLUMNS = ["message_id", "message_index", "text"]
+
+
+def compact_messages(messages: pd.DataFrame) -> pd.DataFrame:
+    """Return ``messages`` with memory-efficient dtypes.
+
+    Repeated labels become categoricals, counts become ``int32``, ``hour``
+    becomes ``int8`` (``float32`` when some messages are untimed, since NumPy
+    integers cannot hold NaN), ``date`` becomes ``datetime64[ns]`` midnight
+    timestamps and, when pyarrow is installed, ids and text become
+    Arrow-backed strings. Values are unchanged.
+    """
+    df = messages.copy()
+    if df.empty:
+        return df
+    for col in CATEGORY_COLUMNS:
+        if col in df:
+            df[col] = df[col].astype("category")
+    df["conversation_index"] = df["conversation_index"].astype("int32")
+    df["word_count"] = df["word_count"].astype("int32")
+    df["char_count"] = df["char_count"].astype("int32")
+    if "hour" in df:
+        df["hour"] = df["hour"].astype("float32" if df["hour"].isna().any() else "int8")
+    if "date" in df:
+        df["date"] = df["create_time"].dt.tz_localize(None).dt.normalize()
+    if importlib.util.find_spec("pyarrow") is not None:
+        for col in STRING_COLUMNS:
+            if col in df:
+                df[col] = df[col].astype("string[pyarrow]")
     return df
 
 
-__all__ = ["load_conversations", "flatten_messages"]
+def bytes_per_message(messages: pd.DataFrame) -> float:
+    """Deep memory footprint of ``messages`` divided by its row count."""
+    if messages.empty:
+        return 0.0
+    return float(messages.memory_usage(deep=True).sum()) / len(messages)
+
+
+def flatten_messages(
+    conversations: Iterable[MutableMapping[str, Any]],
+    workers: int | None = None,
+    shard_size: int | None = None,
+    compact: bool = False,
+    text: str = "keep",
+    text_store: "TextStore | None" = None,
+    unicode_words: bool = False,
+    since: Any = None,
+    until: Any = None,
+    mp_context: BaseContext | None = None,
+) -> pd.DataFrame:
+    """Explode the nested conversation format into a flat message DataFrame.
+
+    With ``workers`` greater than one, conversations are split into shards of
+    ``shard_size`` and flattened in a process pool. Shards are concatenated in
+    submission order, so ``conversation_index`` ordering matches the serial
+    path exactly; ``mp_context`` picks the start method of that pool.
+    ``compact=True`` applies :func:`compact_messages`. Content
+    types without a handler (see :func:`register_content_handler`) are
+    tallied in ``UNKNOWN_CONTENT_TYPES``.
+
+    ``text`` controls the message bodies: ``"keep"`` stores them in the
+    ``text`` column, ``"drop"`` only counts words and characters, and
+    ``"spill"`` writes them to ``text_store`` (addressed by message id)
+    instead of the frame. ``unicode_words`` is passed to :func:`count_words`.
+
+    ``since``/``until`` (anything :func:`to_epoch` accepts) keep only messages
+    created in ``[since, until)``. Conversations entirely outside the window
+    are skipped before their mapping is walked, and out-of-window messages
+    before their text is extracted; untimed messages are dropped whenever a
+    bound is given.
+    """
+    if text not in TEXT_MODES:
+        raise ValueError(f"text must be one of {', '.join(TEXT_MODES)}")
+    if (text == "spill") != (text_store is not None):
+        raise ValueError("text_store is required for (and only used with) text='spill'")
+
+    columns = MessageColumns(
+        keep_text=text == "keep",
+        text_store=text_store,
+        unicode_words=unicode_words,
+        since=to_epoch(since),
+        until=to_epoch(until),
+    )
+    if workers is not None and workers > 1:
+        messages = _flatten_parallel(conversations, columns, workers, shard_size, mp_context)
+    else:
+        for idx, conversation in enumerate(conversations):
+            columns.add_conversation(idx, conversation)
+        messages = columns.to_frame()
+    UNKNOWN_CONTENT_TYPES.update(columns.unknown_content_types)
+    return compact_messages(messages) if compact else messages
+
+
+DEFAULT_SHARD_SIZE = 500
+
+
+def _init_flatten_worker(
+    content_handlers: Dict[Any, ContentHandler], part_handlers: Dict[Any, ContentHandler]
+) -> None:
+    _CONTENT_HANDLERS.update(content_handlers)
+    _PART_HANDLERS.update(part_handlers)
+
+
+def _flatten_shard(
+    shard: Sequence[tuple[int, Mapping[str, Any]]], columns: MessageColumns
+) -> MessageColumns:
+    for idx, conversation in shard:
+        columns.add_conversation(idx, conversation)
+    return columns
+
+
+def _iter_shards(
+    conversations: Iterable[MutableMapping[str, Any]],
+    shard_size: int,
+    since: float | None = None,
+    until: float | None = None,
+) -> Iterator[List[tuple[int, MutableMapping[str, Any]]]]:
+    """Yield ``(index, conversation)`` shards, leaving out conversations outside the window."""
+    indexed: Iterator[tuple[int, MutableMapping[str, Any]]] = enumerate(conversations)
+    if since is not None or until is not None:
+        indexed = (item for item in indexed if not _outside_window(item[1], since, until))
+    while True:
+        shard = list(islice(indexed, shard_size))
+        if not shard:
+            return
+        yield shard
+
+
+def _flatten_parallel(
+    conversations: Iterable[MutableMapping[str, Any]],
+    columns: MessageColumns,
+    workers: int,
+    shard_size: int | None,
+    mp_context: BaseContext | None = None,
+) -> pd.DataFrame:
+    if shard_size is None:
+        if isinstance(conversations, Sequence):
+            shard_size = max(1, -(-len(conversations) // (workers * 4)))
+        else:
+            shard_size = DEFAULT_SHARD_SIZE
+
+    # Shards only ship text back when it is kept or spilled by this process.
+    template = columns.spawn(keep_text=columns.keep_text or columns.text_store is not None)
+    # Keep a bounded number of shards in flight so a streamed export is never
+    # fully materialised while waiting on the pool.
+    max_pending = workers * 2
+    # Spawned/forkserver workers re-import this module with empty registries,
+    # so the parent's handlers are installed by the initializer.
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=mp_context,
+        initializer=_init_flatten_worker,
+        initargs=(dict(_CONTENT_HANDLERS), dict(_PART_HANDLERS)),
+    ) as pool:
+        pending: Deque[Future] = deque()
+        for shard in _iter_shards(conversations, shard_size, columns.since, columns.until):
+            pending.append(pool.submit(_flatten_shard, shard, template))
+            if len(pending) >= max_pending:
+                columns.extend(pending.popleft().result())
+        while pending:
+            columns.extend(pending.popleft().result())
+    return columns.to_frame()
+
+
+__all__ = [
+    "load_conversations",
+    "iter_conversations",
+    "flatten_messages",
+    "MessageColumns",
+    "add_calendar_columns",
+    "count_words",
+    "to_epoch",
+    "extract_text",
+    "register_content_handler",
+    "register_part_handler",
+    "UNKNOWN_CONTENT_TYPES",
+    "compact_messages",
+    "bytes_per_message",
+]
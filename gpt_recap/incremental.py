@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import json
+import os
+import pickle
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, MutableMapping, Set
+
+import pandas as pd
+
+from . import __version__
+from .data import MESSAGE_COLUMNS, UNKNOWN_CONTENT_TYPES, MessageColumns, add_calendar_columns, to_epoch
+
+
+MANIFEST_NAME = "manifest.json"
+MESSAGES_NAME = "messages.pkl"
+STATE_FORMAT = 1
+
+
+@dataclass
+class IncrementalUpdate:
+    messages: pd.DataFrame
+    added: int
+    changed: int
+    removed: int
+    reused: int
+
+
+class IncrementalStore:
+    """Flattened message table persisted between runs on successive exports.
+
+    Conversations are matched by ``id`` and ``update_time``: unchanged ones
+    reuse their stored rows (re-indexed to their position in the new export),
+    while new or changed conversations are flattened from scratch.
+    Conversations without an ``id`` are always re-flattened. Stored rows are
+    discarded when the flattening options (``unicode_words`` and the
+    ``since``/``until`` window, see :func:`~gpt_recap.data.flatten_messages`)
+    change.
+    """
+
+    def __init__(
+        self, state_dir: str | Path, unicode_words: bool = False, since: Any = None, until: Any = None
+    ) -> None:
+        self.state_dir = Path(state_dir)
+        self.options = {"unicode_words": unicode_words, "since": to_epoch(since), "until": to_epoch(until)}
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.state_dir / MANIFEST_NAME
+
+    @property
+    def messages_path(self) -> Path:
+        return self.state_dir / MESSAGES_NAME
+
+    def _load(self) -> tuple[Dict[str, Any], pd.DataFrame | None]:
+        try:
+            manifest = json.loads(self.manifest_path.read_text(encoding="utf-8"))
+            with self.messages_path.open("rb") as fh:
+                messages = pickle.load(fh)
+        except (FileNotFoundError, ValueError, pickle.UnpicklingError, EOFError):
+            return {}, None
+        if (
+            manifest.get("format") != STATE_FORMAT
+            or manifest.get("version") != __version__
+            or manifest.get("options", {}) != self.options
+        ):
+            return {}, None
+        return manifest.get("conversations", {}), messages
+
+    def _save(self, conversations: Dict[str, Any], messages: pd.DataFrame) -> None:
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        tmp = self.messages_path.with_suffix(".tmp")
+        with tmp.open("wb") as fh:
+            pickle.dump(messages, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, self.messages_path)
+        manifest = {
+            "format": STATE_FORMAT,
+            "version": __version__,
+            "options": self.options,
+            "conversations": conversations,
+        }
+        tmp = self.manifest_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(manifest), encoding="utf-8")
+        os.replace(tmp, self.manifest_path)
+
+    def update(self, conversations: Iterable[MutableMapping[str, Any]]) -> IncrementalUpdate:
+        stored, stored_messages = self._load()
+
+        columns = MessageColumns(**self.options)
+        reuse: Dict[str, int] = {}
+        update_times: Dict[str, Any] = {}
+        id_counts: Counter = Counter()
+        added = changed = 0
+
+        for idx, conversation in enumerate(conversations):
+            conv_id = conversation.get("id")
+            update_time = conversation.get("update_time")
+            if conv_id:
+                id_counts[conv_id] += 1
+                update_times[conv_id] = update_time
+            if (
+                stored_messages is not None
+                and conv_id
+                and conv_id not in reuse
+                and update_time is not None
+                and stored.get(conv_id) == update_time
+            ):
+                reuse[conv_id] = idx
+                continue
+            if conv_id and conv_id in stored:
+                changed += 1
+            else:
+                added += 1
+            columns.add_conversation(idx, conversation)
+
+        UNKNOWN_CONTENT_TYPES.update(columns.unknown_content_types)
+        parts: List[pd.DataFrame] = []
+        if reuse:
+            kept = stored_messages[stored_messages["conversation_id"].isin(reuse.keys())].copy()
+            kept["conversation_index"] = kept["conversation_id"].map(reuse).astype("int64")
+            parts.append(kept)
+        if len(columns):
+            parts.append(columns.to_frame())
+
+        if parts:
+            messages = (
+                pd.concat(parts, ignore_index=True)
+                .sort_values("conversation_index", kind="stable")
+                .reset_index(drop=True)
+            )
+            add_calendar_columns(messages)
+        else:
+            messages = pd.DataFrame(columns=MESSAGE_COLUMNS)
+
+        # Duplicate ids cannot be matched reliably on the next run, so they are
+        # left out of the manifest and always re-flattened.
+        manifest = {cid: ut for cid, ut in update_times.items() if id_counts[cid] == 1}
+        seen: Set[str] = set(update_times)
+        removed = sum(1 for cid in stored if cid not in seen)
+        self._save(manifest, messages)
+
+        return IncrementalUpdate(
+            messages=messages,
+            added=added,
+            changed=changed,
+            removed=removed,
+            reused=len(reuse),
+        )
+
+
+__all__ = ["IncrementalStore", "IncrementalUpdate"]
@@ -1,25 +1,30 @@
 from __future__ import annotations
 
+import hashlib
+import inspect
+import json
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict
+from typing import Any, Dict, List, Tuple
 
+import matplotlib
 import matplotlib.pyplot as plt
 import pandas as pd
 import seaborn as sns
 
+from . import __version__
 from .analysis import AnalysisResult
+from .charts import ROLE_COLORS
+from .profiling import Profiler
 
 
-ROLE_COLORS = {
-    "user": "#64ffda",
-    "assistant": "#ff61ef",
-    "tool": "#ffd479",
-    "system": "#9bb5ff",
-    "unknown": "#d2d2d2",
-}
-
 GRADIENT_BG = ["#1b1b3a", "#0f172a"]
 
+PLOT_DPI = 220
+PLOT_MANIFEST = ".plot_cache.json"
+
 
 def configure_visuals() -> None:
     sns.set_theme(style="whitegrid")
@@ -42,33 +47,153 @@ def configure_visuals() -> None:
     )
 
 
+_visuals_configured = False
+
+
+def _ensure_visuals() -> None:
+    """Apply :func:`configure_visuals` once per process."""
+    global _visuals_configured
+    if not _visuals_configured:
+        configure_visuals()
+        _visuals_configured = True
+
+
 class PlotBuilder:
-    def __init__(self, output_dir: Path) -> None:
+    """Render the recap plots into ``output_dir``.
+
+    :meth:`create_all` skips figures whose inputs are unchanged: each plot is
+    keyed by a hash of its input frame, the plot parameters, the source of
+    its plot method, the gpt_recap version, the active matplotlib theme and
+    ``PLOT_DPI``. A PNG is reused when ``output_dir``
+    already holds it under the same key (tracked in ``.plot_cache.json``) or
+    when the optional shared ``cache_dir`` has a ``<key>.png``. Hits and
+    misses are recorded in :attr:`cache_stats`.
+    """
+
+    def __init__(self, output_dir: Path, cache_dir: Path | None = None, use_cache: bool = True) -> None:
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
-        configure_visuals()
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.use_cache = use_cache
+        self.cache_stats: Dict[str, List[str]] = {"output_hits": [], "shared_hits": [], "misses": []}
+        _ensure_visuals()
+
+    def create_all(
+        self, result: AnalysisResult, workers: int | None = None, profiler: Profiler | None = None
+    ) -> Dict[str, Path]:
+        """Render every recap plot; returns ``{filename: path}``.
+
+        With ``workers`` greater than one the independent plots are rendered
+        concurrently in a process pool (Agg backend, theme applied once per
+        worker). ``profiler`` records one stage per plot, or a single
+        ``plot_pool`` stage when rendering in parallel.
+        """
+        profiler = profiler or Profiler()
+        jobs = self._plot_jobs(result)
+        manifest = self._read_manifest() if self.use_cache else {}
+        theme = _theme_fingerprint()
 
-    def create_all(self, result: AnalysisResult) -> Dict[str, Path]:
         paths: Dict[str, Path] = {}
-        paths["messages_per_month_by_role.png"] = self.messages_per_month_by_role(
-            result.monthly_message_counts_by_role
-        )
-        paths["conversation_depth_mix.png"] = self.conversation_depth_mix(result.conversation_categories)
-        paths["assistant_reply_length_trend_words.png"] = self.assistant_reply_length_trend(
-            result.assistant_daily_lengths, unit="words"
-        )
-        paths["assistant_reply_length_trend_characters.png"] = self.assistant_reply_length_trend(
-            result.assistant_daily_lengths, unit="characters"
-        )
-        paths["messages_weekday_hour_heatmap.png"] = self.weekday_hour_heatmap(result.weekday_hour_counts)
-        paths["messages_cumulative.png"] = self.cumulative_messages(result.cumulative_message_counts)
-        paths["assistant_reply_length_words_hist.png"] = self.assistant_reply_length_distribution(
-            result.assistant_responses, unit="words"
-        )
-        paths["assistant_reply_length_characters_hist.png"] = self.assistant_reply_length_distribution(
-            result.assistant_responses, unit="characters"
-        )
-        return paths
+        keys: Dict[str, str] = {}
+        todo = []
+        for name, method, df, kwargs in jobs:
+            key = keys[name] = _plot_key(method, df, kwargs, theme, _method_source(type(self), method))
+            cached = self._reuse(name, key, manifest) if self.use_cache else None
+            if cached is None:
+                self.cache_stats["misses"].append(name)
+                todo.append((name, method, df, kwargs))
+            else:
+                paths[name] = cached
+
+        if workers is None or workers <= 1 or len(todo) <= 1:
+            rendered = {}
+            for name, method, df, kwargs in todo:
+                with profiler.stage(f"plot:{name}", rows=len(df)):
+                    rendered[name] = getattr(self, method)(df, **kwargs)
+        else:
+            with profiler.stage("plot_pool", rows=len(todo)), ProcessPoolExecutor(max_workers=min(workers, len(todo)), initializer=_init_plot_worker) as pool:
+                futures = {
+                    name: pool.submit(_render_plot, type(self), self.output_dir, method, df, kwargs)
+                    for name, method, df, kwargs in todo
+                }
+                rendered = {name: future.result() for name, future in futures.items()}
+
+        for name, path in rendered.items():
+            manifest[name] = keys[name]
+            if self.cache_dir is not None:
+                self._store_shared(path, keys[name])
+        if self.use_cache:
+            self._write_manifest(manifest)
+
+        paths.update(rendered)
+        return {name: paths[name] for name, _, _, _ in jobs}
+
+    def _reuse(self, name: str, key: str, manifest: Dict[str, str]) -> Path | None:
+        path = self.output_dir / name
+        if manifest.get(name) == key and path.exists():
+            self.cache_stats["output_hits"].append(name)
+            return path
+        if self.cache_dir is not None:
+            shared = self.cache_dir / f"{key}.png"
+            if shared.exists():
+                shutil.copyfile(shared, path)
+                manifest[name] = key
+                self.cache_stats["shared_hits"].append(name)
+                return path
+        return None
+
+    def _store_shared(self, path: Path, key: str) -> None:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        target = self.cache_dir / f"{key}.png"
+        if not target.exists():
+            tmp = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+            shutil.copyfile(path, tmp)
+            os.replace(tmp, target)
+
+    def _read_manifest(self) -> Dict[str, str]:
+        try:
+            return json.loads((self.output_dir / PLOT_MANIFEST).read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _write_manifest(self, manifest: Dict[str, str]) -> None:
+        (self.output_dir / PLOT_MANIFEST).write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding="utf-8")
+
+    @staticmethod
+    def _plot_jobs(result: AnalysisResult) -> List[Tuple[str, str, pd.DataFrame, Dict[str, Any]]]:
+        # Only the length columns are needed for the histograms; this keeps the
+        # payload shipped to plot workers small.
+        responses = result.assistant_responses[["word_count", "char_count"]]
+        return [
+            ("messages_per_month_by_role.png", "messages_per_month_by_role", result.monthly_message_counts_by_role, {}),
+            ("conversation_depth_mix.png", "conversation_depth_mix", result.conversation_categories, {}),
+            (
+                "assistant_reply_length_trend_words.png",
+                "assistant_reply_length_trend",
+                result.assistant_daily_lengths,
+                {"unit": "words"},
+            ),
+            (
+                "assistant_reply_length_trend_characters.png",
+                "assistant_reply_length_trend",
+                result.assistant_daily_lengths,
+                {"unit": "characters"},
+            ),
+            ("messages_weekday_hour_heatmap.png", "weekday_hour_heatmap", result.weekday_hour_counts, {}),
+            ("messages_cumulative.png", "cumulative_messages", result.cumulative_message_counts, {}),
+            (
+                "assistant_reply_length_words_hist.png",
+                "assistant_reply_length_distribution",
+                responses,
+                {"unit": "words"},
+            ),
+            (
+                "assistant_reply_length_characters_hist.png",
+                "assistant_reply_length_distribution",
+                responses,
+                {"unit": "characters"},
+            ),
+        ]
 
     def messages_per_month_by_role(self, df: pd.DataFrame) -> Path:
         fig, ax = plt.subplots(figsize=(12, 7))
@@ -89,7 +214,7 @@ class PlotBuilder:
             ax.legend(frameon=False)
         self._beautify_time_axis(ax)
         path = self.output_dir / "messages_per_month_by_role.png"
-        fig.savefig(path, dpi=220, bbox_inches="tight")
+        fig.savefig(path, dpi=PLOT_DPI, bbox_inches="tight")
         plt.close(fig)
         return path
 
@@ -106,11 +231,12 @@ class PlotBuilder:
             ax.set_ylabel("Conversations")
             ax.set_title("Conversation Depth Mix", fontsize=20, pad=16)
         path = self.output_dir / "conversation_depth_mix.png"
-        fig.savefig(path, dpi=220, bbox_inches="tight")
+        fig.savefig(path, dpi=PLOT_DPI, bbox_inches="tight")
         plt.close(fig)
         return path
 
     def assistant_reply_length_trend(self, df: pd.DataFrame, unit: str = "words") -> Path:
+        filename = f"assistant_reply_length_trend_{'words' if unit == 'words' else 'characters'}.png"
         fig, ax = plt.subplots(figsize=(12, 7))
         if df.empty:
             ax.text(0.5, 0.5, "No data", ha="center", va="center")
@@ -122,14 +248,12 @@ class PlotBuilder:
                 ax.plot(x, df["mean_word_count_roll_30"], color="#0ea5e9", linewidth=2.5, label="30-day mean")
                 ylabel = "Words per reply"
                 title = "Assistant Reply Length (Words)"
-                filename = "assistant_reply_length_trend_words.png"
             else:
                 ax.plot(x, df["mean_char_count"], color="#ff9f1c", alpha=0.4, linewidth=1, label="Daily mean")
                 ax.plot(x, df["mean_char_count_roll_7"], color="#f3722c", linewidth=2, label="7-day mean")
                 ax.plot(x, df["mean_char_count_roll_30"], color="#f94144", linewidth=2.5, label="30-day mean")
                 ylabel = "Characters per reply"
                 title = "Assistant Reply Length (Characters)"
-                filename = "assistant_reply_length_trend_characters.png"
 
             ax.set_title(title, fontsize=20, pad=16)
             ax.set_ylabel(ylabel)
@@ -138,7 +262,7 @@ class PlotBuilder:
             self._beautify_time_axis(ax)
 
         path = self.output_dir / filename
-        fig.savefig(path, dpi=220, bbox_inches="tight")
+        fig.savefig(path, dpi=PLOT_DPI, bbox_inches="tight")
         plt.close(fig)
         return path
 
@@ -160,7 +284,7 @@ class PlotBuilder:
             ax.set_xlabel("Hour")
             ax.set_ylabel("")
         path = self.output_dir / "messages_weekday_hour_heatmap.png"
-        fig.savefig(path, dpi=220, bbox_inches="tight")
+        fig.savefig(path, dpi=PLOT_DPI, bbox_inches="tight")
         plt.close(fig)
         return path
 
@@ -181,26 +305,24 @@ class PlotBuilder:
             ax.set_xlabel("Date")
             self._beautify_time_axis(ax)
         path = self.output_dir / "messages_cumulative.png"
-        fig.savefig(path, dpi=220, bbox_inches="tight")
+        fig.savefig(path, dpi=PLOT_DPI, bbox_inches="tight")
         plt.close(fig)
         return path
 
     def assistant_reply_length_distribution(self, df: pd.DataFrame, unit: str = "words") -> Path:
+        filename = f"assistant_reply_length_{'words' if unit == 'words' else 'characters'}_hist.png"
         fig, ax = plt.subplots(figsize=(10, 6))
         if df.empty:
             ax.text(0.5, 0.5, "No data", ha="center", va="center")
-            filename = "assistant_reply_length_words_hist.png"
         else:
             if unit == "words":
                 values = df["word_count"].clip(upper=2000)
                 color = "#64ffda"
                 xlabel = "Words"
-                filename = "assistant_reply_length_words_hist.png"
             else:
                 values = df["char_count"].clip(upper=12000)
                 color = "#f94144"
                 xlabel = "Characters"
-                filename = "assistant_reply_length_characters_hist.png"
 
             sns.histplot(values, bins=60, ax=ax, color=color, kde=False)
             ax.set_title(f"Assistant Reply Length Distribution ({unit.title()})", fontsize=18, pad=14)
@@ -208,7 +330,7 @@ class PlotBuilder:
             ax.set_ylabel("Responses")
 
         path = self.output_dir / filename
-        fig.savefig(path, dpi=220, bbox_inches="tight")
+        fig.savefig(path, dpi=PLOT_DPI, bbox_inches="tight")
         plt.close(fig)
         return path
 
@@ -218,4 +340,37 @@ class PlotBuilder:
         fig.autofmt_xdate()
 
 
+def _theme_fingerprint() -> str:
+    settings = sorted((key, repr(value)) for key, value in plt.rcParams.items() if not key.startswith("backend"))
+    return repr((__version__, matplotlib.__version__, sns.__version__, PLOT_DPI, settings))
+
+
+def _method_source(builder_cls: type, method: str) -> str:
+    # Editing a plot method (including in a development checkout, where the
+    # version does not change) must not reuse PNGs drawn by the old code.
+    try:
+        return inspect.getsource(getattr(builder_cls, method))
+    except (OSError, TypeError):
+        return ""
+
+
+def _plot_key(method: str, df: pd.DataFrame, kwargs: Dict[str, Any], theme: str, source: str = "") -> str:
+    digest = hashlib.sha256()
+    digest.update(repr((method, sorted(kwargs.items()), theme, source)).encode())
+    digest.update(repr((list(df.columns), [str(dtype) for dtype in df.dtypes])).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def _init_plot_worker() -> None:
+    plt.switch_backend("Agg")
+    _ensure_visuals()
+
+
+def _render_plot(
+    builder_cls: type, output_dir: Path, method: str, df: pd.DataFrame, kwargs: Dict[str, Any]
+) -> Path:
+    return getattr(builder_cls(output_dir), method)(df, **kwargs)
+
+
 __all__ = ["PlotBuilder", "configure_visuals"]
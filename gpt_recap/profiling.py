@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import json
+import sys
+import time
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+from typing import Any, Callable, ContextManager, Dict, Iterator, List
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+
+StageHook = Callable[[str], ContextManager[Any]]
+
+
+def _rusage() -> Dict[str, float]:
+    if resource is None:
+        return {}
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS.
+    scale = 1024**2 if sys.platform == "darwin" else 1024
+    return {
+        "peak_rss_mb": own.ru_maxrss / scale,
+        "children_cpu_seconds": children.ru_utime + children.ru_stime,
+    }
+
+
+class Profiler:
+    """Collect wall time, CPU time, peak RSS and row counts per pipeline stage.
+
+    Stages are entered with :meth:`stage` and may nest; each record names its
+    parent. ``hooks`` are callables taking the stage name and returning a
+    context manager that is entered around the stage, so callers can attach
+    their own timers or tracing spans::
+
+        profiler = Profiler(hooks=[lambda name: tracer.start_as_current_span(name)])
+
+    Peak RSS is the process-wide high-water mark when the stage ends; work
+    done in worker processes shows up in ``children_cpu_seconds``.
+    """
+
+    def __init__(self, hooks: List[StageHook] | None = None) -> None:
+        self.hooks: List[StageHook] = list(hooks or [])
+        self.records: List[Dict[str, Any]] = []
+        self._stack: List[str] = []
+        self._start = time.perf_counter()
+
+    def add_hook(self, hook: StageHook) -> None:
+        self.hooks.append(hook)
+
+    @contextmanager
+    def stage(self, name: str, rows: int | None = None) -> Iterator[Dict[str, Any]]:
+        """Profile the enclosed block; set ``record["rows"]`` on the yielded record if known later."""
+        record: Dict[str, Any] = {"stage": name, "parent": self._stack[-1] if self._stack else None, "rows": rows}
+        self.records.append(record)
+        self._stack.append(name)
+        before = _rusage()
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        try:
+            with ExitStack() as hooks:
+                for hook in self.hooks:
+                    hooks.enter_context(hook(name))
+                yield record
+        finally:
+            record["wall_seconds"] = time.perf_counter() - wall
+            record["cpu_seconds"] = time.process_time() - cpu
+            after = _rusage()
+            if after:
+                record["children_cpu_seconds"] = after["children_cpu_seconds"] - before["children_cpu_seconds"]
+                record["peak_rss_mb"] = after["peak_rss_mb"]
+            self._stack.pop()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"total_wall_seconds": time.perf_counter() - self._start, "stages": self.records}
+
+    def write(self, path: str | Path, **extra: Any) -> Path:
+        path = Path(path)
+        with path.open("w", encoding="utf-8") as fh:
+            json.dump({**extra, **self.to_dict()}, fh, indent=2)
+        return path
+
+
+__all__ = ["Profiler", "StageHook"]
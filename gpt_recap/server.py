@@ -0,0 +1,325 @@
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import json
+import math
+import threading
+import traceback
+from collections import OrderedDict
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, List, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+import pandas as pd
+
+from .analysis import AnalysisResult, summarise
+from .batch import discover_exports, output_names
+from .data import flatten_messages, load_conversations
+
+
+TABLE_NAMES = [field.name for field in dataclasses.fields(AnalysisResult) if field.name != "metrics"]
+
+
+class LRUCache:
+    """Thread-safe mapping that keeps the ``max_size`` most recently used entries.
+
+    :meth:`get_or_compute` computes a missing value at most once even when
+    several threads ask for the same key concurrently.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self._entries: OrderedDict[Hashable, Any] = OrderedDict()
+        self._lock = threading.Lock()
+        self._pending: Dict[Hashable, threading.Lock] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _lookup(self, key: Hashable) -> Tuple[bool, Any]:
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, self._entries[key]
+            return False, None
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        # The lookup and taking the key lock share one critical section, and
+        # so do publishing the value and retiring the key lock below: a key
+        # is always either cached or pending, never briefly neither.
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            key_lock = self._pending.setdefault(key, threading.Lock())
+        with key_lock:
+            found, value = self._lookup(key)
+            if found:
+                return value
+            try:
+                value = compute()
+            except BaseException:
+                with self._lock:
+                    self._pending.pop(key, None)
+                raise
+            with self._lock:
+                self.misses += 1
+                self._entries[key] = value
+                self._pending.pop(key, None)
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+        return value
+
+
+class RecapService:
+    """Exports kept resident as message frames, with cached analysis results.
+
+    Exports are registered by name and flattened on first use. A changed
+    file (size or mtime) is re-read on the next request. Analysis results
+    and serialised responses are cached in LRUs keyed by export fingerprint
+    and query parameters. Cached results hold an empty ``messages`` table so
+    that only the ``max_exports`` frames stay resident; views that need the
+    rows read them from the frame cache.
+    """
+
+    def __init__(
+        self,
+        exports: Dict[str, Path],
+        max_exports: int = 4,
+        max_results: int = 16,
+        max_responses: int = 256,
+        text: str = "drop",
+    ) -> None:
+        self.exports = exports
+        self.text = text
+        self.messages = LRUCache(max_exports)
+        self.results = LRUCache(max_results)
+        self.responses = LRUCache(max_responses)
+
+    def _fingerprint(self, name: str) -> Tuple[str, int, int]:
+        path = self.exports[name]
+        stat = path.stat()
+        return name, stat.st_size, stat.st_mtime_ns
+
+    def _messages(self, fingerprint: Tuple[str, int, int]) -> pd.DataFrame:
+        path = self.exports[fingerprint[0]]
+        return self.messages.get_or_compute(
+            fingerprint, lambda: flatten_messages(load_conversations(path), text=self.text)
+        )
+
+    def result(self, name: str, relative_accuracy: float | None = None) -> AnalysisResult:
+        return self._result(self._fingerprint(name), relative_accuracy)
+
+    def _result(self, fingerprint: Tuple[str, int, int], relative_accuracy: float | None) -> AnalysisResult:
+        def compute() -> AnalysisResult:
+            result = summarise(self._messages(fingerprint), relative_accuracy=relative_accuracy)
+            # A copy, not a slice: a slice would keep the frame's arrays alive.
+            return dataclasses.replace(result, messages=result.messages.head(0).copy())
+
+        return self.results.get_or_compute((fingerprint, relative_accuracy), compute)
+
+    def response(self, name: str, view: str, params: Dict[str, Any]) -> bytes:
+        """JSON body for ``view`` (``metrics``, ``context``, ``charts``, ``bundle``, ``tables`` or ``table:<name>``)."""
+        fingerprint = self._fingerprint(name)
+        key = (fingerprint, view, tuple(sorted(params.items())))
+        return self.responses.get_or_compute(key, lambda: self._render(fingerprint, view, params))
+
+    def _render(self, fingerprint: Tuple[str, int, int], view: str, params: Dict[str, Any]) -> bytes:
+        result = self._result(fingerprint, params.get("quantile_accuracy"))
+        if view == "metrics":
+            payload: Any = _plain(result.metrics)
+        elif view == "context":
+            from .story import build_context
+
+            payload = _plain(build_context(result))
+        elif view == "charts":
+            from .charts import build_chart_data
+
+            payload = build_chart_data(result)
+        elif view == "bundle":
+            from .bundle import build_bundle
+
+            payload = build_bundle(dataclasses.replace(result, messages=self._messages(fingerprint)))
+        elif view == "tables":
+            payload = {table: len(self._table(fingerprint, result, table)) for table in TABLE_NAMES}
+        else:
+            frame = self._table(fingerprint, result, view.split(":", 1)[1])
+            offset = params.get("offset", 0)
+            limit = params.get("limit")
+            rows = frame.iloc[offset : None if limit is None else offset + limit]
+            body = rows.to_json(orient="records", date_format="iso", default_handler=str)
+            return f'{{"total":{len(frame)},"offset":{offset},"rows":{body}}}'.encode()
+        return json.dumps(payload).encode()
+
+    def _table(self, fingerprint: Tuple[str, int, int], result: AnalysisResult, table: str) -> pd.DataFrame:
+        return self._messages(fingerprint) if table == "messages" else getattr(result, table)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            cache: {"entries": len(lru), "max_size": lru.max_size, "hits": lru.hits, "misses": lru.misses}
+            for cache, lru in (("messages", self.messages), ("results", self.results), ("responses", self.responses))
+        }
+
+
+def _plain(obj: Any) -> Any:
+    """Convert pandas/numpy scalars to JSON-safe values (NaN/NaT become null)."""
+    if isinstance(obj, dict):
+        return {str(k): _plain(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_plain(v) for v in obj]
+    if isinstance(obj, np.generic):
+        obj = obj.item()
+    if obj is pd.NaT:
+        return None
+    if isinstance(obj, pd.Timestamp):
+        return obj.isoformat()
+    if isinstance(obj, float) and not math.isfinite(obj):
+        return None
+    return obj
+
+
+class RecapRequestHandler(BaseHTTPRequestHandler):
+    """Routes::
+
+        GET /exports
+        GET /exports/<name>/metrics
+        GET /exports/<name>/context
+        GET /exports/<name>/charts
+        GET /exports/<name>/bundle
+        GET /exports/<name>/tables
+        GET /exports/<name>/tables/<table>?offset=0&limit=100
+        GET /stats
+
+    Every export route accepts ``quantile_accuracy`` (see ``--quantile-accuracy``).
+    """
+
+    service: RecapService
+    server_version = "gpt-recap"
+
+    def do_GET(self) -> None:  # noqa: N802 - http.server naming
+        url = urlsplit(self.path)
+        parts = [part for part in url.path.split("/") if part]
+        try:
+            params = _parse_params(parse_qs(url.query))
+            if parts == ["exports"]:
+                self._send(json.dumps(sorted(self.service.exports)).encode())
+            elif parts == ["stats"]:
+                self._send(json.dumps(self.service.stats()).encode())
+            elif len(parts) >= 3 and parts[0] == "exports":
+                view = _view(parts[2:])
+                if view is None or parts[1] not in self.service.exports:
+                    self._error(HTTPStatus.NOT_FOUND, f"Unknown export or table: {url.path}")
+                else:
+                    self._send(self.service.response(parts[1], view, params))
+            else:
+                self._error(HTTPStatus.NOT_FOUND, f"Unknown route {url.path}")
+        except ValueError as exc:
+            self._error(HTTPStatus.BAD_REQUEST, str(exc))
+        except OSError as exc:
+            self._error(HTTPStatus.SERVICE_UNAVAILABLE, f"Cannot read export: {exc}")
+        except Exception as exc:  # noqa: BLE001 - answer in JSON rather than dropping the connection
+            self.log_error("Error serving %s:\n%s", self.path, traceback.format_exc())
+            self._error(HTTPStatus.INTERNAL_SERVER_ERROR, f"{type(exc).__name__}: {exc}")
+
+    def _send(self, body: bytes, status: HTTPStatus = HTTPStatus.OK) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _error(self, status: HTTPStatus, message: str) -> None:
+        self._send(json.dumps({"error": message}).encode(), status)
+
+
+def _view(parts: List[str]) -> str | None:
+    if parts in (["metrics"], ["context"], ["charts"], ["bundle"], ["tables"]):
+        return parts[0]
+    if len(parts) == 2 and parts[0] == "tables" and parts[1] in TABLE_NAMES:
+        return f"table:{parts[1]}"
+    return None
+
+
+def _parse_params(query: Dict[str, List[str]]) -> Dict[str, Any]:
+    params: Dict[str, Any] = {}
+    try:
+        if "offset" in query:
+            params["offset"] = max(0, int(query["offset"][0]))
+        if "limit" in query:
+            params["limit"] = max(0, int(query["limit"][0]))
+        if "quantile_accuracy" in query:
+            params["quantile_accuracy"] = float(query["quantile_accuracy"][0])
+    except ValueError:
+        raise ValueError("offset/limit must be integers and quantile_accuracy a number") from None
+    accuracy = params.get("quantile_accuracy")
+    if accuracy is not None and not 0 < accuracy < 1:
+        raise ValueError("quantile_accuracy must be between 0 and 1")
+    return params
+
+
+def make_server(service: RecapService, host: str = "127.0.0.1", port: int = 8765) -> ThreadingHTTPServer:
+    handler = type("BoundRecapRequestHandler", (RecapRequestHandler,), {"service": service})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="gpt-recap serve",
+        description="Serve recap metrics and tables for one or more exports over HTTP (JSON)",
+    )
+    parser.add_argument(
+        "sources",
+        nargs="+",
+        help="conversations.json files, or directories/manifests as accepted by `gpt-recap batch`",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--max-exports", type=int, default=4, help="Message frames kept in memory")
+    parser.add_argument("--max-results", type=int, default=16, help="Analysis results kept in memory")
+    parser.add_argument(
+        "--keep-text",
+        action="store_true",
+        help="Keep message bodies in the resident frames (served in the messages table)",
+    )
+    parser.add_argument("--preload", action="store_true", help="Analyse every export before serving")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    paths: List[Path] = []
+    for source in args.sources:
+        path = Path(source)
+        paths.extend([path] if path.suffix == ".json" and path.is_file() else discover_exports(path))
+    if not paths:
+        raise SystemExit("No exports found")
+
+    service = RecapService(
+        dict(zip(output_names(paths), paths)),
+        max_exports=args.max_exports,
+        max_results=args.max_results,
+        text="keep" if args.keep_text else "drop",
+    )
+    if args.preload:
+        for name in service.exports:
+            service.result(name)
+
+    server = make_server(service, args.host, args.port)
+    print(f"Serving {len(service.exports)} export(s) on http://{args.host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+__all__ = ["LRUCache", "RecapService", "make_server", "main"]
@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import math
+from typing import Dict
+
+import numpy as np
+
+
+DEFAULT_RELATIVE_ACCURACY = 0.01
+DEFAULT_MAX_BUCKETS = 2048
+
+
+class _BucketStore:
+    """Dense counts for a contiguous range of logarithmic bucket indexes."""
+
+    def __init__(self) -> None:
+        self.offset = 0
+        self.counts = np.zeros(0, dtype="int64")
+
+    @property
+    def total(self) -> int:
+        return int(self.counts.sum())
+
+    def add(self, indexes: np.ndarray, weights: np.ndarray | None = None) -> None:
+        if not len(indexes):
+            return
+        low = int(indexes.min())
+        high = int(indexes.max())
+        self._extend(low, high)
+        self.counts += np.bincount(
+            indexes - self.offset, weights=weights, minlength=len(self.counts)
+        ).astype("int64")
+
+    def _extend(self, low: int, high: int) -> None:
+        if not len(self.counts):
+            self.offset = low
+            self.counts = np.zeros(high - low + 1, dtype="int64")
+            return
+        new_low = min(low, self.offset)
+        new_high = max(high, self.offset + len(self.counts) - 1)
+        if new_low == self.offset and new_high == self.offset + len(self.counts) - 1:
+            return
+        counts = np.zeros(new_high - new_low + 1, dtype="int64")
+        start = self.offset - new_low
+        counts[start : start + len(self.counts)] = self.counts
+        self.offset = new_low
+        self.counts = counts
+
+    def collapse_lowest(self, max_buckets: int) -> None:
+        """Fold the lowest buckets into one so at most ``max_buckets`` remain."""
+        nonzero = np.flatnonzero(self.counts)
+        if not len(nonzero):
+            return
+        self.counts = self.counts[nonzero[0] : nonzero[-1] + 1]
+        self.offset += int(nonzero[0])
+        excess = len(self.counts) - max_buckets
+        if excess > 0:
+            self.counts[excess] += self.counts[:excess].sum()
+            self.counts = self.counts[excess:]
+            self.offset += excess
+
+    def merge(self, other: "_BucketStore") -> None:
+        if not len(other.counts):
+            return
+        self._extend(other.offset, other.offset + len(other.counts) - 1)
+        start = other.offset - self.offset
+        self.counts[start : start + len(other.counts)] += other.counts
+
+
+class QuantileSketch:
+    """Streaming, mergeable quantile sketch with relative-error guarantees.
+
+    Values are counted in logarithmically sized buckets (the DDSketch
+    scheme): a bucket ``i`` covers ``(gamma**(i-1), gamma**i]`` with
+    ``gamma = (1 + alpha) / (1 - alpha)``. Any quantile estimate is within
+    ``alpha * |v|`` of ``v``, the exact order statistic at rank
+    ``floor(q * (count - 1))``, as long as no buckets had to be collapsed.
+    Memory is bounded by ``max_buckets`` per sign (about 1,000 buckets cover
+    1 to 10**9 at ``alpha = 0.01``). Once that limit is hit, the smallest
+    magnitudes are merged first, which only degrades the low quantiles.
+
+    ``count``, ``min``, ``max`` and the sum used for ``mean`` are tracked exactly.
+    """
+
+    def __init__(
+        self,
+        relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY,
+        max_buckets: int = DEFAULT_MAX_BUCKETS,
+    ) -> None:
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.positive = _BucketStore()
+        self.negative = _BucketStore()
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def _index(self, magnitudes: np.ndarray) -> np.ndarray:
+        return np.ceil(np.log(magnitudes) / self._log_gamma).astype("int64")
+
+    def _value(self, index: int) -> float:
+        return 2.0 * self.gamma**index / (self.gamma + 1)
+
+    def add(self, values: np.ndarray | list, weights: np.ndarray | None = None) -> "QuantileSketch":
+        """Add a batch of values (optionally with integer ``weights``); NaNs are ignored."""
+        values = np.asarray(values, dtype="float64")
+        keep = ~np.isnan(values)
+        if weights is not None:
+            weights = np.asarray(weights, dtype="int64")
+            keep &= weights > 0
+        if not keep.all():
+            values = values[keep]
+            weights = weights[keep] if weights is not None else None
+        if not len(values):
+            return self
+
+        self.count += len(values) if weights is None else int(weights.sum())
+        self.sum += float(values.sum() if weights is None else (values * weights).sum())
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+
+        for store, mask, sign in ((self.positive, values > 0, 1.0), (self.negative, values < 0, -1.0)):
+            if mask.any():
+                store.add(self._index(sign * values[mask]), None if weights is None else weights[mask])
+            store.collapse_lowest(self.max_buckets)
+        zero = values == 0
+        self.zero_count += int(zero.sum() if weights is None else weights[zero].sum())
+        return self
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        if other.gamma != self.gamma:
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        self.positive.merge(other.positive)
+        self.negative.merge(other.negative)
+        self.positive.collapse_lowest(self.max_buckets)
+        self.negative.collapse_lowest(self.max_buckets)
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def quantile(self, q: float) -> float:
+        if not self.count:
+            return float("nan")
+        rank = math.floor(q * (self.count - 1))
+
+        negative_total = self.negative.total
+        if rank < negative_total:
+            # Negative buckets are ordered by magnitude, so walk them backwards.
+            cumulative = np.cumsum(self.negative.counts[::-1])
+            position = int(np.searchsorted(cumulative, rank, side="right"))
+            index = self.negative.offset + len(self.negative.counts) - 1 - position
+            estimate = -self._value(index)
+        elif rank < negative_total + self.zero_count:
+            estimate = 0.0
+        else:
+            cumulative = np.cumsum(self.positive.counts)
+            position = int(np.searchsorted(cumulative, rank - negative_total - self.zero_count, side="right"))
+            estimate = self._value(self.positive.offset + position)
+        return min(max(estimate, self.min), self.max)
+
+    def describe(self) -> Dict[str, float]:
+        """Summary in the same shape as :func:`gpt_recap.analysis.describe_series`."""
+        if not self.count:
+            return {"count": 0, "min": np.nan, "mean": np.nan, "median": np.nan, "p90": np.nan, "max": np.nan}
+        return {
+            "count": self.count,
+            "min": float(self.min),
+            "mean": self.sum / self.count,
+            "median": self.quantile(0.5),
+            "p90": self.quantile(0.9),
+            "max": float(self.max),
+        }
+
+
+__all__ = ["QuantileSketch"]
@@ -1,11 +1,11 @@
 from __future__ import annotations
 
+import json
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Any, Dict, List, Tuple
 
 import numpy as np
 import pandas as pd
-from jinja2 import Template
 
 from .analysis import AnalysisResult
 
@@ -203,11 +203,27 @@ def build_context(result: AnalysisResult) -> Dict[str, str]:
     }
 
 
-def render_story(result: AnalysisResult, plot_paths: Dict[str, Path], output_dir: Path) -> Path:
+def render_story(
+    result: AnalysisResult,
+    plot_paths: Dict[str, Path],
+    output_dir: Path,
+    charts: Dict[str, Dict[str, Any]] | None = None,
+) -> Path:
+    """Write ``gpt_recap.html``.
+
+    Slides show the PNG from ``plot_paths`` when there is one, otherwise the
+    matching Chart.js config from ``charts`` (see
+    :func:`gpt_recap.charts.build_chart_data`), drawn in the browser.
+    """
+    from jinja2 import Template
+
     context = build_context(result)
     plot_names = {name: path.name for name, path in plot_paths.items()}
+    charts = charts or {}
+    # Embedded in a <script> block, so "</" must not close it early.
+    charts_json = json.dumps(charts, separators=(",", ":")).replace("</", "<\\/")
     template = Template(_HTML_TEMPLATE, autoescape=True)
-    html = template.render(context=context, plots=plot_names)
+    html = template.render(context=context, plots=plot_names, charts=charts, charts_json=charts_json)
     output_dir = Path(output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
     html_path = output_dir / "gpt_recap.html"
@@ -369,6 +385,15 @@ _HTML_TEMPLATE = """
         border: 1px solid rgba(148, 163, 184, 0.35);
         box-shadow: 0 18px 48px rgba(8, 7, 13, 0.55);
       }
+      .media canvas {
+        width: 100%;
+        padding: 10px;
+        box-sizing: border-box;
+        border-radius: 18px;
+        background: #12122a;
+        border: 1px solid rgba(148, 163, 184, 0.35);
+        box-shadow: 0 18px 48px rgba(8, 7, 13, 0.55);
+      }
       footer {
         font-size: 0.8rem;
         letter-spacing: 0.08em;
@@ -430,9 +455,15 @@ _HTML_TEMPLATE = """
                 <span class="label">Longest streak — {{ context.longest_streak_range }}</span>
               </div>
             </div>
+            {% if plots.get('assistant_reply_length_words_hist.png') %}
             <div class="media">
               <img src="{{ plots['assistant_reply_length_words_hist.png'] }}" alt="Reply length distribution" />
             </div>
+            {% elif charts.get('assistant_reply_length_words_hist') %}
+            <div class="media">
+              <canvas data-chart="assistant_reply_length_words_hist" role="img" aria-label="Reply length distribution"></canvas>
+            </div>
+            {% endif %}
             <footer>Swipe or tap → to keep the vibe</footer>
           </div>
         </div>
@@ -466,9 +497,15 @@ _HTML_TEMPLATE = """
                 <span class="label">Biggest convo: “{{ context.top_conversation_title }}”</span>
               </div>
             </div>
+            {% if plots.get('messages_per_month_by_role.png') %}
             <div class="media">
               <img src="{{ plots['messages_per_month_by_role.png'] }}" alt="Messages per month by role" />
             </div>
+            {% elif charts.get('messages_per_month_by_role') %}
+            <div class="media">
+              <canvas data-chart="messages_per_month_by_role" role="img" aria-label="Messages per month by role"></canvas>
+            </div>
+            {% endif %}
             <footer>Tag the teammate who owes the next prompt</footer>
           </div>
         </div>
@@ -494,9 +531,15 @@ _HTML_TEMPLATE = """
                 <span class="label">Wordiest month — {{ context.assistant_peak_label }}</span>
               </div>
             </div>
+            {% if plots.get('messages_cumulative.png') %}
             <div class="media">
               <img src="{{ plots['messages_cumulative.png'] }}" alt="Cumulative messages" />
             </div>
+            {% elif charts.get('messages_cumulative') %}
+            <div class="media">
+              <canvas data-chart="messages_cumulative" role="img" aria-label="Cumulative messages"></canvas>
+            </div>
+            {% endif %}
             <footer>Proof you stayed building.</footer>
           </div>
         </div>
@@ -513,9 +556,15 @@ _HTML_TEMPLATE = """
                 Last 30-day average sits at {{ context.latest_word_avg }} words / {{ context.latest_char_avg }} characters.
               </p>
             </header>
+            {% if plots.get('assistant_reply_length_trend_words.png') %}
             <div class="media">
               <img src="{{ plots['assistant_reply_length_trend_words.png'] }}" alt="Assistant reply length trend" />
             </div>
+            {% elif charts.get('assistant_reply_length_trend_words') %}
+            <div class="media">
+              <canvas data-chart="assistant_reply_length_trend_words" role="img" aria-label="Assistant reply length trend"></canvas>
+            </div>
+            {% endif %}
             <footer>Keep the bars flowing.</footer>
           </div>
         </div>
@@ -532,9 +581,15 @@ _HTML_TEMPLATE = """
                 Screenshot + share to show your grind.
               </p>
             </header>
+            {% if plots.get('messages_weekday_hour_heatmap.png') %}
             <div class="media">
               <img src="{{ plots['messages_weekday_hour_heatmap.png'] }}" alt="Weekday-hour heatmap" />
             </div>
+            {% elif charts.get('messages_weekday_hour_heatmap') %}
+            <div class="media">
+              <canvas data-chart="messages_weekday_hour_heatmap" role="img" aria-label="Weekday-hour heatmap"></canvas>
+            </div>
+            {% endif %}
             <footer>Last update: {{ context.latest_date_label }}</footer>
           </div>
         </div>
@@ -584,6 +639,20 @@ _HTML_TEMPLATE = """
         frame.addEventListener('click', () => showSlide(idx + 1));
       });
     </script>
+    {% if charts %}
+    <script src="https://cdn.jsdelivr.net/npm/chart.js@4.4.6/dist/chart.umd.min.js"></script>
+    <script id="chart-data" type="application/json">{{ charts_json|safe }}</script>
+    <script>
+      if (window.Chart) {
+        Chart.defaults.color = '#e2e8f0';
+        Chart.defaults.borderColor = 'rgba(148, 163, 184, 0.2)';
+        const chartData = JSON.parse(document.getElementById('chart-data').textContent);
+        document.querySelectorAll('canvas[data-chart]').forEach((canvas) => {
+          new Chart(canvas, chartData[canvas.dataset.chart]);
+        });
+      }
+    </script>
+    {% endif %}
   </body>
 </html>
 """
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import mmap
+import os
+import pickle
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+
+TEXTS_NAME = "texts.bin"
+INDEX_NAME = "index.pkl"
+SOURCE_NAME = "source.txt"
+
+
+class TextStore:
+    """Message bodies kept on disk, addressed by message id.
+
+    Texts are appended UTF-8 encoded to ``texts.bin`` and located through an
+    ``id -> (offset, length)`` index written to ``index.pkl`` on
+    :meth:`close`. Readers memory-map the data file, so looking a message up
+    only touches the pages holding its text. Messages without an id cannot be
+    addressed and are not stored.
+
+    Open with ``mode="w"`` to (re)create a store and ``mode="r"`` to read one.
+    A writer may label the store with ``source`` (e.g. the cache key of the
+    table whose texts it holds); see :func:`store_source`.
+    """
+
+    def __init__(self, path: str | Path, mode: str = "r", source: str | None = None) -> None:
+        if mode not in ("r", "w"):
+            raise ValueError("mode must be 'r' or 'w'")
+        self.path = Path(path)
+        self.mode = mode
+        self._index: Dict[Any, Tuple[int, int]] = {}
+        self._fh: Optional[BinaryIO] = None
+        self._map: Optional[mmap.mmap] = None
+        self._offset = 0
+        self.source = source
+        if mode == "w":
+            self.path.mkdir(parents=True, exist_ok=True)
+            # Unlabelled until close() has written a complete store.
+            (self.path / SOURCE_NAME).unlink(missing_ok=True)
+            self._fh = (self.path / TEXTS_NAME).open("wb")
+        else:
+            with (self.path / INDEX_NAME).open("rb") as fh:
+                self._index = pickle.load(fh)
+
+    def __enter__(self) -> "TextStore":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, message_id: Any) -> bool:
+        return message_id in self._index
+
+    def add(self, message_id: Any, text: str) -> None:
+        if self._fh is None:
+            raise ValueError("TextStore is not open for writing")
+        if message_id is None:
+            return
+        data = text.encode("utf-8")
+        self._fh.write(data)
+        self._index[message_id] = (self._offset, len(data))
+        self._offset += len(data)
+
+    def extend(self, message_ids: Iterable[Any], texts: Iterable[str]) -> None:
+        for message_id, text in zip(message_ids, texts):
+            self.add(message_id, text)
+
+    def get(self, message_id: Any, default: Optional[str] = None) -> Optional[str]:
+        location = self._index.get(message_id)
+        if location is None:
+            return default
+        offset, length = location
+        if not length:
+            return ""
+        return self._mapped()[offset : offset + length].decode("utf-8")
+
+    def texts(self, message_ids: Iterable[Any]) -> List[Optional[str]]:
+        """Texts for ``message_ids`` in order (``None`` for unknown ids)."""
+        return [self.get(message_id) for message_id in message_ids]
+
+    def _mapped(self) -> mmap.mmap:
+        if self._map is None:
+            if self._fh is not None:
+                self._fh.flush()
+            with (self.path / TEXTS_NAME).open("rb") as fh:
+                self._map = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._map
+
+    def close(self) -> None:
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+            tmp = self.path / f"{INDEX_NAME}.{os.getpid()}.tmp"
+            with tmp.open("wb") as fh:
+                pickle.dump(self._index, fh, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self.path / INDEX_NAME)
+            if self.source is not None:
+                (self.path / SOURCE_NAME).write_text(self.source, encoding="utf-8")
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+
+def store_source(path: str | Path) -> str | None:
+    """The ``source`` label of the store at ``path``, or ``None`` if it has none."""
+    try:
+        return (Path(path) / SOURCE_NAME).read_text(encoding="utf-8")
+    except FileNotFoundError:
+        return None
+
+
+def spill_text(messages: pd.DataFrame, store: TextStore) -> pd.DataFrame:
+    """Write the ``text`` column of ``messages`` to ``store`` and drop it."""
+    if "text" not in messages:
+        return messages
+    store.extend(messages["message_id"], messages["text"])
+    return messages.drop(columns="text")
+
+
+__all__ = ["TextStore", "spill_text", "store_source"]
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+
+def message(
+    node_id: str,
+    role: str = "user",
+    create_time: float | None = 1_609_459_200.0,
+    text: str = "hello there",
+    content: Dict[str, Any] | None = None,
+) -> Dict[str, Any]:
+    """A mapping node holding one message."""
+    return {
+        "id": node_id,
+        "message": {
+            "id": node_id,
+            "author": {"role": role},
+            "create_time": create_time,
+            "content": content or {"content_type": "text", "parts": [text]},
+        },
+        "parent": None,
+        "children": [],
+    }
+
+
+def conversation(conv_id: str | None, nodes: List[Dict[str, Any]], title: str | None = "Chat") -> Dict[str, Any]:
+    times = [node["message"]["create_time"] for node in nodes if node["message"]["create_time"] is not None]
+    return {
+        "id": conv_id,
+        "title": title,
+        "create_time": min(times) if times else None,
+        "update_time": max(times) if times else None,
+        "mapping": {node["id"]: node for node in nodes},
+    }
+
+
+@pytest.fixture
+def write_export(tmp_path: Path):
+    def write(name: str, conversations: List[Dict[str, Any]]) -> Path:
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(conversations), encoding="utf-8")
+        return path
+
+    return write
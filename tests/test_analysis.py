@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+from conftest import conversation, message
+from gpt_recap.analysis import _conversation_parts, _finish_conversation_summary
+from gpt_recap.data import flatten_messages
+
+
+def _summarise_conversation(df: pd.DataFrame) -> pd.Series:
+    # The per-group implementation that _conversation_parts replaced, kept as
+    # the reference for the vectorised summary.
+    df = df.sort_values("create_time")
+    first_time = df["create_time"].min()
+    last_time = df["create_time"].max()
+    if pd.isna(first_time) or pd.isna(last_time):
+        duration_minutes = np.nan
+    else:
+        duration_minutes = (last_time - first_time).total_seconds() / 60.0
+
+    return pd.Series(
+        {
+            "first_time": first_time,
+            "last_time": last_time,
+            "duration_minutes": duration_minutes,
+            "messages": int(df.shape[0]),
+            "user_messages": int((df["role"] == "user").sum()),
+            "assistant_messages": int((df["role"] == "assistant").sum()),
+            "tool_messages": int((df["role"] == "tool").sum()),
+            "system_messages": int((df["role"] == "system").sum()),
+            "words_user": int(df.loc[df["role"] == "user", "word_count"].sum()),
+            "words_assistant": int(df.loc[df["role"] == "assistant", "word_count"].sum()),
+            "has_code": bool(df["has_code"].any()),
+            "has_multimodal": bool(df["is_multimodal"].any()),
+        }
+    )
+
+
+def _reference_summary(messages: pd.DataFrame) -> pd.DataFrame:
+    return (
+        messages.groupby(["conversation_index", "conversation_id", "conversation_title"], dropna=False)
+        .apply(_summarise_conversation)
+        .reset_index()
+    )
+
+
+@pytest.mark.filterwarnings("ignore:DataFrameGroupBy.apply operated on the grouping columns")
+def test_vectorised_conversation_summary_matches_per_group_reference():
+    t0 = 1_609_459_200.0
+    image = {"content_type": "multimodal_text", "parts": [{"content_type": "image_asset_pointer"}, "see this"]}
+    conversations = [
+        conversation(
+            "timed",
+            [
+                message("a1", create_time=t0, text="How do I sort a list?"),
+                message("a2", role="assistant", create_time=t0 + 90.5, text="Use ```sorted(items)``` here"),
+                message("a3", role="tool", create_time=t0 + 120, text="ran"),
+                message("a4", role="system", create_time=t0 + 1.25, text="be brief"),
+            ],
+        ),
+        conversation(
+            "untimed",
+            [
+                message("b1", create_time=None, text="no clock here"),
+                message("b2", role="assistant", create_time=None, text="nor here"),
+            ],
+        ),
+        conversation(
+            "partly-timed",
+            [
+                message("c1", create_time=t0 + 3600, content=image),
+                message("c2", role="assistant", create_time=None, text="an image"),
+            ],
+        ),
+        conversation(
+            "odd-roles",
+            [
+                message("d1", role="critic", create_time=t0 + 7200, text="this reply is too long"),
+                message("d2", role="assistant", create_time=t0 + 7260.123456, text="shorter"),
+            ],
+        ),
+        conversation(None, [message("e1", create_time=t0 + 86_400, text="no id")], title=None),
+        conversation(None, [message("f1", role="assistant", create_time=t0 + 90_000, text="also no id")]),
+    ]
+    messages = flatten_messages(conversations)
+
+    expected = _reference_summary(messages)
+    actual = _finish_conversation_summary(_conversation_parts(messages))
+
+    assert len(actual) == len(conversations)
+    assert_frame_equal(actual, expected)
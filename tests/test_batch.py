@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import json
+import multiprocessing
+import os
+
+import pytest
+
+from gpt_recap import batch, cli
+from gpt_recap.batch import SUMMARY_FILENAME, main
+
+from conftest import conversation, message
+
+JAN_2021 = 1_609_459_200.0
+JAN_2023 = 1_672_531_200.0
+
+
+def test_export_outside_window_fails_alone(tmp_path, write_export):
+    write_export("exports/inside.json", [conversation("a", [message("a1", create_time=JAN_2021)])])
+    write_export("exports/outside.json", [conversation("b", [message("b1", create_time=JAN_2023)])])
+    output = tmp_path / "recaps"
+
+    with pytest.raises(SystemExit) as excinfo:
+        main([str(tmp_path / "exports"), "--output", str(output), "--jobs", "1", "--year", "2021", "--metrics-only", "--no-cache"])
+
+    assert excinfo.value.code == 1
+    summary = json.loads((output / SUMMARY_FILENAME).read_text(encoding="utf-8"))
+    statuses = {record["input"].rsplit("/", 1)[-1]: record for record in summary["results"]}
+    assert statuses["inside.json"]["status"] == "ok"
+    assert statuses["outside.json"]["status"] == "error"
+    assert "EmptyWindowError" in statuses["outside.json"]["error"]
+
+
+def _run_or_crash(args):
+    if args.input.endswith("crash.json"):
+        os._exit(1)
+    return cli.run(args)
+
+
+@pytest.mark.skipif(multiprocessing.get_start_method() != "fork", reason="patches run() in forked workers")
+def test_crashed_worker_fails_only_its_export(tmp_path, write_export, monkeypatch):
+    for name in ("e1", "e2", "e3", "e4", "crash"):
+        write_export(f"exports/{name}.json", [conversation(name, [message(f"{name}-1", create_time=JAN_2021)])])
+    output = tmp_path / "recaps"
+    monkeypatch.setattr(batch, "run", _run_or_crash)
+
+    with pytest.raises(SystemExit) as excinfo:
+        main([str(tmp_path / "exports"), "--output", str(output), "--jobs", "5", "--metrics-only", "--no-cache"])
+
+    assert excinfo.value.code == 1
+    summary = json.loads((output / SUMMARY_FILENAME).read_text(encoding="utf-8"))
+    statuses = {record["input"].rsplit("/", 1)[-1]: record["status"] for record in summary["results"]}
+    assert statuses == {"e1.json": "ok", "e2.json": "ok", "e3.json": "ok", "e4.json": "ok", "crash.json": "error"}
+    assert summary["failed"] == 1
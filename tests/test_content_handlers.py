@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from multiprocessing import get_context
+
+import pytest
+
+from conftest import conversation, message
+from gpt_recap import data
+
+
+def _recipe_text(content):
+    return "recipe: " + content["title"]
+
+
+def _sticker_text(part):
+    return "sticker: " + part["name"]
+
+
+@pytest.fixture
+def custom_handlers():
+    content_handlers = dict(data._CONTENT_HANDLERS)
+    part_handlers = dict(data._PART_HANDLERS)
+    data.register_content_handler("recipe", _recipe_text)
+    data.register_part_handler("sticker", _sticker_text)
+    yield
+    data._CONTENT_HANDLERS.clear()
+    data._CONTENT_HANDLERS.update(content_handlers)
+    data._PART_HANDLERS.clear()
+    data._PART_HANDLERS.update(part_handlers)
+
+
+def test_spawned_workers_use_registered_handlers(custom_handlers):
+    conversations = [
+        conversation(
+            f"c{idx}",
+            [
+                message(f"r{idx}", content={"content_type": "recipe", "title": f"soup {idx}"}),
+                message(
+                    f"s{idx}",
+                    role="assistant",
+                    content={"content_type": "multimodal_text", "parts": [{"content_type": "sticker", "name": "cat"}]},
+                ),
+            ],
+        )
+        for idx in range(4)
+    ]
+    data.UNKNOWN_CONTENT_TYPES.clear()
+
+    messages = data.flatten_messages(conversations, workers=2, shard_size=1, mp_context=get_context("spawn"))
+
+    assert "recipe" not in data.UNKNOWN_CONTENT_TYPES
+    assert messages.loc[messages["role"] == "user", "text"].tolist() == [f"recipe: soup {idx}" for idx in range(4)]
+    assert set(messages.loc[messages["role"] == "assistant", "text"]) == {"sticker: cat"}
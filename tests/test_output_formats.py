@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import pandas as pd
+import pytest
+
+from gpt_recap.analysis import summarise
+from gpt_recap.cli import OUTPUT_FORMATS, _check_output_format, _write_tables
+from gpt_recap.data import flatten_messages
+
+from conftest import conversation, message
+
+
+@pytest.fixture(scope="module")
+def result():
+    conversations = [
+        conversation("a", [message("a1"), message("a2", role="assistant", create_time=1_609_459_260.0)]),
+        conversation("b", [message("b1", create_time=None)]),
+    ]
+    return summarise(flatten_messages(conversations))
+
+
+@pytest.mark.parametrize("fmt", sorted(OUTPUT_FORMATS))
+def test_compression_none_writes_readable_tables(tmp_path, result, fmt):
+    if fmt != "csv":
+        pytest.importorskip("pyarrow")
+    _check_output_format(fmt, "none")
+    _write_tables(result, tmp_path, fmt, "none")
+
+    path = tmp_path / f"messages_flat{OUTPUT_FORMATS[fmt]}"
+    assert path.exists()
+    frame = {"csv": pd.read_csv, "parquet": pd.read_parquet, "feather": pd.read_feather}[fmt](path)
+    assert len(frame) == len(result.messages)
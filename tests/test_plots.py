@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("matplotlib")
+
+from conftest import conversation, message
+from gpt_recap import plots
+from gpt_recap.analysis import summarise
+from gpt_recap.data import flatten_messages
+
+
+@pytest.fixture(scope="module")
+def result():
+    t0 = 1_609_459_200.0
+    conversations = [
+        conversation(
+            f"c{idx}",
+            [
+                message(f"u{idx}", create_time=t0 + idx * 86_400, text="what is a monad"),
+                message(f"a{idx}", role="assistant", create_time=t0 + idx * 86_400 + 60, text="a monoid " * (idx + 1)),
+            ],
+        )
+        for idx in range(5)
+    ]
+    return summarise(flatten_messages(conversations))
+
+
+def test_plot_cache_key_tracks_version_and_plot_code(result, tmp_path, monkeypatch):
+    builder = plots.PlotBuilder(tmp_path)
+    builder.create_all(result)
+    builder = plots.PlotBuilder(tmp_path)
+    builder.create_all(result)
+    assert not builder.cache_stats["misses"]
+
+    class EditedBuilder(plots.PlotBuilder):
+        def cumulative_messages(self, df):
+            return super().cumulative_messages(df)
+
+    builder = EditedBuilder(tmp_path)
+    builder.create_all(result)
+    assert builder.cache_stats["misses"] == ["messages_cumulative.png"]
+
+    monkeypatch.setattr(plots, "__version__", "0.0.0-other")
+    builder = plots.PlotBuilder(tmp_path)
+    builder.create_all(result)
+    assert len(builder.cache_stats["misses"]) == len(plots.PlotBuilder._plot_jobs(result))
+
+
+@pytest.mark.parametrize("method", ["assistant_reply_length_trend", "assistant_reply_length_distribution"])
+def test_empty_length_plots_keep_their_unit_filename(method, tmp_path):
+    builder = plots.PlotBuilder(tmp_path)
+    empty = pd.DataFrame({"word_count": [], "char_count": []})
+
+    words = getattr(builder, method)(empty, unit="words")
+    characters = getattr(builder, method)(empty, unit="characters")
+
+    assert "words" in words.name
+    assert "characters" in characters.name
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import gc
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+import weakref
+
+import pytest
+
+from conftest import conversation, message
+from gpt_recap.server import LRUCache, RecapService, make_server
+
+
+def _export(write_export, name, count):
+    conversations = [
+        conversation(f"c{idx}", [message(f"u{idx}"), message(f"a{idx}", role="assistant", create_time=1_609_459_260.0)])
+        for idx in range(count)
+    ]
+    return write_export(name, conversations)
+
+
+def test_evicted_frames_are_not_kept_alive_by_cached_results(write_export):
+    service = RecapService(
+        {"first": _export(write_export, "first.json", 3), "second": _export(write_export, "second.json", 5)},
+        max_exports=1,
+    )
+    service.result("first")
+    frame = weakref.ref(service._messages(service._fingerprint("first")))
+
+    service.result("second")
+    gc.collect()
+
+    assert frame() is None
+    assert len(service.results) == 2
+    # Views over the message rows re-read an evicted export.
+    body = json.loads(service.response("first", "table:messages", {}))
+    assert body["total"] == 6
+    assert json.loads(service.response("first", "tables", {}))["messages"] == 6
+
+
+class _YieldingLock:
+    """Sleeps after every release to widen races between critical sections."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        self._lock.acquire()
+
+    def __exit__(self, *exc):
+        self._lock.release()
+        time.sleep(0.001)
+
+
+def test_lru_computes_each_key_once_under_contention():
+    cache = LRUCache(8)
+    cache._lock = _YieldingLock()
+    calls = []
+    start = threading.Barrier(16)
+
+    def compute(key):
+        calls.append(key)
+        time.sleep(0.001)
+        return key * 2
+
+    def worker(idx):
+        start.wait()
+        for round_ in range(50):
+            assert cache.get_or_compute(round_ % 4, lambda key=round_ % 4: compute(key)) == (round_ % 4) * 2
+
+    threads = [threading.Thread(target=worker, args=(idx,)) for idx in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(calls) == [0, 1, 2, 3]
+    assert not cache._pending
+
+
+def test_unexpected_errors_return_json_500(write_export, monkeypatch):
+    service = RecapService({"first": _export(write_export, "first.json", 1)})
+
+    def broken(name, view, params):
+        raise RuntimeError("analysis blew up")
+
+    monkeypatch.setattr(service, "response", broken)
+    server = make_server(service, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        with pytest.raises(urllib.error.HTTPError) as excinfo:
+            urllib.request.urlopen(f"http://127.0.0.1:{server.server_port}/exports/first/metrics")
+        assert excinfo.value.code == 500
+        assert json.loads(excinfo.value.read()) == {"error": "RuntimeError: analysis blew up"}
+    finally:
+        server.shutdown()
+        server.server_close()
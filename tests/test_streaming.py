@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from gpt_recap.data import iter_conversations
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 4, 5, 7, 64])
+def test_stream_matches_json_load_at_any_chunk_size(tmp_path, chunk_size):
+    path = tmp_path / "values.json"
+    path.write_text('[1.5, -2e3, 10, 0.25E-1, {"id": "a", "n": 3.75}, [1, 2.5], true, null, "x,]"]', encoding="utf-8")
+
+    assert list(iter_conversations(path, chunk_size=chunk_size)) == json.loads(path.read_text(encoding="utf-8"))
@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+from gpt_recap.cli import TEXT_STORE_DIRNAME, main
+from gpt_recap.textstore import TextStore
+
+from conftest import conversation, message
+
+
+def test_cached_spill_table_is_not_paired_with_another_exports_texts(tmp_path, write_export):
+    small = write_export("small.json", [conversation("s", [message("s1", text="small one"), message("s2", text="small two")])])
+    other = write_export("other.json", [conversation("o", [message("o1", text="other body")])])
+    output = tmp_path / "so"
+
+    for path in (small, other, small):
+        main([str(path), "-o", str(output), "--text", "spill", "--metrics-only", "--cache-dir", str(tmp_path / "cache")])
+
+    with TextStore(output / TEXT_STORE_DIRNAME) as store:
+        assert store.texts(["s1", "s2"]) == ["small one", "small two"]
+        assert "o1" not in store